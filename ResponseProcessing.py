@@ -3,12 +3,9 @@ import pickle
 import subprocess
 import json
 import asyncio
-from google.adk.runners import Runner
-from google.adk.agents.llm_agent import LlmAgent
-from google.adk.sessions import InMemorySessionService
-from adk_riskAnalysisWorkflow import code_json_cleaner_agent
+from adk_riskAnalysisWorkflow import build_code_json_cleaner_agent
+from lazy_loading import adk_agent, lazy_attributes
 from plotexception import historical_performance_analysis
-from google.genai import types
 from read_env import *
 
 # Constants
@@ -19,10 +16,12 @@ SESSION_ID = "repair_session_01"
 # Global session service
 
 # Agent definition
-json_cleaner_agent = LlmAgent(
-    name="CodeJsonCleanerAgent",
-    model=GEMINI_MODEL_2_FLASH,
-    instruction="""
+def build_json_cleaner_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="CodeJsonCleanerAgent",
+        model=GEMINI_MODEL_2_FLASH,
+        instruction="""
 You will be given a text input that looks like JSON but may contain formatting issues, such as:
 - trailing commas,
 - missing quotes around keys or string values,
@@ -34,13 +33,22 @@ Your task is to:
 ✔ Ensure that the output can be parsed successfully using `json.loads()` in Python.
 ✔ Do not perform any other transformation — just return the corrected JSON as text.
 """
-)
+    )
+
+# The agent is built on first access, so importing this module does not import google.adk
+__getattr__ = lazy_attributes(__name__, {
+    "json_cleaner_agent": build_json_cleaner_agent,
+})
 
 # JSON cleaning runner
 async def json_cleaner_runner(json_text):
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+
     session_service = InMemorySessionService()
     await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
-    runner = Runner(agent=json_cleaner_agent, app_name=APP_NAME, session_service=session_service)
+    runner = Runner(agent=build_json_cleaner_agent(), app_name=APP_NAME, session_service=session_service)
     user_content = types.Content(role='user', parts=[types.Part(text=json_text)])
     response_text = ""
     async for event in runner.run_async(user_id=USER_ID, session_id=SESSION_ID, new_message=user_content):
@@ -52,9 +60,13 @@ async def json_cleaner_runner(json_text):
     return response_text.strip()
 
 async def code_json_cleaner_runner(json_text):
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+
     session_service = InMemorySessionService()
     await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
-    runner = Runner(agent=code_json_cleaner_agent, app_name=APP_NAME, session_service=session_service)
+    runner = Runner(agent=build_code_json_cleaner_agent(), app_name=APP_NAME, session_service=session_service)
     user_content = types.Content(role='user', parts=[types.Part(text=json.dumps(json_text))])
     response_text = ""
     async for event in runner.run_async(user_id=USER_ID, session_id=SESSION_ID, new_message=user_content):
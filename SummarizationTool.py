@@ -1,14 +1,18 @@
 import pandas as pd
-from google.adk.agents.llm_agent import LlmAgent
-from google.adk.agents.parallel_agent import ParallelAgent
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
+from lazy_loading import adk_agent, lazy_attributes
 import json
 from read_env import *
 import pickle
+from breach_analytics import HISTORICAL_DATA_PATH, find_parameter_breaches
+from sensor_store import SensorSeriesStore
+from pipeline_cache import agent_config
+from summary_digests import digest_parameter_breaches, digest_digital_log, digest_supplier_info
 import asyncio
 import re
+import os
+import time
+import threading
+import hashlib
 
 # Constants
 GEMINI_MODEL_2_FLASH = "gemini-2.0-flash"
@@ -16,10 +20,12 @@ APP_NAME = "machine_repair_ops"
 USER_ID = "repair_user_01"
 SESSION_ID = "repair_session_01"
 
-high_risk_part_summary_alert_agent = LlmAgent(
-    name="HighRiskPartsSummaryAgent",
-    model="gemini-2.0-flash-lite",
-    instruction="""
+def build_high_risk_part_summary_alert_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="HighRiskPartsSummaryAgent",
+        model="gemini-2.0-flash-lite",
+        instruction="""
 You are an intelligent analytics assistant for operations.
 
 Given a table called `high_risk_parts` with the following columns:
@@ -47,23 +53,25 @@ Return the result in the following JSON format:
 }
 Only return valid JSON.
 """,
-output_key="summary_and_alert"
-)
+    output_key="summary_and_alert"
+    )
 
 
-digital_log_summary_alert_agent = LlmAgent(
-    name="DigitalLogSummaryAgent",
-    model="gemini-2.0-flash-lite",
-    instruction="""
+def build_digital_log_summary_alert_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="DigitalLogSummaryAgent",
+        model="gemini-2.0-flash-lite",
+        instruction="""
 You are a maintenance performance intelligence assistant.
 
-Given a list called `digital_log_data` with the following fields for each part:
+Given a digest called `digital_log_data` with `total_failures`, `most_failing_part` and a `parts` list with these fields for each part:
 - part: Name of the machine component
 - failures: Number of failures
 - repairs: Number of repairs
 - replacements: Number of replacements
 - maintenance_due: Number of upcoming scheduled maintenances
-- summary: One-line maintenance status (already provided)
+- repair_ratio / replacement_ratio: Repairs and replacements per failure
 
 Perform the following two tasks:
 
@@ -88,21 +96,27 @@ Return your response strictly in this JSON format:
 }
 Only return valid JSON. Avoid listing all parts or full data dumps.
 """,
-output_key="summary_and_alert"
-)
+    output_key="summary_and_alert"
+    )
 
-high_risk_threshold_summary_alert_agent = LlmAgent(
-    name="HighRiskPartsThresholdSummaryAgent",
-    model="gemini-2.0-flash-lite",
-    instruction="""
+def build_high_risk_threshold_summary_alert_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="HighRiskPartsThresholdSummaryAgent",
+        model="gemini-2.0-flash-lite",
+        instruction="""
 You are a professional maintenance insights assistant.
 
-You are given a dataset called `historicaldata` containing historical sensor readings for high-risk machine parts. Each row includes:
+You are given a digest called `historicaldata` summarizing historical sensor readings of high-risk machine parts that breached their expected range.
+It has `total_breaches` and a `breaches` list with one entry per part and parameter:
 - Part: Name of the part
 - Parameter: Sensor parameter being tracked
-- Value: Actual observed value
-- Expected_value_min: Minimum acceptable value
-- Expected_value_max: Maximum acceptable value
+- breaches: Number of cycles outside the expected range
+- high / low: Cycles above Expected_value_max / below Expected_value_min
+- direction: "too high", "too low" or "both"
+- max_deviation: Largest distance outside the expected range
+- min_value / max_value, expected_min / expected_max, first_cycle / last_cycle
+- longest_run: Longest streak of consecutive breaching cycles
 
 Some parts have exceeded thresholds—either upper, lower, or both.
 
@@ -129,13 +143,15 @@ Return your response strictly in the following JSON format:
 }
 Respond only with valid JSON. Avoid listing all rows or full tables.
 """,
-output_key="summary_and_alert"
-)
+    output_key="summary_and_alert"
+    )
 
-low_stock_summary_alert_agent = LlmAgent(
-    name="LowStockSummaryAgent",
-    model="gemini-2.0-flash-lite",
-    instruction="""
+def build_low_stock_summary_alert_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="LowStockSummaryAgent",
+        model="gemini-2.0-flash-lite",
+        instruction="""
 You are a professional inventory intelligence assistant.
 
 You are given a table named `parts_with_low_stocks`, which contains:
@@ -165,21 +181,24 @@ Return both in **valid JSON format** like this:
 }
 Respond only with the JSON output. Do not include tables or any other explanatory text.
 """,
-output_key="summary_and_alert"
-)
+    output_key="summary_and_alert"
+    )
 
 
-supplier_summary_alert_agent = LlmAgent(
-    name="SupplierPerformanceSummaryAgent",
-    model="gemini-2.0-flash-lite",
-    instruction="""
+def build_supplier_summary_alert_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="SupplierPerformanceSummaryAgent",
+        model="gemini-2.0-flash-lite",
+        instruction="""
 You are a strategic sourcing and procurement expert.
 
-You are given a table `supplier_performance_data` with the following columns:
+You are given a digest `supplier_performance_data` with `single_supplier_parts` and a `parts` list with one entry per part:
 - `Part`: Name of the part
-- `Supplier`: Name of the supplier
-- `Historical_OTD`: On-Time Delivery rate (0–1)
-- `Historical_quality_rate`: Quality performance rate (0–1)
+- `suppliers`: Number of suppliers offering the part
+- `otd_min` / `otd_max`: Range of On-Time Delivery rates (0–1)
+- `quality_min` / `quality_max`: Range of quality performance rates (0–1)
+- `best_otd_supplier` / `best_quality_supplier`: Best supplier on each metric
 
 Your task is to produce two outputs:
 
@@ -204,13 +223,15 @@ Return your response in **JSON format** like this:
 }
 Respond only with the JSON output. Do not repeat the table or any additional explanation.
 """,
-output_key="summary_and_alert"
-)
+    output_key="summary_and_alert"
+    )
 
-best_supplier_summary_alert_agent = LlmAgent(
-    name="BestSupplierSummaryAgent",
-    model="gemini-2.0-flash-lite",
-    instruction="""
+def build_best_supplier_summary_alert_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="BestSupplierSummaryAgent",
+        model="gemini-2.0-flash-lite",
+        instruction="""
 You are a procurement intelligence analyst.
 
 You are provided with a table `best_supplier_data` with the following columns:
@@ -241,25 +262,356 @@ Return your output in the following JSON format:
 }
 Respond only with the JSON output. Do not include the table or additional commentary.
 """,
-output_key="summary_and_alert"
-)
+    output_key="summary_and_alert"
+    )
+
+
+def build_batched_summary_alert_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="BatchedSummaryAgent",
+        model="gemini-2.0-flash-lite",
+        instruction="""
+You are an operations analytics assistant producing dashboard alerts for a plant manager.
+
+You are given six tables, each sent once:
+- `high_risk_parts`: parts at high risk ('part', 'age', 'max_age', 'line', 'part_usage').
+- `historicaldata`: a digest of threshold breaches per part and parameter (counts, high/low split, max deviation).
+- `parts_with_low_stocks`: parts and their current `stock`.
+- `supplier_performance_data`: a digest of supplier spread per part (supplier count, OTD/quality ranges, best suppliers).
+- `best_supplier_data`: the top-scoring supplier per part with its Score.
+- `digital_log_data`: a digest of per-part failures, repairs, replacements, maintenance_due and ratios.
+
+For every table produce:
+1. **summary**: 2–3 formal, concise lines for executives. Mention counts, the parts involved and a recommended action. Never dump the table.
+2. **alert**: a dashboard alert of 6 words or fewer, e.g. "2 Parts at High Risk", "Threshold Breach: Pump Temperature", "Urgent Restock: 7 Parts", "Diversify Supply for Gearbox", "Top Suppliers Identified for All Parts", "Critical Failures Detected".
+
+Only include sections whose table is provided in the input.
+Return one JSON object keyed by section, exactly in this format:
+```json
+{
+  "HighRiskPartsSummaryAgent": {"summary": "...", "alert": "..."},
+  "HighRiskPartsThresholdSummaryAgent": {"summary": "...", "alert": "..."},
+  "LowStockSummaryAgent": {"summary": "...", "alert": "..."},
+  "SupplierPerformanceSummaryAgent": {"summary": "...", "alert": "..."},
+  "BestSupplierSummaryAgent": {"summary": "...", "alert": "..."},
+  "DigitalLogSummaryAgent": {"summary": "...", "alert": "..."}
+}
+Only return valid JSON.
+""",
+    output_key="summary_and_alert"
+    )
+
+
+# Summarizer builders by agent name; ADK agents can only have one parent, so every ParallelAgent gets fresh copies
+SUMMARY_AGENT_BUILDERS = {
+    "HighRiskPartsSummaryAgent": build_high_risk_part_summary_alert_agent,
+    "HighRiskPartsThresholdSummaryAgent": build_high_risk_threshold_summary_alert_agent,
+    "LowStockSummaryAgent": build_low_stock_summary_alert_agent,
+    "SupplierPerformanceSummaryAgent": build_supplier_summary_alert_agent,
+    "BestSupplierSummaryAgent": build_best_supplier_summary_alert_agent,
+    "DigitalLogSummaryAgent": build_digital_log_summary_alert_agent,
+}
+
+
+def build_parallel_summary_agent(agent_names):
+    """
+    Builds a ParallelAgent over fresh copies of the named summarizers.
+    """
+    return adk_agent(
+        "ParallelAgent",
+        name="ParallelSummaryAgent",
+        sub_agents=[SUMMARY_AGENT_BUILDERS[name]() for name in agent_names]
+    )
 
 
-summarization_parallel_alert_agent = ParallelAgent(
-    name="ParallelSummaryAgent",
-    sub_agents=[
-        high_risk_part_summary_alert_agent,
-        high_risk_threshold_summary_alert_agent,
-        low_stock_summary_alert_agent,
-        supplier_summary_alert_agent,
-        best_supplier_summary_alert_agent,
-        digital_log_summary_alert_agent
-    ]
-)
+def build_summarization_parallel_alert_agent():
+    return build_parallel_summary_agent(list(SUMMARY_AGENT_BUILDERS))
+
+# Each section: (summarizer agent name, alert key used by the UI, payload key sent to the model)
+SUMMARY_SECTIONS = [
+    ("HighRiskPartsSummaryAgent", "HighRiskPartsSummaryAgent", "high_risk_parts"),
+    ("HighRiskPartsThresholdSummaryAgent", "HighRiskPartsThresholdSummaryAgent", "historicaldata"),
+    ("LowStockSummaryAgent", "LowStockSummaryAgent", "parts_with_low_stocks"),
+    ("SupplierPerformanceSummaryAgent", "SupplierPerformanceSummaryAgent", "supplier_performance_data"),
+    ("BestSupplierSummaryAgent", "BestSupplierSummaryAgent", "best_supplier_data"),
+    ("DigitalLogSummaryAgent", "digital_log_summary_agent", "digital_log_data"),
+]
+
+# "parallel": six summarizer calls, each receiving every table.
+# "batched": one call returning all six {summary, alert} objects, each table sent once.
+SUMMARY_MODES = ("parallel", "batched")
+SUMMARY_MODE = os.environ.get("SUMMARY_MODE", "parallel")
+SUMMARY_STATS_FILE = "summary_run_stats.jsonl"
+# Seconds to wait for LLM prose before keeping the templated alerts.
+SUMMARY_LLM_TIMEOUT_S = float(os.environ.get("SUMMARY_LLM_TIMEOUT_S", "120"))
+LOW_STOCK_THRESHOLD = 5
+# Shown for a section whose template cannot be built from its data, until the LLM summary replaces it
+PLACEHOLDER_SUMMARY = "A summary of this section is not available yet."
+PLACEHOLDER_ALERT = "Summary Pending"
+
+
+def _join_names(names, limit=3):
+    names = [str(n) for n in names]
+    if len(names) > limit:
+        return ", ".join(names[:limit]) + f" and {len(names) - limit} more"
+    return ", ".join(names)
+
+
+def _count(n, noun, plural=None):
+    """
+    "1 part", "3 parts": n with the noun in the matching number.
+    """
+    n = int(n)
+    return f"{n} {noun if n == 1 else plural or noun + 's'}"
+
+
+def _agree(n, singular, plural):
+    """
+    The verb form agreeing with a subject of n items ("is"/"are", "relies"/"rely").
+    """
+    return singular if int(n) == 1 else plural
+
+
+def template_high_risk_parts(df):
+    if df.empty:
+        return "No parts are currently flagged as high risk.", "No High Risk Parts"
+    details = [f"{row['part']} ({row['age']}/{row['max_age']})" for _, row in df.iterrows()]
+    summary = (f"{_count(len(df), 'part')} {_agree(len(df), 'is', 'are')} at high risk as "
+               f"{_agree(len(df), 'it approaches its', 'they approach their')} maximum age (age/max_age): "
+               f"{_join_names(details)}. Plan inspection or replacement before end of life.")
+    return summary, f"{_count(len(df), 'Part')} at High Risk"
+
+
+def template_threshold_breaches(df):
+    if df.empty:
+        return "No sensor threshold breaches were found for the high-risk parts.", "No Threshold Breaches"
+    high = df["Value"] > df["Expected_value_max"]
+    counts = (df.assign(high=high, low=~high)
+                .groupby(["Part", "Parameter"], observed=True)[["high", "low"]].sum())
+    counts["total"] = counts["high"] + counts["low"]
+    counts = counts.sort_values("total", ascending=False)
+    (part, parameter), top = next(counts.iterrows())
+    direction = "too high" if top["low"] == 0 else "too low" if top["high"] == 0 else "both too high and too low"
+    summary = (f"{_count(len(counts), 'part parameter')} breached {_agree(len(counts), 'its', 'their')} expected "
+               f"range in {_count(len(df), 'reading')}. "
+               f"{part} {parameter} breached most often ({_count(top['total'], 'cycle')}, {direction}). "
+               "Check or replace parts with repeated breaches.")
+    return summary, f"Threshold Breach: {parameter}"
+
+
+def template_low_stock(df):
+    low = df[df["stock"] < LOW_STOCK_THRESHOLD] if "stock" in df.columns else df.iloc[0:0]
+    if low.empty:
+        return "Stock levels for the high-risk parts are adequate.", "Stock Levels Adequate"
+    urgent = low[low["stock"] <= 1]["part"].tolist()
+    summary = (f"{_count(len(low), 'part')} {_agree(len(low), 'has', 'have')} critically low stock "
+               f"(< {LOW_STOCK_THRESHOLD}): {_join_names(low['part'])}.")
+    if urgent:
+        summary += f" {_join_names(urgent)} at 0–1 units {_agree(len(urgent), 'needs', 'need')} urgent action."
+    summary += " Restock immediately to avoid production delays."
+    return summary, f"Urgent Restock: {_count(len(low), 'Part')}"
+
+
+def template_supplier_performance(df):
+    if df.empty:
+        return "No supplier records were found for the affected parts.", "No Supplier Data"
+    supplier_counts = df.groupby("Part", observed=True)["Supplier"].nunique()
+    single = supplier_counts[supplier_counts == 1].index.tolist()
+    best = df.loc[df["Historical_quality_rate"].idxmax()]
+    summary = (f"{_count(len(df), 'supplier offer')} {_agree(len(df), 'covers', 'cover')} "
+               f"{_count(len(supplier_counts), 'part')}. {best['Supplier']} leads on quality "
+               f"({best['Historical_quality_rate']:.2f}) for {best['Part']}.")
+    if single:
+        summary += f" {_join_names(single)} {_agree(len(single), 'relies', 'rely')} on a single supplier; consider diversifying."
+        return summary, f"Diversify Supply for {single[0]}"
+    return summary, "Supplier Performance Reviewed"
+
+
+def template_best_supplier(df):
+    if df.empty:
+        return "No best-supplier selection is available.", "No Supplier Selection"
+    picks = [f"{row['Supplier']} for {row['Part']}" for _, row in df.iterrows()]
+    summary = (f"Top suppliers by composite score: {_join_names(picks)}. "
+               "Prioritise these vendors for upcoming procurement.")
+    return summary, "Top Suppliers Identified for All Parts"
+
+
+def template_digital_log(df):
+    if df.empty:
+        return "No failures were logged for the high-risk parts.", "No Logged Failures"
+    worst = df.loc[df["failures"].idxmax()]
+    failures = df['failures'].sum()
+    summary = (f"{_count(failures, 'failure')} {_agree(failures, 'was', 'were')} logged across {_count(len(df), 'part')}. "
+               f"{worst['part']} failed most often ({_count(worst['failures'], 'time')}, "
+               f"{_count(worst['repairs'], 'repair')}, {_count(worst['replacements'], 'replacement')}). "
+               "Schedule preventive maintenance for the most affected parts.")
+    return summary, f"High Failure Rate: {worst['part']}"
+
+
+SUMMARY_TEMPLATES = {
+    "HighRiskPartsSummaryAgent": template_high_risk_parts,
+    "HighRiskPartsThresholdSummaryAgent": template_threshold_breaches,
+    "LowStockSummaryAgent": template_low_stock,
+    "SupplierPerformanceSummaryAgent": template_supplier_performance,
+    "BestSupplierSummaryAgent": template_best_supplier,
+    "DigitalLogSummaryAgent": template_digital_log,
+}
 
 
-async def run_summary_and_alert_pipeline(filename):
+def build_template_alerts(section_data):
+    """
+    Builds alert_input_list deterministically from the section DataFrames, without any LLM call.
+    Every section gets an item; one whose template fails gets a placeholder for the LLM summary to replace.
+    """
+    alert_input_list = []
+    for agent_name, _, _ in SUMMARY_SECTIONS:
+        alert_input_list.append(template_alert(agent_name, section_data))
+    return alert_input_list
+
+
+def template_alert(agent_name, section_data):
+    """
+    The templated alert item of one section, or a placeholder item if its template fails.
+    """
+    alert_key = next(key for name, key, _ in SUMMARY_SECTIONS if name == agent_name)
+    section_df, section_json = section_data[agent_name]
+    try:
+        summary, alert = SUMMARY_TEMPLATES[agent_name](section_df)
+    except (KeyError, ValueError) as e:
+        print(f"Template failed for {agent_name}: {e}")
+        summary, alert = PLACEHOLDER_SUMMARY, PLACEHOLDER_ALERT
+    return [alert_key, section_df, section_json, summary, alert, "template"]
+
+
+def alerts_complete(alert_input_list):
+    """
+    True when every SUMMARY_SECTIONS entry has an item and all of them carry LLM prose.
+    """
+    status = {item[0]: item[5] for item in alert_input_list if len(item) >= 6}
+    return all(status.get(alert_key) == "llm" for _, alert_key, _ in SUMMARY_SECTIONS)
+
+
+def section_hash(section_json, summarizer=None):
+    """
+    Content hash of one summarizer input section and the summarizer that writes it (see summarizer_config).
+    """
+    payload = json.dumps({"input": section_json, "summarizer": summarizer}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def summarizer_config(mode):
+    """
+    {agent_name: {"mode", "model", "instruction_sha256"}} of the summarizer that writes each section in mode,
+    so a new model, prompt or mode re-runs the section instead of reusing its stored summary.
+    Without google.adk only the mode is known.
+    """
+    builders = {name: build_batched_summary_alert_agent if mode == "batched" else SUMMARY_AGENT_BUILDERS[name]
+                for name, _, _ in SUMMARY_SECTIONS}
+    configs = {}
+    for build in set(builders.values()):
+        try:
+            configs[build] = next(iter(agent_config(build()).values()), {})
+        except ImportError:
+            configs[build] = {}
+    return {name: {"mode": mode, **configs[build]} for name, build in builders.items()}
+
+
+def summary_state_path(final_ui_filename):
+    return f"{final_ui_filename}.sections.json"
+
+
+def load_summary_state(final_ui_filename):
+    """
+    Returns {agent_name: {"hash", "summary", "alert"}} from the previous run, or {} if there is none.
+    """
+    try:
+        with open(summary_state_path(final_ui_filename)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_summary_state(final_ui_filename, state):
+    tmp_filename = f"{summary_state_path(final_ui_filename)}.tmp"
+    with open(tmp_filename, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_filename, summary_state_path(final_ui_filename))
+
+
+def write_alerts(filename, alert_input_list):
+    """
+    Writes alert_input_list atomically so the UI never reads a partial pickle.
+    """
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "wb") as f:
+        pickle.dump(alert_input_list, f)
+    os.replace(tmp_filename, filename)
+
+
+def extract_json_block(text):
+    """
+    Returns the JSON object in a model response, with or without a ```json fence.
+    """
+    match = re.search(r'```json\s*(\{.*\})\s*```', text, re.DOTALL)
+    candidate = match.group(1) if match else text.strip()
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        return None
+
+
+async def run_summary_agent(agent, content):
+    """
+    Runs a summarization agent once and returns (text per author, run stats).
+    """
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+
+    session_service = InMemorySessionService()
+    await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
+    runner = Runner(agent=agent, app_name=APP_NAME, session_service=session_service)
+
+    texts = {}
+    stats = {"llm_calls": 0, "prompt_tokens": 0, "output_tokens": 0}
+    started = time.perf_counter()
+    async for event in runner.run_async(user_id=USER_ID, session_id=SESSION_ID, new_message=content):
+        usage = getattr(event, "usage_metadata", None)
+        if usage is not None:
+            stats["llm_calls"] += 1
+            stats["prompt_tokens"] += usage.prompt_token_count or 0
+            stats["output_tokens"] += usage.candidates_token_count or 0
+        if hasattr(event, "content") and event.content and event.content.parts:
+            for part in event.content.parts:
+                if part.text:
+                    texts[event.author] = texts.get(event.author, "") + part.text
+    stats["latency_s"] = round(time.perf_counter() - started, 3)
+    return texts, stats
+
+
+def record_summary_stats(mode, stats, filename):
+    """
+    Appends the latency and token cost of a summarization run so the modes can be compared.
+    """
+    entry = {"timestamp": time.time(), "mode": mode, "file": filename, **stats}
+    with open(SUMMARY_STATS_FILE, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+async def run_summary_and_alert_pipeline(filename, mode=None, llm_timeout=None, background=False, on_update=None):
+    """
+    Writes templated alerts for the processed responses immediately, then replaces them with LLM prose.
+    With background=True the LLM enrichment runs in a daemon thread and the templated file is returned at once;
+    if the LLM does not answer within llm_timeout seconds the templated text is kept.
+    on_update, if given, is called with the output path after every write, and whether every section is
+    present as LLM prose (see alerts_complete); only a complete result may be cached as final.
+    """
     # filename = "processed_responses_Sanitization_Line_2.pkl"
+    mode = mode or SUMMARY_MODE
+    llm_timeout = SUMMARY_LLM_TIMEOUT_S if llm_timeout is None else llm_timeout
+    if mode not in SUMMARY_MODES:
+        raise ValueError(f"Unknown summary mode: {mode}. Expected one of {SUMMARY_MODES}.")
+
     with open(filename, "rb") as f:
         responses = pickle.load(f)
 
@@ -279,91 +631,112 @@ async def run_summary_and_alert_pipeline(filename):
     best_supplier_df = responses['best_supplier']
     best_supplier_json = best_supplier_df.to_dict(orient='records')
 
-    def get_exceeded_parameter_dataframe(high_risk_parts: pd.DataFrame, historical_data_path: str) -> pd.DataFrame:
-        historical_df = pd.read_csv(historical_data_path)
-        exceeded_rows = []
-
-        for _, part_row in high_risk_parts.iterrows():
-            part_name = part_row['part']
-            part_data = historical_df[historical_df['Part'] == part_name]
-            parameters = part_data['Parameter'].dropna().unique()
-
-            for parameter in parameters:
-                param_df = part_data[part_data['Parameter'] == parameter]
-                exceeded_df = param_df[
-                    (param_df['Value'] < param_df['Expected_value_min']) |
-                    (param_df['Value'] > param_df['Expected_value_max'])
-                ]
-                if not exceeded_df.empty:
-                    exceeded_rows.append(exceeded_df)
-
-        return pd.concat(exceeded_rows, ignore_index=True) if exceeded_rows else pd.DataFrame()
-
-    parameter_range_exceeded_df = get_exceeded_parameter_dataframe(
-        hish_risk_part_df, r"datasets\Historical_data.csv"
+    # Only the high-risk parts' series are pulled from the indexed store, not the whole table
+    historical_store = SensorSeriesStore.from_dataset(HISTORICAL_DATA_PATH)
+    parameter_range_exceeded_df = find_parameter_breaches(
+        historical_store.rows_for_parts(hish_risk_part_df['part']), hish_risk_part_df
     )
     parameter_range_exceeded_json = parameter_range_exceeded_df.to_dict(orient='records')
 
-    async def getSummaryofAgent():
-        session_service = InMemorySessionService()
-        await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
-        # runner = Runner(agent=summarization_parallel_agent, app_name=APP_NAME, session_service=session_service)
-        runner = Runner(agent=summarization_parallel_alert_agent, app_name=APP_NAME, session_service=session_service)
+    section_data = {
+        "HighRiskPartsSummaryAgent": (hish_risk_part_df, hish_risk_part_json),
+        "HighRiskPartsThresholdSummaryAgent": (parameter_range_exceeded_df, parameter_range_exceeded_json),
+        "LowStockSummaryAgent": (low_stock_parts_df, low_stock_parts_json),
+        "SupplierPerformanceSummaryAgent": (supplier_info_df, supplier_info_json),
+        "BestSupplierSummaryAgent": (best_supplier_df, best_supplier_json),
+        "DigitalLogSummaryAgent": (digital_log_df, digital_log_json),
+    }
+
+    # Model inputs: compact digests for the row-heavy sections, records for the rest
+    section_prompts = {name: section_json for name, (_, section_json) in section_data.items()}
+    section_prompts["HighRiskPartsThresholdSummaryAgent"] = digest_parameter_breaches(parameter_range_exceeded_df)
+    section_prompts["DigitalLogSummaryAgent"] = digest_digital_log(digital_log_df)
+    section_prompts["SupplierPerformanceSummaryAgent"] = digest_supplier_info(supplier_info_df)
+
+    async def getSummaryofAgent(agent_names):
+        from google.genai import types
 
         content = types.Content(
             role="user",
             parts=[
-                types.Part(text=json.dumps({"high_risk_parts": hish_risk_part_json})),
-                types.Part(text=json.dumps({"historicaldata": parameter_range_exceeded_json})),
-                types.Part(text=json.dumps({"parts_with_low_stocks": low_stock_parts_json})),
-                types.Part(text=json.dumps({"supplier_performance_data": supplier_info_json})),
-                types.Part(text=json.dumps({"best_supplier_data": best_supplier_json})),
-                types.Part(text=json.dumps({"digital_log_data": digital_log_json}))
+                types.Part(text=json.dumps({payload_key: section_prompts[agent_name]}))
+                for agent_name, _, payload_key in SUMMARY_SECTIONS
+                if agent_name in agent_names
             ]
         )
 
         agent_summaries = {}
-        async for event in runner.run_async(user_id=USER_ID, session_id=SESSION_ID, new_message=content):
-            if hasattr(event, "content") and event.content and event.content.parts:
-                agent_name = event.author
-                for part in event.content.parts:
-                    if part.text:
-                        # Extract JSON block from markdown-style code block
-                        match = re.search(r'```json\s*(\{.*?\})\s*```', part.text, re.DOTALL)
-                        if match:
-                            try:
-                                json_data = json.loads(match.group(1))
-                                agent_summaries[agent_name] = json_data
-                            except json.JSONDecodeError:
-                                print(f"Failed to decode JSON for agent: {agent_name}")
-        # print(agent_summaries)
-
+        if mode == "batched":
+            batched_agent = build_batched_summary_alert_agent()
+            texts, stats = await run_summary_agent(batched_agent, content)
+            json_data = extract_json_block(texts.get(batched_agent.name, ""))
+            if json_data is None:
+                print(f"Failed to decode JSON for agent: {batched_agent.name}")
+            else:
+                agent_summaries = {name: value for name, value in json_data.items() if name in agent_names}
+        else:
+            texts, stats = await run_summary_agent(build_parallel_summary_agent(agent_names), content)
+            for agent_name, text in texts.items():
+                json_data = extract_json_block(text)
+                if json_data is None:
+                    print(f"Failed to decode JSON for agent: {agent_name}")
+                else:
+                    agent_summaries[agent_name] = json_data
+
+        stats["sections"] = len(agent_names)
+        record_summary_stats(mode, stats, filename)
         return agent_summaries
 
-    result = await getSummaryofAgent()
-    print("RESULT***",result)
-
-
-    alert_input_list = []
-    for i in result:
-        if i == "HighRiskPartsSummaryAgent":
-            alert_input_list.append(["HighRiskPartsSummaryAgent", hish_risk_part_df, hish_risk_part_json, result[i]['summary'], result[i]['alert']])
-        elif i == "HighRiskPartsThresholdSummaryAgent":
-            alert_input_list.append(["HighRiskPartsThresholdSummaryAgent", parameter_range_exceeded_df, parameter_range_exceeded_json, result[i]['summary'], result[i]['alert']])
-        elif i == "LowStockSummaryAgent":
-            alert_input_list.append(["LowStockSummaryAgent", low_stock_parts_df, low_stock_parts_json, result[i]['summary'], result[i]['alert']])
-        elif i == "SupplierPerformanceSummaryAgent":
-            alert_input_list.append(["SupplierPerformanceSummaryAgent", supplier_info_df, supplier_info_json, result[i]['summary'], result[i]['alert']])
-        elif i == "BestSupplierSummaryAgent":
-            alert_input_list.append(["BestSupplierSummaryAgent", best_supplier_df, best_supplier_json, result[i]['summary'], result[i]['alert']])
-        elif i == "digital_log_summary_agent":
-            alert_input_list.append(["digital_log_summary_agent", digital_log_df, digital_log_json, result[i]['summary'], result[i]['alert']])
-    print(alert_input_list)
-    # final_result_summary_alert = await get_alert_notifications(alert_input_list)
-
     final_ui_processed_filename = f"final_ui_{filename}"
-    with open(final_ui_processed_filename, "wb") as f:
-        pickle.dump(alert_input_list, f)
+    alert_input_list = build_template_alerts(section_data)
+
+    # Reuse previous LLM summaries for sections whose input did not change
+    summarizers = summarizer_config(mode)
+    section_hashes = {name: section_hash(prompt, summarizers[name]) for name, prompt in section_prompts.items()}
+    summary_state = load_summary_state(final_ui_processed_filename)
+    summary_state = {name: entry for name, entry in summary_state.items()
+                     if name in section_hashes and entry.get("hash") == section_hashes[name]}
+
+    def apply_summaries(summaries):
+        items = {item[0]: item for item in alert_input_list}
+        for agent_name, alert_key, _ in SUMMARY_SECTIONS:
+            if agent_name not in summaries or not {"summary", "alert"} <= set(summaries[agent_name]):
+                continue
+            if alert_key not in items:
+                items[alert_key] = template_alert(agent_name, section_data)
+                alert_input_list.append(items[alert_key])
+            item = items[alert_key]
+            item[3], item[4], item[5] = summaries[agent_name]['summary'], summaries[agent_name]['alert'], "llm"
+
+    def publish():
+        write_alerts(final_ui_processed_filename, alert_input_list)
+        if on_update is not None:
+            on_update(final_ui_processed_filename, alerts_complete(alert_input_list))
+
+    apply_summaries(summary_state)
+    publish()
+
+    changed_sections = [name for name, _, _ in SUMMARY_SECTIONS if name not in summary_state]
+
+    async def enrich_with_llm():
+        if not changed_sections:
+            return
+        try:
+            result = await asyncio.wait_for(getSummaryofAgent(changed_sections), timeout=llm_timeout)
+        except Exception as e:  # timeouts and model errors both keep the templated alerts
+            print(f"LLM summarization unavailable ({type(e).__name__}), keeping templated alerts")
+            return
+        apply_summaries(result)
+        publish()
+        for name, value in result.items():
+            if {"summary", "alert"} <= set(value):
+                summary_state[name] = {"hash": section_hashes[name], "summary": value["summary"], "alert": value["alert"]}
+        save_summary_state(final_ui_processed_filename, summary_state)
+
+    if background:
+        threading.Thread(target=asyncio.run, args=(enrich_with_llm(),), daemon=True).start()
+    else:
+        await enrich_with_llm()
 
     return final_ui_processed_filename
 # async def main():
@@ -372,4 +745,17 @@ async def run_summary_and_alert_pipeline(filename):
 #     print(f"Summary and alert results saved to: {result_file}")
 
 # # Run the async function
-# asyncio.run(main())
\ No newline at end of file
+# asyncio.run(main())
+
+# Agents are built on first access, so importing this module does not import google.adk
+__getattr__ = lazy_attributes(__name__, {
+    "high_risk_part_summary_alert_agent": build_high_risk_part_summary_alert_agent,
+    "digital_log_summary_alert_agent": build_digital_log_summary_alert_agent,
+    "high_risk_threshold_summary_alert_agent": build_high_risk_threshold_summary_alert_agent,
+    "low_stock_summary_alert_agent": build_low_stock_summary_alert_agent,
+    "supplier_summary_alert_agent": build_supplier_summary_alert_agent,
+    "best_supplier_summary_alert_agent": build_best_supplier_summary_alert_agent,
+    "batched_summary_alert_agent": build_batched_summary_alert_agent,
+    "summarization_parallel_alert_agent": build_summarization_parallel_alert_agent,
+    "SUMMARY_AGENTS": lambda: {name: build() for name, build in SUMMARY_AGENT_BUILDERS.items()},
+})
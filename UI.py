@@ -7,109 +7,17 @@ from PIL import Image
 import matplotlib.pyplot as plt
 import matplotlib
 
-from SummarizationTool import run_summary_and_alert_pipeline
 import streamlit as st
 import pandas as pd
 import pickle
-import json
 import os
 from PIL import Image
-from google.adk.sessions import InMemorySessionService
-from google.adk.runners import Runner
-from google.genai import types
-from adk_riskAnalysisWorkflow import final_pipeline_agent,code_json_cleaner_agent
-from sample_final import analysis_summary, full_schedule, clean_summary
-import subprocess
-from read_env import *
-import asyncio
-from ResponseProcessing import preprocessingResponse
-
-df = pd.read_csv("datasets/Line_components_new.csv")
-unique_lines = df['line'].dropna().unique().tolist()
-print(unique_lines)
-unique_lines = unique_lines[1:]
-print(unique_lines)
-
-
-APP_NAME = "machine_repair_ops"
-USER_ID = "repair_user_01"
-SESSION_ID = "repair_session_01"
-
-async def main():
-    session_service = InMemorySessionService()
-    await session_service.create_session(
-        app_name=APP_NAME,
-        user_id=USER_ID,
-        session_id=SESSION_ID
-    )
-    runner = Runner(agent=final_pipeline_agent, app_name=APP_NAME, session_service=session_service)
-
-    # Load datasets
-    line_components_df = pd.read_csv("datasets/Line_components_new.csv")
-    historical_df = pd.read_csv("datasets/Historical_data.csv")
-    digital_log_df = pd.read_csv("datasets/Digital_log.csv")
-    inventory_df = pd.read_excel("datasets/Inventory.xlsx")
-    supplier_df = pd.read_excel("datasets/Suppliers.xlsx")
-
-    components = line_components_df.to_dict(orient='records')
-    historical = historical_df.to_dict(orient='records')
-    digital = digital_log_df.to_dict(orient='records')
-    Inventory = inventory_df.to_dict(orient='records')
-    Supplier = supplier_df.to_dict(orient='records')
-
-    for selected_line in unique_lines:
-        print("SELECTED LINE", selected_line)
-
-        content = types.Content(
-            role="user",
-            parts=[
-                types.Part(text=f"line_name: {selected_line}"),
-                types.Part(text=json.dumps({"LineComponents": components})),
-                types.Part(text=json.dumps({"HistoricalData": historical})),
-                types.Part(text=json.dumps({"DigitalLogs": digital})),
-                types.Part(text=json.dumps({"Inventory": Inventory})),
-                types.Part(text=json.dumps({"Supplier": Supplier})),
-                types.Part(text=json.dumps({"analysis_summary": analysis_summary})),
-                types.Part(text=json.dumps({"full_schedule": full_schedule})),
-                types.Part(text=json.dumps({"summary": clean_summary}))
-            ]
-        )
-
-        responses = [None] * 11
-        AGENT_INDEX_MAP = {
-            "HighRiskIdentificationAgent": 0,
-            "CodeJsonCleanerAgent": 2,
-            "LogFilterAgent": 3,
-            "FailureSummaryAgent": 4,
-            "LowStockPartsAgent": 5,
-            "SupplierInfoAgent": 6,
-            "BestSupplierSelectorAgent": 7,
-            "HistoricalAnalysisAgent": 1,
-            "MaintenancePlanAgent": 8,
-            "PostOptimizationAgent": 9,
-            "part_usage_agent": 10
-        }
-
-        async for event in runner.run_async(user_id=USER_ID, session_id=SESSION_ID, new_message=content):
-            agent_name = getattr(event, "author", "UnknownAgent")
-            response_text = ""
-            if hasattr(event, "content") and event.content and event.content.parts:
-                for part in event.content.parts:
-                    if part.text:
-                        response_text += part.text + "\n"
-            if agent_name in AGENT_INDEX_MAP:
-                responses[AGENT_INDEX_MAP[agent_name]] = response_text.strip()
-
-        safe_line_name = selected_line.replace(" ", "_")
-        filename = f"responses_{safe_line_name}.pkl"
-
-        with open(filename, "wb") as f:
-            pickle.dump(responses, f)
-
-        # Call your preprocessing function
-        processed_response_pickle_file_name = await preprocessingResponse(filename)
-        final_ui_pickle_file_path = await run_summary_and_alert_pipeline(processed_response_pickle_file_name)
-        return final_ui_pickle_file_path
+from hierarchy_index import PlantHierarchy
+from agent_pipeline import pipeline_request
+from pipeline_jobs import submit_job, get_job, latest_result, ensure_worker, JOB_POLL_S
+
+plant_hierarchy = PlantHierarchy.from_datasets()
+print(plant_hierarchy.lines())
 
 # --- Page Configuration ---
 st.set_page_config(layout="wide")
@@ -199,15 +107,37 @@ st.markdown("""
 st.title("Machine Repair Operations")
 
 
-if 'final_filename' not in st.session_state:
-    with st.spinner("Running pipeline... please wait."):
-        # In a real scenario, main() would be defined and run.
-        # For this example, we'll simulate it.
-        filename = asyncio.run(main())
-        # filename = "final_ui_processed_responses_Sanitization_Line_2.pkl" # Simulated filename
-        st.session_state.final_filename = filename
-else:
-    filename = st.session_state.final_filename
+# The pipeline runs in the background worker (pipeline_jobs). The page submits one run per session, renders
+# the last published result at once and reruns when the worker publishes a newer one.
+if 'pipeline_job_id' not in st.session_state:
+    st.session_state.pipeline_job_id = submit_job(pipeline_request())
+ensure_worker()
+
+latest = latest_result()
+st.session_state.result_version = latest["version"] if latest else None
+
+
+@st.fragment(run_every=JOB_POLL_S)
+def pipeline_job_status():
+    latest = latest_result()
+    if latest and latest["version"] != st.session_state.result_version:
+        st.rerun()
+    job = get_job(st.session_state.pipeline_job_id)
+    if job is None:
+        return
+    if job["status"] in ("queued", "running"):
+        ensure_worker()
+        st.caption(f"⏳ Pipeline {job['status']}: {job['progress'] or 'waiting for the worker'}")
+    elif job["status"] == "failed":
+        st.caption(f"⚠️ The last pipeline run failed ({job['error']}). Showing the last good results.")
+
+
+pipeline_job_status()
+if latest is None:
+    st.info("Running the pipeline for the first time. Results appear here as soon as they are ready.")
+    st.stop()
+filename = latest["path"]
+st.session_state.final_filename = filename
 
 
 # Set a non-interactive backend for Matplotlib
@@ -215,10 +145,11 @@ matplotlib.use('Agg')
 
 # --- Data Loading and Processing ---
 processed_dict = {}
+pending_llm_keys = set()
 corresponding_sanitation_line_name = "Default_Sanitation_Line"
 
 try:
-    corresponding_sanitation_line_name = filename.replace("final_ui_processed_responses_", "").replace(".pkl", "")
+    corresponding_sanitation_line_name = os.path.basename(filename).replace("final_ui_processed_responses_", "").replace(".pkl", "")
 
     with open(filename, "rb") as f:
         responses = pickle.load(f)
@@ -228,6 +159,8 @@ try:
             key = item[0]
             value = [item[1], item[3], item[4]] # df_details, summary_text, alert_title
             processed_dict[key] = value
+            if len(item) >= 6 and item[5] == "template":
+                pending_llm_keys.add(key)
         else:
             print(f"Skipping item due to insufficient length: {item}")
 
@@ -294,6 +227,8 @@ else:
     st.markdown("---")
     
     st.subheader("Summary")
+    if selected_key in pending_llm_keys:
+        st.caption("Generated from the data. A detailed AI summary will replace it once ready.")
     st.markdown(f'<div style="background-color: #eaf2f8; padding: 1rem; border-radius: 0.5rem; border-left: 5px solid #4682B4;">{summary_text}</div>', unsafe_allow_html=True)
     
     st.subheader("Details")
@@ -319,11 +254,7 @@ else:
 
                 for part in high_risk_parts_df["part"]:
                     st.markdown(f"### 📌 {part}")
-                    sanitized_part = part.replace(" ", "_")
-                    sanitized_line = corresponding_sanitation_line_name.replace(" ", "_")
-                    
-                    matching_files = [f for f in os.listdir(plot_dir)
-                                      if f.startswith(f"{sanitized_part}_{sanitized_line}") and f.endswith(".png")]
+                    matching_files = plant_hierarchy.plot_files(part, corresponding_sanitation_line_name, plot_dir)
 
                     if not matching_files:
                         st.info(f"No plots found in the '{plot_dir}/' directory for {part}")
@@ -1,17 +1,9 @@
-from google.adk.agents.llm_agent import LlmAgent
-from google.adk.sessions import InMemorySessionService
-from google.adk.runners import Runner
-from google.genai import types
-import json
-import pandas as pd
 import pickle
-import asyncio
+from functools import lru_cache
+from lazy_loading import adk_agent, lazy_attributes
 from read_env import *
 
-with open("high_risk_parts_data.pkl", "rb") as f:
-    high_risk_parts_data = pickle.load(f)
-
-print(high_risk_parts_data)
+HIGH_RISK_PARTS_PATH = "high_risk_parts_data.pkl"
 
 APP_NAME = "machine_repair_ops"
 USER_ID = "repair_user_01"
@@ -23,10 +15,12 @@ GEMINI_MODEL_2_FLASH_LITE = "gemini-2.0-flash-lite"
 GEMINI_MODEL_2_5_PRO_PREVIEW = "gemini-2.5-pro-preview-06-05"
 
 
-low_stock_agent = LlmAgent(
-    name="LowStockPartsAgent",
-    model="gemini-2.0-flash-lite",
-    instruction="""
+def build_low_stock_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="LowStockPartsAgent",
+        model="gemini-2.0-flash-lite",
+        instruction="""
 You are a supply chain analyst.
 
 Using the input list `high_risk_parts` (each with keys 'part', 'age', 'max_age', 'line') and `Inventory` dataset:
@@ -56,13 +50,15 @@ Example output:
   }
 ]
 """,
-    output_key="low_stock_parts"
-)
-
-supplier_info_agent = LlmAgent(
-    name="SupplierInfoAgent",
-    model="gemini-2.0-flash-lite",
-    instruction="""
+        output_key="low_stock_parts"
+    )
+
+def build_supplier_info_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="SupplierInfoAgent",
+        model="gemini-2.0-flash-lite",
+        instruction="""
 You are a supplier data assistant.
 
 Given a list of part names (`low_stock_parts`) and the dataset `Suppliers`:
@@ -129,13 +125,15 @@ Example output:
   ]
 }
 """,
-    output_key="supplier_info"
-)
-
-best_supplier_agent = LlmAgent(
-    name="BestSupplierSelectorAgent",
-    model=GEMINI_MODEL_2_FLASH,
-    instruction="""
+        output_key="supplier_info"
+    )
+
+def build_best_supplier_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="BestSupplierSelectorAgent",
+        model=GEMINI_MODEL_2_FLASH,
+        instruction="""
 You are an intelligent supplier ranking system.
 
 You are given a dictionary `supplier_info` where:
@@ -194,6 +192,22 @@ Example output:
   }
 }
 """,
-    output_key="best_suppliers"
-)
-
+        output_key="best_suppliers"
+    )
+
+
+@lru_cache(maxsize=1)
+def load_high_risk_parts_data():
+    """
+    The pickled high-risk parts of the last run, read on first use.
+    """
+    with open(HIGH_RISK_PARTS_PATH, "rb") as f:
+        return pickle.load(f)
+
+# Agents and data are built on first access, so importing this module does no work
+__getattr__ = lazy_attributes(__name__, {
+    "high_risk_parts_data": load_high_risk_parts_data,
+    "low_stock_agent": build_low_stock_agent,
+    "supplier_info_agent": build_supplier_info_agent,
+    "best_supplier_agent": build_best_supplier_agent,
+})
@@ -1,15 +1,10 @@
 import asyncio
 import json
 import pandas as pd
-from google.adk.agents.sequential_agent import SequentialAgent
-from google.adk.agents.parallel_agent import ParallelAgent
-from google.adk.agents.llm_agent import LlmAgent
-from google.adk.sessions import InMemorySessionService
-from google.adk.runners import Runner
-from google.genai import types
-from adk_inventoryTool import low_stock_agent, supplier_info_agent, best_supplier_agent
-from sample_final import analysis_summary, full_schedule, clean_summary, parallel_agent
-from sop_qna_tool import part_usage_agent
+from adk_inventoryTool import build_low_stock_agent, build_supplier_info_agent, build_best_supplier_agent
+from sample_final import build_parallel_agent
+from sop_qna_tool import build_part_usage_agent
+from lazy_loading import adk_agent, lazy_attributes
 # from DataLoadAgent import load_line_components_agent,load_digital_logs_agent, load_historical_agent, load_inventory_agent, load_supplier_agent
 import subprocess
 from read_env import *
@@ -26,10 +21,12 @@ GEMINI_MODEL_2_FLASH_LITE = "gemini-2.0-flash-lite"
 GEMINI_MODEL_1_5_FLASH_8B = "gemini-1.5-flash-8b"
 
 # --- Agents ---
-high_risk_agent = LlmAgent(
-    name="HighRiskIdentificationAgent",
-    model=GEMINI_MODEL_2_FLASH_LITE,
-    instruction="""
+def build_high_risk_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="HighRiskIdentificationAgent",
+        model=GEMINI_MODEL_2_FLASH_LITE,
+        instruction="""
     You are a maintenance expert.
     Using the 'LineComponents' CSV content, identify parts in the specified 'line_name' sanitation line
     that have a failure_probability > 0.90.
@@ -50,13 +47,15 @@ high_risk_agent = LlmAgent(
     ...
     ]
     """,
-    output_key="high_risk_parts"
-)
-
-historical_analysis_agent = LlmAgent(
-    name="HistoricalAnalysisAgent",
-    model=GEMINI_MODEL_2_FLASH_LITE,
-    instruction="""
+        output_key="high_risk_parts"
+    )
+
+def build_historical_analysis_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="HistoricalAnalysisAgent",
+        model=GEMINI_MODEL_2_FLASH_LITE,
+        instruction="""
 You are a Python data analysis agent. Generate Python code that performs the following tasks:
 
 - Use the `high_risk_parts` list (containing part, line, age, and max_age information) and the dataset located at `datasets/Historical_data.csv`.
@@ -89,15 +88,16 @@ Use only the following Python libraries: `pandas`, `matplotlib`, and `os`.
 Return a JSON object with two keys:
 1. "code" - A string containing the full generated Python code.
 2. "high_risk_parts" - The same input list, but each item must exclude the 'line' or 'sanitation_line' field. Include only 'part', 'age', and 'max_age'.
-"""
-,
-    output_key="historical_summary"
-)
-
-code_json_cleaner_agent = LlmAgent(
-    name="CodeJsonCleanerAgent",
-    model=GEMINI_MODEL_2_FLASH,
-    instruction="""
+""",
+        output_key="historical_summary"
+    )
+
+def build_code_json_cleaner_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="CodeJsonCleanerAgent",
+        model=GEMINI_MODEL_2_FLASH,
+        instruction="""
 You are a JSON formatting assistant.
 
 Your task is to take a JSON-like input object with two fields:
@@ -133,13 +133,15 @@ Clean and return a **valid JSON object** with:
   ]
 }
 """
-)
+    )
 
 
-log_filter_agent = LlmAgent(
-    name="LogFilterAgent",
-    model=GEMINI_MODEL_1_5_FLASH,
-    instruction="""
+def build_log_filter_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="LogFilterAgent",
+        model=GEMINI_MODEL_1_5_FLASH,
+        instruction="""
 You are a log filtering assistant.
 
 Your task is to:
@@ -157,13 +159,15 @@ Return the result as a JSON array like this:
   ...
 ]
 """
-)
+    )
 
 
-failure_summary_agent = LlmAgent(
-    name="FailureSummaryAgent",
-    model=GEMINI_MODEL_1_5_FLASH_8B,
-    instruction="""
+def build_failure_summary_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="FailureSummaryAgent",
+        model=GEMINI_MODEL_1_5_FLASH_8B,
+        instruction="""
 You are a digital log analyst.
 
 You will analyze pre-filtered part-level failure data using:
@@ -189,41 +193,63 @@ Return a JSON array like:
   ...
 ]
 """
-)
+    )
 
 # Step 1: Initial agent
-initial_agent = SequentialAgent(
-    name="HighRiskAgent",
-    sub_agents=[high_risk_agent,part_usage_agent]
-)
-
-plot_agent = SequentialAgent(
-    name="PlotGraphAgent",
-    sub_agents=[historical_analysis_agent, code_json_cleaner_agent]
-)
-
-digitalLog_agent = SequentialAgent(
-    name="DigitalLogAgent",
-    sub_agents=[log_filter_agent, failure_summary_agent]
-)
-
-inventory_agent = SequentialAgent(
-    name="InventoryAgent",
-    sub_agents=[low_stock_agent, supplier_info_agent, best_supplier_agent]
-)
+def build_initial_agent():
+    return adk_agent(
+        "SequentialAgent",
+        name="HighRiskAgent",
+        sub_agents=[build_high_risk_agent(), build_part_usage_agent()]
+    )
+
+def build_plot_agent():
+    return adk_agent(
+        "SequentialAgent",
+        name="PlotGraphAgent",
+        sub_agents=[build_historical_analysis_agent(), build_code_json_cleaner_agent()]
+    )
+
+def build_digitalLog_agent():
+    return adk_agent(
+        "SequentialAgent",
+        name="DigitalLogAgent",
+        sub_agents=[build_log_filter_agent(), build_failure_summary_agent()]
+    )
+
+def build_inventory_agent():
+    return adk_agent(
+        "SequentialAgent",
+        name="InventoryAgent",
+        sub_agents=[build_low_stock_agent(), build_supplier_info_agent(), build_best_supplier_agent()]
+    )
 
 # Step 2: Parallel agents (use high_risk_agent output)
-parallel_agent_1 = ParallelAgent(
-    name="ParallelInsightsAgent",
-    sub_agents=[plot_agent, digitalLog_agent, inventory_agent]
-)
-
-pipeline_agent = SequentialAgent(
-    name="AgentPipeline",
-    sub_agents=[initial_agent, parallel_agent_1]
-)
-
-final_pipeline_agent = ParallelAgent(
-    name="FinalPipelineAgent",
-    sub_agents=[pipeline_agent, parallel_agent]
-)
\ No newline at end of file
+def build_parallel_agent_1():
+    return adk_agent(
+        "ParallelAgent",
+        name="ParallelInsightsAgent",
+        sub_agents=[build_plot_agent(), build_digitalLog_agent(), build_inventory_agent()]
+    )
+
+def build_pipeline_agent():
+    return adk_agent(
+        "SequentialAgent",
+        name="AgentPipeline",
+        sub_agents=[build_initial_agent(), build_parallel_agent_1()]
+    )
+
+def build_final_pipeline_agent():
+    return adk_agent(
+        "ParallelAgent",
+        name="FinalPipelineAgent",
+        sub_agents=[build_pipeline_agent(), build_parallel_agent()]
+    )
+# Each agent is built on first access (each with its own sub-agent tree, as ADK agents can only have one
+# parent), so importing this module neither imports google.adk nor runs the maintenance plan
+__getattr__ = lazy_attributes(__name__, {
+    name: globals()[f"build_{name}"]
+    for name in ["high_risk_agent", "historical_analysis_agent", "code_json_cleaner_agent", "log_filter_agent",
+                 "failure_summary_agent", "initial_agent", "plot_agent", "digitalLog_agent", "inventory_agent",
+                 "parallel_agent_1", "pipeline_agent", "final_pipeline_agent"]
+})
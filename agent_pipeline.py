@@ -0,0 +1,199 @@
+# agent_pipeline.py
+
+import json
+import os
+import pickle
+
+from SummarizationTool import run_summary_and_alert_pipeline, SUMMARY_AGENT_BUILDERS, SUMMARY_MODE, build_batched_summary_alert_agent
+from adk_riskAnalysisWorkflow import build_final_pipeline_agent
+from sample_final import maintenance_results, BUDGET, LABOR_LIMITS
+from ResponseProcessing import preprocessingResponse
+from categorical_model import load_shared
+from failure_model import apply_probability_source, PROBABILITY_SOURCE
+from hierarchy_index import PlantHierarchy
+from pipeline_cache import agent_config, pipeline_fingerprint, cached_result, store_result
+from read_env import *
+
+APP_NAME = "machine_repair_ops"
+USER_ID = "repair_user_01"
+SESSION_ID = "repair_session_01"
+# Send each line's agents only the Inventory and Supplier rows of that line's parts (off: the full tables)
+LINE_PARTS_ONLY = os.environ.get("AGENT_LINE_PARTS_ONLY", "0") == "1"
+# Columns of each dataset payload the agents read (the fitted failure model also needs age and max_age)
+PAYLOAD_COLUMNS = {
+    "line_components": ["equipment_id", "line", "component", "part", "age", "max_age", "failure_probability"],
+    "historical": ["Cycle", "Line", "Equipment", "Part", "Parameter", "Expected_value_min", "Expected_value_max",
+                   "Value", "Date"],
+    "digital_log": ["Date", "Line", "Equipment", "Part", "Downtime_hrs", "Reason_code", "Recommended_action",
+                    "Action_taken"],
+}
+
+AGENT_INDEX_MAP = {
+    "HighRiskIdentificationAgent": 0,
+    "CodeJsonCleanerAgent": 2,
+    "LogFilterAgent": 3,
+    "FailureSummaryAgent": 4,
+    "LowStockPartsAgent": 5,
+    "SupplierInfoAgent": 6,
+    "BestSupplierSelectorAgent": 7,
+    "HistoricalAnalysisAgent": 1,
+    "MaintenancePlanAgent": 8,
+    "PostOptimizationAgent": 9,
+    "part_usage_agent": 10
+}
+
+# -------------------------------
+# Function: pipeline_request
+# -------------------------------
+
+def pipeline_request(summary_mode: str = None, probability_source: str = None) -> dict:
+    """
+    The settings of a dashboard pipeline run, as submitted to the job queue (see pipeline_jobs).
+    """
+    return {
+        "summary_mode": summary_mode or SUMMARY_MODE,
+        "probability_source": probability_source or PROBABILITY_SOURCE,
+    }
+
+# -------------------------------
+# Function: pipeline_config
+# -------------------------------
+
+def pipeline_config(summary_mode: str = None, probability_source: str = None) -> dict:
+    """
+    Everything besides the input files that changes the pipeline output.
+    """
+    summary_agents = {}
+    for build in list(SUMMARY_AGENT_BUILDERS.values()) + [build_batched_summary_alert_agent]:
+        summary_agents.update(agent_config(build()))
+    return {
+        "agents": agent_config(build_final_pipeline_agent()),
+        "summary_agents": summary_agents,
+        "summary_mode": summary_mode or SUMMARY_MODE,
+        "budget": BUDGET,
+        "labor_limits": LABOR_LIMITS,
+        "failure_probability_source": probability_source or PROBABILITY_SOURCE,
+        "line_parts_only": LINE_PARTS_ONLY,
+    }
+
+# -------------------------------
+# Function: run_agent_pipeline
+# -------------------------------
+
+async def run_agent_pipeline(summary_mode: str = None, probability_source: str = None,
+                             on_progress=None, on_result=None, background_summaries: bool = False) -> str:
+    """
+    Runs the agent pipeline for the first rendered line and returns the path of its final_ui artifact.
+
+    on_progress, if given, is called with a short message at every stage; on_result with the cached
+    artifact path every time one is written (templated alerts first, then the LLM summaries).
+    Only a result whose alerts are all LLM prose is served from the cache by later runs.
+    With background_summaries the LLM summaries are written by a daemon thread after this returns.
+    """
+    def progress(message):
+        print(message)
+        if on_progress is not None:
+            on_progress(message)
+
+    plant_hierarchy = PlantHierarchy.from_datasets()
+    # The app renders every line after the first one
+    unique_lines = plant_hierarchy.lines()[1:]
+
+    # Unchanged inputs and config: serve the stored result without calling any agent
+    progress("Checking the pipeline cache")
+    fingerprint, manifest = pipeline_fingerprint(pipeline_config(summary_mode, probability_source))
+    # Only the first line is rendered, so only that line's result is looked up
+    cached_path = cached_result(fingerprint, unique_lines[0]) if unique_lines else None
+    if cached_path:
+        progress(f"Pipeline cache hit for {unique_lines[0]}")
+        if on_result is not None:
+            on_result(cached_path)
+        return cached_path
+
+    # google.adk and the maintenance plan are only loaded when the agents actually run
+    from google.adk.sessions import InMemorySessionService
+    from google.adk.runners import Runner
+    from google.genai import types
+
+    progress("Computing the maintenance plan")
+    plan = maintenance_results()
+    session_service = InMemorySessionService()
+    await session_service.create_session(
+        app_name=APP_NAME,
+        user_id=USER_ID,
+        session_id=SESSION_ID
+    )
+    runner = Runner(agent=build_final_pipeline_agent(), app_name=APP_NAME, session_service=session_service)
+
+    # Load datasets with shared categorical codes and serialise each table once;
+    # no dict-of-records copy is kept next to the DataFrames
+    dataset_payloads = {
+        "LineComponents": "line_components",
+        "HistoricalData": "historical",
+        "DigitalLogs": "digital_log",
+    }
+    for payload_key, dataset_name in dataset_payloads.items():
+        dataset_df = load_shared(dataset_name, columns=PAYLOAD_COLUMNS[dataset_name])
+        if dataset_name == "line_components":
+            dataset_df = apply_probability_source(dataset_df, probability_source)
+        dataset_payloads[payload_key] = json.dumps({payload_key: dataset_df.to_dict(orient='records')})
+    inventory_df = load_shared("inventory")
+    supplier_df = load_shared("suppliers")
+
+    for selected_line in unique_lines:
+        progress(f"Running agents for {selected_line}")
+
+        line_inventory, line_supplier = plant_hierarchy.stock_tables(
+            selected_line, inventory_df, supplier_df, line_parts_only=LINE_PARTS_ONLY
+        )
+
+        content = types.Content(
+            role="user",
+            parts=[
+                types.Part(text=f"line_name: {selected_line}"),
+                *[types.Part(text=payload) for payload in dataset_payloads.values()],
+                types.Part(text=json.dumps({"Inventory": line_inventory.to_dict(orient='records')})),
+                types.Part(text=json.dumps({"Supplier": line_supplier.to_dict(orient='records')})),
+                types.Part(text=json.dumps({"analysis_summary": plan["analysis_summary"]})),
+                types.Part(text=json.dumps({"full_schedule": plan["full_schedule"]})),
+                types.Part(text=json.dumps({"summary": plan["clean_summary"]}))
+            ]
+        )
+
+        responses = [None] * 11
+        async for event in runner.run_async(user_id=USER_ID, session_id=SESSION_ID, new_message=content):
+            agent_name = getattr(event, "author", "UnknownAgent")
+            response_text = ""
+            if hasattr(event, "content") and event.content and event.content.parts:
+                for part in event.content.parts:
+                    if part.text:
+                        response_text += part.text + "\n"
+            if agent_name in AGENT_INDEX_MAP:
+                responses[AGENT_INDEX_MAP[agent_name]] = response_text.strip()
+                progress(f"{agent_name} answered ({sum(r is not None for r in responses)}/{len(responses)})")
+
+        safe_line_name = selected_line.replace(" ", "_")
+        filename = f"responses_{safe_line_name}.pkl"
+
+        with open(filename, "wb") as f:
+            pickle.dump(responses, f)
+
+        progress("Processing agent responses")
+        processed_response_pickle_file_name = await preprocessingResponse(filename)
+
+        published = []
+
+        def publish(path, complete):
+            # Templated alerts are stored as a partial result, which later runs do not treat as a hit
+            published.append(store_result(fingerprint, selected_line, path, manifest, complete=complete))
+            if on_result is not None:
+                on_result(published[-1])
+
+        # Templated alerts are written at once; LLM prose replaces them when it arrives
+        progress("Writing alerts")
+        await run_summary_and_alert_pipeline(
+            processed_response_pickle_file_name, mode=summary_mode, background=background_summaries,
+            on_update=publish,
+        )
+        progress("Alerts ready")
+        return published[-1]
@@ -0,0 +1,104 @@
+# breach_analytics.py
+
+import numpy as np
+import pandas as pd
+
+from dataset_loader import DATASETS, load_dataset
+
+HISTORICAL_DATA_PATH = DATASETS["historical"]
+SERIES_KEYS = ["Line", "Equipment", "Part", "Parameter"]
+
+# -------------------------------
+# Function: load_historical_data
+# -------------------------------
+
+def load_historical_data(file_path: str = HISTORICAL_DATA_PATH) -> pd.DataFrame:
+    """
+    Loads the historical sensor data through the shared Parquet dataset cache.
+    """
+    return load_dataset(file_path)
+
+# -------------------------------
+# Function: flag_breaches
+# -------------------------------
+
+def flag_breaches(historical_df: pd.DataFrame) -> dict:
+    """
+    Computes breach masks, deviations and breach-run lengths for every row in one vectorized pass.
+
+    A breach run is a sequence of consecutive cycles of the same (Line, Equipment, Part, Parameter)
+    series that are all outside [Expected_value_min, Expected_value_max]; a missing cycle (a gap of more
+    than one) ends the run. Returns NumPy arrays
+    aligned with the rows of historical_df.
+    """
+    value = historical_df["Value"].to_numpy(dtype=float)
+    high = value > historical_df["Expected_value_max"].to_numpy(dtype=float)
+    low = value < historical_df["Expected_value_min"].to_numpy(dtype=float)
+    breach = high | low
+    deviation = np.where(high, value - historical_df["Expected_value_max"].to_numpy(dtype=float),
+                         np.where(low, historical_df["Expected_value_min"].to_numpy(dtype=float) - value, 0.0))
+
+    # Order rows by series then cycle using one integer sort key instead of string comparisons
+    series = _series_codes(historical_df)
+    cycle = historical_df["Cycle"].to_numpy(dtype=np.int64)
+    cycle_span = int(cycle.max() - cycle.min()) + 1 if len(cycle) else 1
+    if (int(series.max()) + 1 if len(series) else 1) * cycle_span < 2 ** 62:
+        order = np.argsort(series * cycle_span + (cycle - cycle.min()), kind="stable")
+    else:
+        order = np.lexsort([cycle, series])
+
+    sorted_breach = breach[order]
+    sorted_series = series[order]
+    sorted_cycle = cycle[order]
+    new_run = np.ones(len(order), dtype=bool)
+    new_run[1:] = ((sorted_breach[1:] != sorted_breach[:-1]) | (sorted_series[1:] != sorted_series[:-1])
+                   | (sorted_cycle[1:] - sorted_cycle[:-1] > 1))
+    run_id = np.cumsum(new_run) - 1
+    run_length_sorted = np.bincount(run_id)[run_id]
+
+    run_length = np.zeros(len(order), dtype=np.int64)
+    run_length[order] = np.where(sorted_breach, run_length_sorted, 0)
+
+    return {"breach": breach, "high": high, "low": low, "deviation": deviation, "run_length": run_length}
+
+def _series_codes(df: pd.DataFrame) -> np.ndarray:
+    """
+    One int64 code per (Line, Equipment, Part, Parameter) series.
+    """
+    code = np.zeros(len(df), dtype=np.int64)
+    for col in SERIES_KEYS:
+        if col not in df.columns:
+            continue
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            codes, size = df[col].cat.codes.to_numpy(dtype=np.int64), len(df[col].cat.categories)
+        else:
+            codes, uniques = pd.factorize(df[col])
+            size = len(uniques)
+        code = code * (size + 1) + (codes + 1)
+    if len(code) and code.max() > 2 ** 40:
+        code = pd.factorize(code)[0].astype(np.int64)
+    return code
+
+# -------------------------------
+# Function: find_parameter_breaches
+# -------------------------------
+
+def find_parameter_breaches(historical_df: pd.DataFrame, high_risk_parts: pd.DataFrame,
+                            part_col: str = "part") -> pd.DataFrame:
+    """
+    Returns the historical rows of high-risk parts whose Value is outside the expected range,
+    with Breach_direction, Deviation and Breach_run_length columns. Rows without a Parameter are ignored.
+    """
+    if historical_df.empty or high_risk_parts.empty:
+        return pd.DataFrame()
+
+    historical_df = historical_df[historical_df["Parameter"].notna()]
+
+    flags = flag_breaches(historical_df)
+    breaches = historical_df[flags["breach"]].copy()
+    breaches["Breach_direction"] = np.where(flags["high"][flags["breach"]], "high", "low")
+    breaches["Deviation"] = flags["deviation"][flags["breach"]].round(4)
+    breaches["Breach_run_length"] = flags["run_length"][flags["breach"]]
+
+    parts = high_risk_parts[[part_col]].drop_duplicates().rename(columns={part_col: "Part"})
+    return breaches.merge(parts, on="Part", how="inner")
@@ -0,0 +1,88 @@
+# categorical_model.py
+
+from functools import lru_cache
+
+import pandas as pd
+
+from dataset_loader import load_dataset, file_fingerprint
+
+# One vocabulary per domain, shared by every column that holds values of that domain
+SHARED_DOMAINS = {
+    "line": ["Line", "line"],
+    "equipment": ["Equipment", "component"],
+    "part": ["Part", "part"],
+    "parameter": ["Parameter"],
+    "reason_code": ["Reason_code"],
+    "action": ["Action_taken", "Recommended_action"],
+    "supplier": ["Supplier"],
+}
+
+VOCABULARY_SOURCES = ["line_components", "historical", "digital_log", "inventory", "suppliers", "equipment"]
+
+COLUMN_DOMAINS = {col: domain for domain, cols in SHARED_DOMAINS.items() for col in cols}
+
+# -------------------------------
+# Function: shared_vocabulary
+# -------------------------------
+
+def shared_vocabulary() -> dict:
+    """
+    Returns {domain: CategoricalDtype} built from the union of values across all datasets.
+    A value such as "Husk Feed Screw" has the same integer code in every table that uses the dtype.
+    """
+    fingerprints = tuple(file_fingerprint(name) for name in VOCABULARY_SOURCES)
+    return _build_vocabulary(fingerprints)
+
+
+@lru_cache(maxsize=2)
+def _build_vocabulary(fingerprints: tuple) -> dict:
+    values = {domain: set() for domain in SHARED_DOMAINS}
+    for name in VOCABULARY_SOURCES:
+        df = load_dataset(name)
+        for col in df.columns:
+            if col in COLUMN_DOMAINS:
+                values[COLUMN_DOMAINS[col]].update(df[col].dropna().astype(str).unique())
+    return {domain: pd.CategoricalDtype(sorted(vals)) for domain, vals in values.items()}
+
+# -------------------------------
+# Function: to_shared_categories
+# -------------------------------
+
+def to_shared_categories(df: pd.DataFrame, vocabulary: dict = None) -> pd.DataFrame:
+    """
+    Casts the domain columns of a frame to the shared categorical dtypes.
+    Values missing from the vocabulary (e.g. from newly ingested rows) are appended as new categories,
+    so existing codes never change and no value is turned into NaN. A given vocabulary is extended in place,
+    so frames cast with it share codes; the cached shared vocabulary is copied and never changes.
+    """
+    vocabulary = dict(shared_vocabulary()) if vocabulary is None else vocabulary
+    df = df.copy()
+    for col in df.columns:
+        domain = COLUMN_DOMAINS.get(col)
+        if domain is None:
+            continue
+        dtype = vocabulary[domain]
+        values = df[col].astype(str).where(df[col].notna())
+        unseen = pd.Index(values.dropna().unique()).difference(dtype.categories)
+        if len(unseen):
+            dtype = pd.CategoricalDtype(dtype.categories.append(unseen))
+            vocabulary[domain] = dtype
+        df[col] = values.astype(dtype)
+    return df
+
+# -------------------------------
+# Function: load_shared
+# -------------------------------
+
+def load_shared(name_or_path: str, columns: list = None) -> pd.DataFrame:
+    """
+    load_dataset with the domain columns cast to the shared categorical dtypes.
+    """
+    return to_shared_categories(load_dataset(name_or_path, columns=columns))
+
+
+def domain_codes(series: pd.Series):
+    """
+    Integer codes of a shared-categorical column, usable as a join key across datasets.
+    """
+    return series.cat.codes.to_numpy()
@@ -0,0 +1,216 @@
+# dataset_loader.py
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+CACHE_DIR = ".dataset_cache"
+MANIFEST_PATH = os.path.join(CACHE_DIR, "manifest.json")
+MANIFEST_LOCK_PATH = os.path.join(CACHE_DIR, "manifest.lock")
+# Superseded Parquet files are kept this long, so readers that still have them open are not disturbed
+STALE_PARQUET_S = 3600
+
+DATASETS = {
+    "line_components": os.path.join("datasets", "Line_components_new.csv"),
+    "historical": os.path.join("datasets", "Historical_data.csv"),
+    "digital_log": os.path.join("datasets", "Digital_log.csv"),
+    "inventory": os.path.join("datasets", "Inventory.xlsx"),
+    "suppliers": os.path.join("datasets", "Suppliers.xlsx"),
+    "equipment": os.path.join("datasets", "synthetic_limited_line_equipment_data_with_maps.csv"),
+}
+
+# Text columns with at most this share of distinct values are stored as categoricals
+CATEGORICAL_MAX_UNIQUE_RATIO = 0.5
+
+# -------------------------------
+# Function: load_dataset
+# -------------------------------
+
+def load_dataset(name_or_path: str, columns: list = None) -> pd.DataFrame:
+    """
+    Loads a dataset by name (see DATASETS) or path through a Parquet cache.
+
+    The source CSV/Excel file is parsed once and stored as typed Parquet with categorical text
+    columns. The cache is reused while the source mtime and size are unchanged; if they change,
+    the content hash decides whether the source is re-parsed. Only `columns` are read when given.
+    """
+    return pd.read_parquet(_cache_entry(name_or_path)["parquet"], columns=columns)
+
+
+def dataset_columns(name_or_path: str) -> list:
+    """
+    Column names of a dataset, read from its Parquet schema without loading any rows.
+    """
+    return pq.read_schema(_cache_entry(name_or_path)["parquet"]).names
+
+
+def _cache_entry(name_or_path: str) -> dict:
+    path = DATASETS.get(name_or_path, name_or_path)
+    manifest = _load_manifest()
+    entry = _fresh_entry(path, manifest)
+    if entry is None:
+        entry = _build_cache(path, manifest)
+    return entry
+
+# -------------------------------
+# Function: file_fingerprint
+# -------------------------------
+
+def file_fingerprint(name_or_path: str) -> str:
+    """
+    Content hash of a source file, reusing the cached hash while mtime and size are unchanged.
+    """
+    path = DATASETS.get(name_or_path, name_or_path)
+    manifest = _load_manifest()
+    entry = manifest.get(os.path.abspath(path))
+    stat = os.stat(path)
+    if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+        return entry["sha256"]
+    return _sha256(path)
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_manifest() -> dict:
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _update_manifest(key: str, entry: dict) -> None:
+    """
+    Sets one manifest entry. The manifest is re-read under the lock, so concurrent loaders updating
+    other entries are not lost, and replaced atomically, so readers never see a partial file.
+    """
+    with _manifest_lock():
+        manifest = _load_manifest()
+        manifest[key] = entry
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix="manifest.", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, MANIFEST_PATH)
+
+
+@contextmanager
+def _manifest_lock():
+    """
+    Exclusive lock on the manifest across processes.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(MANIFEST_LOCK_PATH, "a+") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        else:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _fresh_entry(path: str, manifest: dict):
+    """
+    Returns the manifest entry if its Parquet file still matches the source, else None.
+    """
+    key = os.path.abspath(path)
+    entry = manifest.get(key)
+    if not entry or not os.path.exists(entry["parquet"]):
+        return None
+    stat = os.stat(path)
+    if entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+        return entry
+    # Touched but possibly unchanged: compare content before re-parsing
+    if _sha256(path) == entry["sha256"]:
+        entry.update(mtime=stat.st_mtime, size=stat.st_size)
+        _update_manifest(key, entry)
+        return entry
+    return None
+
+
+def _build_cache(path: str, manifest: dict) -> dict:
+    """
+    Parses the source into a Parquet file named after its content hash and records it in the manifest.
+    A file for the same content is never rewritten and a superseded one is not deleted while it may
+    still be open; it is removed by a later build once older than STALE_PARQUET_S.
+    """
+    sha = _sha256(path)
+    stat = os.stat(path)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    parquet_path = os.path.join(CACHE_DIR, f"{stem}_{sha[:16]}.parquet")
+    if not os.path.exists(parquet_path):
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=f"{stem}_{sha[:16]}.", suffix=".tmp")
+        os.close(fd)
+        _read_source(path).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+
+    key = os.path.abspath(path)
+    entry = {"mtime": stat.st_mtime, "size": stat.st_size, "sha256": sha, "parquet": parquet_path}
+    _update_manifest(key, entry)
+    manifest[key] = entry
+    _remove_stale_parquet(stem, parquet_path)
+    return entry
+
+
+def _remove_stale_parquet(stem: str, current_path: str) -> None:
+    """
+    Deletes earlier Parquet versions of a source that have not been written for STALE_PARQUET_S.
+    """
+    cutoff = time.time() - STALE_PARQUET_S
+    # Versions (and temporary files left by interrupted builds) of this source only
+    pattern = re.compile(rf"{re.escape(stem)}_[0-9a-f]{{16}}(\.parquet|\..+\.tmp)")
+    for name in os.listdir(CACHE_DIR):
+        candidate = os.path.join(CACHE_DIR, name)
+        if candidate == current_path or not pattern.fullmatch(name):
+            continue
+        try:
+            if os.path.getmtime(candidate) < cutoff:
+                os.remove(candidate)
+        except OSError:  # removed by another process, or still open on Windows
+            pass
+
+
+def _read_source(path: str) -> pd.DataFrame:
+    if path.endswith((".xlsx", ".xls")):
+        df = pd.read_excel(path)
+    else:
+        df = pd.read_csv(path)
+    return _compact_types(df)
+
+
+def _compact_types(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Stores repeated text as categoricals.
+    """
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            if series.nunique(dropna=True) <= CATEGORICAL_MAX_UNIQUE_RATIO * max(len(series), 1):
+                df[col] = series.astype("category")
+    return df
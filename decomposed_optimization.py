@@ -0,0 +1,443 @@
+# decomposed_optimization.py
+
+import copy
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pulp import LpProblem, LpMaximize, LpVariable, LpBinary, lpSum, LpStatus, PULP_CBC_CMD
+
+from knapsack_solver import surrogate_bound, ratio_order
+
+# Relative gap to the LP bound under which the merged plan is reported optimal
+BOUND_TOLERANCE = 1e-9
+# Price (subgradient) iterations over the budget and labor multipliers, each followed by a re-split
+PRICE_ITERATIONS = int(os.environ.get("DECOMPOSED_PRICE_ITERATIONS", "40"))
+# Stop once the best merged plan is within this relative gap of the bound
+PRICE_GAP_TOLERANCE = 1e-4
+# Subgradient step scale; halved after PRICE_PATIENCE iterations without a better dual value
+PRICE_STEP = 1.0
+PRICE_PATIENCE = 4
+# Items each line drops from or adds to its best plan when re-solved around it
+NEIGHBOUR_DEPTH = 3
+# Whether to also solve the plant-wide model and report how far the merged plan is from it
+COMPARE_MONOLITHIC = os.environ.get("DECOMPOSED_COMPARE_MONOLITHIC", "1") == "1"
+
+# -------------------------------
+# Function: solve_decomposed
+# -------------------------------
+
+def solve_decomposed(optimizer, df: pd.DataFrame, budget: float, group_col: str = "line", max_workers: int = None,
+                     compare_monolithic: bool = COMPARE_MONOLITHIC, price_iterations: int = PRICE_ITERATIONS,
+                     cost_col: str = "cost", fail_prob_col: str = "failure_probability",
+                     risk_impact_col: str = "risk_impact", labor_col: str = "labor_hours") -> pd.DataFrame:
+    """
+    Splits the plant budget and labor pool between lines and solves each line with `optimizer`
+    (a MaintenanceOptimizer) in its own worker process, re-splitting under updated prices.
+
+    The first split comes from the LP solution of the surrogate plant constraint: each line gets the resources
+    of its items in the LP solution, and what the LP leaves over goes to lines in proportion to their remaining
+    demand; every line is also solved under the whole plant limits. The budget and labor multipliers then take
+    subgradient (Polyak) steps on the Lagrangian dual, and each iteration re-solves the lines under three kinds
+    of allocation: the resources of the items worth their priced cost, the LP mix of every line plan solved so
+    far, and each line's best plan with one item less or one item more. Every distinct line plan is kept, and a
+    small MILP picks the best combination of one plan per line within the plant limits; whatever a plan leaves
+    unused is filled across lines. Iteration stops after price_iterations re-splits or once the best plan is
+    within PRICE_GAP_TOLERANCE of the bound (the tighter of the LP and the best Lagrangian value).
+
+    The merged plan is reported "Optimal" only when it reaches that bound, and "Feasible" otherwise, with gap
+    measured in risk removed against the bound, as solve_knapsack reports it. An integrality gap remains even
+    for the plant-wide optimum, so a "Feasible" plan may still be optimal; compare_monolithic (on unless
+    DECOMPOSED_COMPARE_MONOLITHIC=0) also solves the plant-wide model with the same optimizer and reports
+    monolithic_gap, the relative excess risk of the merged plan.
+    Returns the optimize_schedule columns; attrs["decomposition"] holds the best split, bound, gap, iteration
+    history, line statuses and timings.
+    """
+    start = time.perf_counter()
+    df = df.copy()
+    if risk_impact_col not in df.columns:
+        df[risk_impact_col] = 1.0
+
+    risk_if_not = df[fail_prob_col].to_numpy(dtype=float) * df[risk_impact_col].to_numpy(dtype=float)
+    values = risk_if_not - optimizer.alpha * risk_if_not
+    resources = {cost_col: df[cost_col].to_numpy(dtype=float)}
+    limits = {cost_col: float(budget)}
+    if optimizer.include_manpower_constraint and optimizer.manpower_limit is not None and labor_col in df.columns:
+        resources[labor_col] = df[labor_col].to_numpy(dtype=float)
+        limits[labor_col] = float(optimizer.manpower_limit)
+
+    groups = df[group_col].astype(str).to_numpy()
+    names = list(dict.fromkeys(groups.tolist()))
+    columns = dict(cost_col=cost_col, fail_prob_col=fail_prob_col, risk_impact_col=risk_impact_col, labor_col=labor_col)
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(names)))
+
+    allocation, bound, prices = _price_split(values, resources, limits, groups, names)
+    useful = _useful(values, resources, limits)
+    best, history = None, []
+    step, best_dual, stalled = PRICE_STEP, np.inf, 0
+
+    def consider(selected, line_allocation, line_stats, iteration):
+        nonlocal best
+        refilled = _fill_slack(selected, values, resources, limits)
+        removed = float(values[selected].sum())
+        if best is None or removed > best["removed"] + 1e-12:
+            best = {"removed": removed, "selected": selected, "allocation": line_allocation, "refilled": refilled,
+                    "line_stats": line_stats, "iteration": iteration}
+
+    with _LinePlans(optimizer, df, groups, names, columns, workers) as line_plans:
+        for iteration in range(max(price_iterations, 0) + 1):
+            if not iteration:
+                # Each line's plan under the whole plant limits, for plans no split can afford
+                splits, requests = [allocation], [(name, dict(limits)) for name in names]
+            else:
+                # Lagrangian subproblem at the current prices: it decouples item by item
+                split, dual, subgradient = _lagrangian_split(values, resources, limits, groups, names, prices)
+                bound = min(bound, dual)
+                if dual < best_dual - 1e-12:
+                    best_dual, stalled = dual, 0
+                else:
+                    stalled += 1
+                    if stalled >= PRICE_PATIENCE:
+                        step, stalled = step / 2, 0
+                splits = [split]
+                # The LP over every plan solved so far prices each line's resources in a second split
+                mix = line_plans.combine(values, resources, limits, relax=True)
+                if mix is not None:
+                    splits.append(_allocate(mix, resources, limits, groups, names, useful))
+                # Each line also tries its best plan with one item less and one item more
+                requests = _neighbour_requests(best["selected"], values, resources, limits, groups, names, useful)
+            line_plans.solve([(name, split[name]) for split in splits for name in names] + requests)
+
+            # Lines that share a split are merged into one plant plan, filled with what they leave unused
+            for split in splits:
+                selected, line_stats = line_plans.merge(split)
+                consider(selected, split, line_stats, iteration)
+            # Then the best feasible combination of one solved plan per line
+            chosen = line_plans.combine(values, resources, limits)
+            if chosen is not None:
+                consider(line_plans.selection(chosen), {name: plan["allocation"] for name, plan in chosen.items()},
+                         {name: plan["stats"] for name, plan in chosen.items()}, iteration)
+
+            gap = max(bound - best["removed"], 0.0) / bound if bound > 0 else 0.0
+            history.append({"iteration": iteration, "removed": best["removed"], "bound": bound, "gap": gap})
+            if gap <= PRICE_GAP_TOLERANCE or iteration == price_iterations:
+                break
+            if iteration:
+                # Polyak step towards the best plan's value; a zero subgradient means the prices are exact
+                norm = float(subgradient @ subgradient)
+                if norm <= 0:
+                    break
+                prices = np.maximum(prices - step * max(dual - best["removed"], 1e-12) / norm * subgradient, 0.0)
+        solve_elapsed, line_solves, plan_count = line_plans.elapsed_s, line_plans.solves, line_plans.count()
+
+    out = _schedule_frame(df, best["selected"], risk_if_not, optimizer.alpha)
+    out["solution_status"] = "Optimal" if gap <= BOUND_TOLERANCE else "Feasible"
+
+    summary = {
+        "lines": len(names),
+        "workers": workers,
+        "allocation": best["allocation"],
+        "line_stats": best["line_stats"],
+        "refilled": best["refilled"],
+        "objective": float(out["total_optimized_risk"].iloc[0]) if len(out) else 0.0,
+        "bound": float(risk_if_not.sum() - bound),
+        "gap": gap,
+        "iterations": len(history) - 1,
+        "line_solves": line_solves,
+        "line_plans": plan_count,
+        "best_iteration": best["iteration"],
+        "history": history,
+        "line_solve_s": solve_elapsed,
+        "elapsed_s": time.perf_counter() - start,
+    }
+    if compare_monolithic:
+        summary.update(_monolithic_gap(optimizer, df, budget, summary["objective"], columns))
+    out.attrs["decomposition"] = summary
+    out.attrs["solver_stats"] = {
+        "solver": "decomposed",
+        "status": out["solution_status"].iloc[0] if len(out) else "Optimal",
+        "objective": summary["objective"],
+        "gap": gap,
+        "elapsed_s": summary["elapsed_s"],
+    }
+    return out
+
+# -------------------------------
+# Coordination
+# -------------------------------
+
+def _price_split(values, resources, limits, groups, names) -> tuple:
+    """
+    ({line: {resource: amount}}, bound, prices) from the LP solution of the surrogate (Lagrangian) plant
+    constraint. bound is the LP optimum, an upper bound on the risk any plan can remove; prices are the LP
+    multipliers of the normalized resources (amount / limit), the starting point of the subgradient steps.
+    """
+    weights = list(resources.values())
+    capacities = list(limits.values())
+    useful = _useful(values, resources, limits)
+
+    share = np.zeros(len(values))
+    bound = 0.0
+    prices = np.zeros(len(weights))
+    candidates = np.flatnonzero(useful)
+    if len(candidates):
+        s, bound = surrogate_bound(values[candidates], [w[candidates] for w in weights], capacities)
+        order = ratio_order(values[candidates], s)
+        # Fraction of each item in the LP solution of sum(s * x) <= 1
+        room = np.clip(1.0 - np.concatenate([[0.0], np.cumsum(s[order])[:-1]]), 0.0, None)
+        share[candidates[order]] = np.minimum(1.0, room / np.maximum(s[order], 1e-12))
+        # The LP price of the surrogate constraint is the ratio of its first partial (or excluded) item;
+        # s is a convex combination of the normalized resources, so that price splits by its weights
+        partial = np.flatnonzero(share[candidates[order]] < 1.0)
+        if len(partial):
+            critical = order[partial[0]]
+            normalized = np.stack([w[candidates] / c for w, c in zip(weights, capacities)], axis=1)
+            mix = np.clip(np.linalg.lstsq(normalized, s, rcond=None)[0], 0.0, None)
+            prices = values[candidates][critical] / max(s[critical], 1e-12) * mix
+    return _allocate(share, resources, limits, groups, names, useful), bound, prices
+
+
+def _lagrangian_split(values, resources, limits, groups, names, prices) -> tuple:
+    """
+    Split, dual value and subgradient of the Lagrangian relaxation at prices (one per normalized resource).
+    Relaxing the plant constraints makes every item independent: it is taken when it removes more risk
+    than its priced resources cost, and each line is given the resources of its taken items.
+    """
+    useful = _useful(values, resources, limits)
+    normalized = np.stack([w / c for w, c in zip(resources.values(), limits.values())], axis=1)
+    reduced = values - normalized @ prices
+    taken = useful & (reduced > 0)
+    dual = float(reduced[taken].sum() + prices.sum())
+    subgradient = 1.0 - normalized[taken].sum(axis=0)
+    return _allocate(taken.astype(float), resources, limits, groups, names, useful), dual, subgradient
+
+
+def _useful(values, resources, limits) -> np.ndarray:
+    """
+    Items that remove risk and fit the plant limits on their own.
+    """
+    return (values > 0) & np.logical_and.reduce([w <= limits[col] for col, w in resources.items()])
+
+
+def _allocate(share, resources, limits, groups, names, useful) -> dict:
+    """
+    {line: {resource: amount}} giving each line the resources of its items' shares. Shares that overrun a
+    limit are scaled down to it; what they leave over goes to lines in proportion to their remaining demand.
+    """
+    allocation = {name: {} for name in names}
+    for col, w in resources.items():
+        used = {name: float((w * share)[groups == name].sum()) for name in names}
+        total_used = sum(used.values())
+        if total_used > limits[col]:
+            used = {name: amount * limits[col] / total_used for name, amount in used.items()}
+        demand = {name: float((w * (1.0 - share))[useful & (groups == name)].sum()) for name in names}
+        left = max(limits[col] - sum(used.values()), 0.0)
+        total_demand = sum(demand.values())
+        integral = bool(np.all(w == np.round(w)))
+        for name in names:
+            extra = demand[name] / total_demand if total_demand > 0 else 1.0 / len(names)
+            amount = used[name] + left * extra
+            # Whole units keep the line models integral; the fractions end up in the cross-line slack fill
+            allocation[name][col] = float(np.floor(amount + 1e-9)) if integral else amount
+    return allocation
+
+
+class _LinePlans:
+    """
+    Solves lines under given allocations (in a process pool with several workers), caching every
+    (line, allocation) solve, and keeps every distinct line plan for the plant-wide recombination.
+    """
+    def __init__(self, optimizer, df, groups, names, columns, workers):
+        self.optimizer, self.columns, self.names = optimizer, columns, names
+        self.rows = {name: np.flatnonzero(groups == name) for name in names}
+        self.frames = {name: df.iloc[self.rows[name]] for name in names}
+        self.size = len(df)
+        self.results = {}
+        # {line: {selected rows: {"rows", "allocation", "stats"}}}, each line starting with the empty plan
+        self.plans = {name: {(): {"rows": (), "allocation": None, "stats": None}} for name in names}
+        self.pool = ProcessPoolExecutor(workers) if workers > 1 else None
+        self.elapsed_s, self.solves = 0.0, 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def solve(self, requests) -> None:
+        """
+        Solves every untried (line, allocation) request in one parallel batch.
+        """
+        todo = list(dict.fromkeys((name, _allocation_key(allocation)) for name, allocation in requests))
+        todo = [key for key in todo if key not in self.results]
+        if not todo:
+            return
+        tasks = [(self.optimizer, self.frames[name], dict(allocation), self.columns) for name, allocation in todo]
+        start = time.perf_counter()
+        solved = list(self.pool.map(_solve_line, tasks)) if self.pool else [_solve_line(task) for task in tasks]
+        self.elapsed_s += time.perf_counter() - start
+        self.solves += len(tasks)
+        for (name, allocation), (maintain, stats) in zip(todo, solved):
+            self.results[(name, allocation)] = (maintain, stats)
+            rows = tuple(self.rows[name][maintain == 1].tolist())
+            self.plans[name].setdefault(rows, {"rows": rows, "allocation": dict(allocation), "stats": stats})
+
+    def merge(self, split) -> tuple:
+        """
+        (selected mask, line stats) of the line plans solved under split.
+        """
+        selected = np.zeros(self.size, dtype=bool)
+        line_stats = {}
+        for name in self.names:
+            maintain, line_stats[name] = self.results[(name, _allocation_key(split[name]))]
+            selected[self.rows[name]] = maintain == 1
+        return selected, line_stats
+
+    def selection(self, chosen) -> np.ndarray:
+        selected = np.zeros(self.size, dtype=bool)
+        selected[[row for plan in chosen.values() for row in plan["rows"]]] = True
+        return selected
+
+    def count(self) -> int:
+        return sum(len(plans) for plans in self.plans.values())
+
+    def combine(self, values, resources, limits, relax: bool = False):
+        """
+        {line: plan} choosing one solved plan per line (or none) to remove the most risk within the plant
+        limits: a small multiple-choice knapsack over the plans, solved as a MILP. None if it fails.
+        With relax, the LP relaxation instead: returns each row's share in the fractional mix of plans.
+        """
+        problem = LpProblem("CombineLinePlans", LpMaximize)
+        plans = [(n, plan) for n, name in enumerate(self.names) for plan in self.plans[name].values()]
+        choices = [LpVariable(f"plan_{n}_{k}", 0, 1, cat="Continuous" if relax else LpBinary)
+                   for k, (n, _) in enumerate(plans)]
+        problem += lpSum(float(values[list(plan["rows"])].sum()) * var for (_, plan), var in zip(plans, choices))
+        for n in range(len(self.names)):
+            problem += lpSum(var for (m, _), var in zip(plans, choices) if m == n) == 1
+        for col, w in resources.items():
+            problem += lpSum(float(w[list(plan["rows"])].sum()) * var for (_, plan), var in zip(plans, choices)) \
+                <= limits[col]
+        problem.solve(PULP_CBC_CMD(msg=False))
+        if LpStatus[problem.status] != "Optimal":
+            return None
+        if relax:
+            share = np.zeros(self.size)
+            for (_, plan), var in zip(plans, choices):
+                share[list(plan["rows"])] += var.varValue or 0.0
+            return np.minimum(share, 1.0)
+        return {self.names[n]: plan for (n, plan), var in zip(plans, choices) if (var.varValue or 0) > 0.5}
+
+
+def _neighbour_requests(selected, values, resources, limits, groups, names, useful) -> list:
+    """
+    (line, allocation) requests around the best plan: each line's used resources without its least valuable
+    item per priced resource, with its most valuable unselected item that fits added, and with both.
+    """
+    priced = sum(w / max(limit, 1e-9) for w, limit in zip(resources.values(), limits.values()))
+    ratio = values / np.maximum(priced, 1e-12)
+    capacity = np.array(list(limits.values()))
+    requests = []
+    for name in names:
+        line = groups == name
+        used = np.array([w[selected & line].sum() for w in resources.values()])
+        chosen = np.flatnonzero(selected & line)
+        unchosen = np.flatnonzero(~selected & line & useful)
+        # Without its NEIGHBOUR_DEPTH least valuable items, one at a time and cumulatively
+        cumulative = used.copy()
+        for i in chosen[np.argsort(ratio[chosen])][:NEIGHBOUR_DEPTH]:
+            cumulative = cumulative - _weights(resources, i)
+            requests += [(name, dict(zip(resources, used - _weights(resources, i)))),
+                         (name, dict(zip(resources, cumulative)))]
+        # With its NEIGHBOUR_DEPTH most valuable unselected items that fit, one at a time and cumulatively
+        cumulative = used.copy()
+        fits = [i for i in unchosen[np.argsort(-ratio[unchosen])] if (used + _weights(resources, i) <= capacity).all()]
+        for i in fits[:NEIGHBOUR_DEPTH]:
+            requests.append((name, dict(zip(resources, used + _weights(resources, i)))))
+            if (cumulative + _weights(resources, i) <= capacity).all():
+                cumulative = cumulative + _weights(resources, i)
+                requests.append((name, dict(zip(resources, cumulative))))
+    return requests
+
+
+def _weights(resources, i) -> np.ndarray:
+    return np.array([w[i] for w in resources.values()])
+
+
+def _allocation_key(allocation) -> tuple:
+    return tuple(sorted((col, float(amount)) for col, amount in allocation.items()))
+
+
+def _solve_line(task) -> tuple:
+    """
+    Solves one line with its share of the budget and labor; runs in a worker process.
+    """
+    optimizer, line_df, allocation, columns = task
+    optimizer = copy.copy(optimizer)
+    labor_col = columns["labor_col"]
+    if labor_col in allocation:
+        optimizer.include_manpower_constraint = True
+        optimizer.manpower_limit = allocation[labor_col]
+    optimizer.msg = False
+    result = optimizer.optimize_schedule(line_df, allocation[columns["cost_col"]], **columns)
+    return result["maintain"].to_numpy(dtype=int), result.attrs.get("solver_stats")
+
+
+def _fill_slack(selected, values, resources, limits) -> int:
+    """
+    Adds unselected items, best risk per priced resource first, with what the line solutions left unused.
+    """
+    weights = list(resources.values())
+    left = np.array([limit - w[selected].sum() for w, limit in zip(weights, limits.values())])
+    priced = sum(w / max(limit, 1e-9) for w, limit in zip(weights, limits.values()))
+    candidates = np.flatnonzero(~selected & (values > 0))
+    added = 0
+    for i in candidates[ratio_order(values[candidates], priced[candidates])]:
+        need = np.array([w[i] for w in weights])
+        if (need <= left).all():
+            selected[i] = True
+            left -= need
+            added += 1
+    return added
+
+# -------------------------------
+# Results
+# -------------------------------
+
+def _schedule_frame(df, selected, risk_if_not, alpha) -> pd.DataFrame:
+    """
+    Same result columns as MaintenanceOptimizer.optimize_schedule.
+    """
+    optimized_risk = np.where(selected, alpha * risk_if_not, risk_if_not)
+    df["maintain"] = selected.astype(int)
+    df["decision"] = np.where(selected, "Maintain", "Skip")
+    df["optimized_risk"] = optimized_risk
+
+    maintained_rows = np.flatnonzero(selected)
+    maintained_rows = maintained_rows[np.argsort(optimized_risk[maintained_rows], kind="stable")]
+    maintenance_order = np.full(len(df), None, dtype=object)
+    maintenance_order[maintained_rows] = list(range(1, len(maintained_rows) + 1))
+    df["maintenance_order"] = maintenance_order
+    df["total_optimized_risk"] = optimized_risk.sum()
+    return df
+
+
+def _monolithic_gap(optimizer, df, budget, objective, columns) -> dict:
+    """
+    Solves the plant-wide model for reference; monolithic_gap is the relative excess risk of the merged plan.
+    """
+    start = time.perf_counter()
+    optimizer = copy.copy(optimizer)
+    optimizer.msg = False
+    plant_df = df.drop(columns=["maintain", "decision", "optimized_risk", "maintenance_order",
+                                "total_optimized_risk", "solution_status"])
+    monolithic = optimizer.optimize_schedule(plant_df, budget, **columns)
+    reference = float(monolithic["total_optimized_risk"].iloc[0]) if len(monolithic) else 0.0
+    return {
+        "monolithic_objective": reference,
+        "monolithic_status": (monolithic.attrs.get("solver_stats") or {}).get("status"),
+        "monolithic_elapsed_s": time.perf_counter() - start,
+        "monolithic_gap": (objective - reference) / reference if reference > 0 else 0.0,
+    }
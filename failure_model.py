@@ -0,0 +1,179 @@
+# failure_model.py
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from dataset_loader import load_dataset, file_fingerprint
+
+CACHE_DIR = ".failure_model"
+PARAMS_PATH = os.path.join(CACHE_DIR, "params.json")
+MODEL_SOURCES = ["line_components", "digital_log"]
+# The columns of each source the fit reads: component ages, and the dated failures per (line, part)
+MODEL_COLUMNS = {
+    "line_components": ["line", "part", "age", "max_age"],
+    "digital_log": ["Line", "Part", "Date"],
+}
+
+# "fitted" recomputes failure_probability from the logs, "static" keeps the column of the data files
+# (and is what "fitted" falls back to when no model can be fitted)
+PROBABILITY_SOURCES = ("static", "fitted")
+PROBABILITY_SOURCE = os.environ.get("FAILURE_PROBABILITY_SOURCE", "fitted")
+
+# Failure probabilities are for the next DEFAULT_HORIZON_DAYS days
+DEFAULT_HORIZON_DAYS = 30
+# Weibull shapes tried when fitting; the one with the highest profile likelihood is kept
+BETA_GRID = np.round(np.linspace(0.5, 5.0, 46), 2)
+# Pseudo-failures pulling each part type's rate toward the pooled rate, so sparse part types stay sane
+PRIOR_STRENGTH = 1.0
+DAYS_PER_YEAR = 365.25
+
+# -------------------------------
+# Function: fit_failure_model
+# -------------------------------
+
+def fit_failure_model(line_components_df: pd.DataFrame, digital_log_df: pd.DataFrame, beta: float = None) -> dict:
+    """
+    Fits a Weibull failure process per part type on age as a fraction of max_age.
+
+    Each component in Line_components contributes the failures logged for its (line, part) in Digital_log
+    and its exposure over the log window, (u^beta - (u - w)^beta) with u = age / max_age and w the window
+    in the same units. The shape beta is shared and picked from BETA_GRID by profile likelihood unless given
+    (e.g. a known wear-out shape); each part type gets its own rate, shrunk toward the pooled rate by
+    PRIOR_STRENGTH pseudo-failures.
+    """
+    dates = pd.to_datetime(digital_log_df["Date"].astype(str), format="%d-%m-%Y", errors="coerce").dropna()
+    window_days = float((dates.max() - dates.min()).days + 1) if len(dates) else 0.0
+
+    counts = digital_log_df.groupby([digital_log_df["Line"].astype(str), digital_log_df["Part"].astype(str)],
+                                    observed=True).size()
+    components = line_components_df.assign(line=line_components_df["line"].astype(str),
+                                           part=line_components_df["part"].astype(str))
+    failures = counts.reindex(pd.MultiIndex.from_frame(components[["line", "part"]])).fillna(0).to_numpy(dtype=float)
+
+    max_age = components["max_age"].to_numpy(dtype=float)
+    u = components["age"].to_numpy(dtype=float) / max_age
+    w = window_days / DAYS_PER_YEAR / max_age
+    parts, part_index = np.unique(components["part"].to_numpy(), return_inverse=True)
+
+    best = None
+    for beta in (BETA_GRID if beta is None else [beta]):
+        exposure = u ** beta - np.clip(u - w, 0.0, None) ** beta
+        rates, pooled = _part_rates(failures, exposure, part_index, len(parts))
+        expected = rates[part_index] * exposure
+        loglik = float(np.sum(failures * np.log(np.maximum(expected, 1e-300)) - expected))
+        if best is None or loglik > best["loglik"]:
+            best = {"beta": float(beta), "loglik": loglik, "rates": rates, "pooled": pooled, "exposure": exposure}
+
+    part_max_age = components.groupby("part")["max_age"].median()
+    return {
+        "beta": best["beta"],
+        "loglik": best["loglik"],
+        "pooled_rate": best["pooled"],
+        "window_days": window_days,
+        "default_max_age": float(np.median(max_age)),
+        "parts": {
+            str(part): {
+                "rate": float(best["rates"][k]),
+                "max_age": float(part_max_age[part]),
+                "failures": int(failures[part_index == k].sum()),
+                "exposure": float(best["exposure"][part_index == k].sum()),
+            }
+            for k, part in enumerate(parts)
+        },
+    }
+
+
+def _part_rates(failures, exposure, part_index, n_parts) -> tuple:
+    pooled = failures.sum() / max(exposure.sum(), 1e-12)
+    k = np.bincount(part_index, weights=failures, minlength=n_parts)
+    e = np.bincount(part_index, weights=exposure, minlength=n_parts)
+    # Gamma prior with PRIOR_STRENGTH pseudo-failures at the pooled rate
+    rates = (k + PRIOR_STRENGTH) / (e + PRIOR_STRENGTH / max(pooled, 1e-12))
+    return rates, float(pooled)
+
+# -------------------------------
+# Function: load_failure_model
+# -------------------------------
+
+def load_failure_model(beta: float = None) -> dict:
+    """
+    Fitted parameters for the current Line_components and Digital_log files, refitted only when one changes.
+    """
+    fingerprint = {name: file_fingerprint(name) for name in MODEL_SOURCES}
+    fingerprint["beta"] = beta
+    try:
+        with open(PARAMS_PATH) as f:
+            model = json.load(f)
+        if model.get("fingerprint") == fingerprint:
+            return model
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+
+    model = fit_failure_model(*(load_dataset(name, columns=MODEL_COLUMNS[name]) for name in MODEL_SOURCES), beta)
+    model["fingerprint"] = fingerprint
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{PARAMS_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(model, f, indent=2)
+    os.replace(tmp_path, PARAMS_PATH)
+    print(f"Fitted failure model: beta={model['beta']}, {len(model['parts'])} part types")
+    return model
+
+# -------------------------------
+# Function: failure_probabilities
+# -------------------------------
+
+def failure_probabilities(df: pd.DataFrame, model: dict = None, horizon_days: float = DEFAULT_HORIZON_DAYS) -> np.ndarray:
+    """
+    Probability that each component fails within the next horizon_days given its current age,
+    computed for all rows at once. Rows without max_age use their part type's, unknown part types the pooled rate.
+    """
+    model = model or load_failure_model()
+    parts = df["part"].astype(str)
+    params = model["parts"]
+    rate = parts.map({p: v["rate"] for p, v in params.items()}).fillna(model["pooled_rate"]).to_numpy(dtype=float)
+    part_max_age = parts.map({p: v["max_age"] for p, v in params.items()}).fillna(model["default_max_age"])
+    max_age = (df["max_age"].fillna(part_max_age) if "max_age" in df.columns else part_max_age).to_numpy(dtype=float)
+
+    beta = model["beta"]
+    u = df["age"].to_numpy(dtype=float) / max_age
+    h = horizon_days / DAYS_PER_YEAR / max_age
+    return 1.0 - np.exp(-rate * ((u + h) ** beta - u ** beta))
+
+
+def refresh_failure_probability(df: pd.DataFrame, model: dict = None,
+                                horizon_days: float = DEFAULT_HORIZON_DAYS) -> pd.DataFrame:
+    """
+    Copy of df with failure_probability recomputed by the fitted model; the previous column is kept as
+    failure_probability_static.
+    """
+    df = df.copy()
+    if "failure_probability" in df.columns:
+        df["failure_probability_static"] = df["failure_probability"]
+    df["failure_probability"] = failure_probabilities(df, model, horizon_days).round(3)
+    return df
+
+
+def apply_probability_source(df: pd.DataFrame, source: str = None) -> pd.DataFrame:
+    """
+    df with fitted failure probabilities for source "fitted", or as loaded for "static"
+    (default PROBABILITY_SOURCE, set by the FAILURE_PROBABILITY_SOURCE environment variable).
+    "fitted" falls back to the static column when df has no part ages or the logs cannot be fitted.
+    """
+    source = source or PROBABILITY_SOURCE
+    if source not in PROBABILITY_SOURCES:
+        raise ValueError(f"Unknown failure probability source: {source}. Expected one of {PROBABILITY_SOURCES}.")
+    if source == "static" or "part" not in df.columns or "age" not in df.columns:
+        return df
+    try:
+        model = load_failure_model()
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        print(f"Failure model unavailable ({e}); using the static failure probabilities")
+        return df
+    if not model["window_days"]:
+        print("Digital log has no dated entries; using the static failure probabilities")
+        return df
+    return refresh_failure_probability(df, model)
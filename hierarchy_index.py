@@ -0,0 +1,163 @@
+# hierarchy_index.py
+
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+from dataset_loader import load_dataset, file_fingerprint
+
+HIERARCHY_SOURCES = ["line_components", "historical", "digital_log", "inventory", "suppliers"]
+# The columns of each source the index is built from
+HIERARCHY_COLUMNS = {
+    "line_components": ["line", "component", "part"],
+    "historical": ["Line", "Equipment", "Part", "Parameter"],
+    "digital_log": ["Plant", "Line"],
+    "inventory": ["Part"],
+    "suppliers": ["Part"],
+}
+
+# -------------------------------
+# Class: PlantHierarchy
+# -------------------------------
+
+class PlantHierarchy:
+    def __init__(self, line_components_df: pd.DataFrame, historical_df: pd.DataFrame, digital_log_df: pd.DataFrame,
+                 inventory_df: pd.DataFrame, supplier_df: pd.DataFrame):
+        """
+        Precomputed plant -> line -> equipment -> part -> parameter index with part-to-row mappings
+        for the inventory and supplier tables. Every lookup is a dict hit.
+        """
+        self.line_plants = {}
+        self.plant_lines = {}
+        for plant, line in digital_log_df[["Plant", "Line"]].drop_duplicates().itertuples(index=False, name=None):
+            self.plant_lines.setdefault(str(plant), []).append(str(line))
+            self.line_plants.setdefault(str(line), []).append(str(plant))
+
+        # Lines in their order of first appearance in Line_components (same order as .unique())
+        self.component_lines = [str(line) for line in line_components_df["line"].dropna().unique()]
+        self.line_equipment = {}
+        self.part_lines = {}
+        self.part_equipment = {}
+        pairs = pd.concat([
+            line_components_df[["line", "component", "part"]].set_axis(["line", "equipment", "part"], axis=1),
+            historical_df[["Line", "Equipment", "Part"]].set_axis(["line", "equipment", "part"], axis=1),
+        ]).dropna().astype(str).drop_duplicates()
+        for line, equipment, part in pairs.itertuples(index=False, name=None):
+            parts = self.line_equipment.setdefault(line, {}).setdefault(equipment, [])
+            parts.append(part)
+            lines = self.part_lines.setdefault(part, [])
+            if line not in lines:
+                lines.append(line)
+            self.part_equipment[(line, part)] = equipment
+
+        self.part_parameters = {}
+        params = historical_df[["Line", "Part", "Parameter"]].astype(str).drop_duplicates()
+        for line, part, parameter in params.itertuples(index=False, name=None):
+            self.part_parameters.setdefault((line, part), []).append(parameter)
+
+        self.inventory_index = _row_index(inventory_df["Part"])
+        self.supplier_index = _row_index(supplier_df["Part"])
+        self._plot_index = {}
+
+    @classmethod
+    def from_datasets(cls) -> "PlantHierarchy":
+        """
+        Returns the hierarchy of the current datasets, rebuilt only when one of them changes.
+        """
+        return _cached_hierarchy(tuple(file_fingerprint(name) for name in HIERARCHY_SOURCES))
+
+    # -------------------------------
+    # Lookups
+    # -------------------------------
+
+    def lines(self, plant: str = None) -> list:
+        if plant is not None:
+            return list(self.plant_lines.get(plant, []))
+        return list(self.component_lines)
+
+    def equipment(self, line: str) -> list:
+        return list(self.line_equipment.get(line, {}))
+
+    def parts(self, line: str, equipment: str = None) -> list:
+        by_equipment = self.line_equipment.get(line, {})
+        if equipment is not None:
+            return list(by_equipment.get(equipment, []))
+        # A part fitted to several pieces of equipment of the line is listed once
+        return list(dict.fromkeys(part for parts in by_equipment.values() for part in parts))
+
+    def lines_for_part(self, part: str) -> list:
+        return list(self.part_lines.get(part, []))
+
+    def parameters(self, line: str, part: str) -> list:
+        return list(self.part_parameters.get((line, part), []))
+
+    def inventory_rows(self, parts) -> list:
+        """
+        Inventory row positions for the given parts.
+        """
+        return sorted(row for part in parts for row in self.inventory_index.get(part, []))
+
+    def supplier_rows(self, parts) -> list:
+        """
+        Supplier row positions for the given parts.
+        """
+        return sorted(row for part in parts for row in self.supplier_index.get(part, []))
+
+    def stock_tables(self, line: str, inventory_df: pd.DataFrame, supplier_df: pd.DataFrame,
+                     line_parts_only: bool = False) -> tuple:
+        """
+        (inventory, supplier) tables for the agents of line: the full tables, or with line_parts_only
+        only the rows of the line's parts.
+        """
+        if not line_parts_only:
+            return inventory_df, supplier_df
+        parts = self.parts(line)
+        return inventory_df.iloc[self.inventory_rows(parts)], supplier_df.iloc[self.supplier_rows(parts)]
+
+    # -------------------------------
+    # Plot files
+    # -------------------------------
+
+    def plot_files(self, part: str, line: str, plot_dir: str = "plots") -> list:
+        """
+        PNG files in plot_dir named "<Part>_<Line>_<...>.png", from an index rebuilt only when the directory changes.
+        """
+        mtime = os.stat(plot_dir).st_mtime
+        cached = self._plot_index.get(plot_dir)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, self._index_plots(plot_dir))
+            self._plot_index[plot_dir] = cached
+        return list(cached[1].get((_sanitize(part), _sanitize(line)), []))
+
+    def _index_plots(self, plot_dir: str) -> dict:
+        prefixes = {f"{_sanitize(part)}_{_sanitize(line)}": (_sanitize(part), _sanitize(line))
+                    for part, lines in self.part_lines.items() for line in lines}
+        index = {}
+        for file in sorted(os.listdir(plot_dir)):
+            if not file.endswith(".png"):
+                continue
+            tokens = file[:-len(".png")].split("_")
+            # Longest known "<part>_<line>" prefix of the file name
+            for k in range(len(tokens), 0, -1):
+                key = prefixes.get("_".join(tokens[:k]))
+                if key is not None:
+                    index.setdefault(key, []).append(file)
+                    break
+        return index
+
+
+def _sanitize(name: str) -> str:
+    return str(name).replace(" ", "_")
+
+
+def _row_index(values: pd.Series) -> dict:
+    index = {}
+    for row, value in enumerate(values.astype(str).tolist()):
+        index.setdefault(value, []).append(row)
+    return index
+
+
+@lru_cache(maxsize=2)
+def _cached_hierarchy(fingerprints: tuple) -> PlantHierarchy:
+    return PlantHierarchy(*(load_dataset(name, columns=HIERARCHY_COLUMNS[name]) for name in HIERARCHY_SOURCES))
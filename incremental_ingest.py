@@ -0,0 +1,175 @@
+# incremental_ingest.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from breach_analytics import HISTORICAL_DATA_PATH, flag_breaches
+from dataset_loader import DATASETS, load_dataset
+from sensor_store import SensorSeriesStore
+
+DIGITAL_LOG_PATH = DATASETS["digital_log"]
+SERIES_KEYS = ["Line", "Part", "Parameter"]
+LOG_KEYS = ["Line", "Part"]
+# Columns the aggregates read: the readings of each series, and the actions and downtime of each log entry
+INGEST_SENSOR_COLUMNS = SERIES_KEYS + ["Cycle", "Value", "Expected_value_min", "Expected_value_max", "Date"]
+INGEST_LOG_COLUMNS = LOG_KEYS + ["Action_taken", "Recommended_action", "Downtime_hrs"]
+
+# Same counting rules as the FailureSummaryAgent
+REPAIR_ACTION = "Fixed the part"
+REPLACEMENT_ACTION = "Replaced with spare parts"
+MAINTENANCE_RECOMMENDATION = "Maintenance"
+
+# -------------------------------
+# Class: IncrementalIngestor
+# -------------------------------
+
+class IncrementalIngestor:
+    def __init__(self, store: SensorSeriesStore = None, digital_log_df: pd.DataFrame = None, persist: bool = False):
+        """
+        Keeps the sensor store and derived aggregates current as new cycles and log entries arrive.
+
+        Aggregates are computed once from the full data, then updated from each batch only:
+        - breach_counts: per (Line, Part, Parameter) breaches, high/low split, max deviation, current/longest run,
+          first/last cycle
+        - last_seen: per (Line, Part, Parameter) latest Cycle and Value
+        - log_tallies: per (Line, Part) failures, repairs, replacements, maintenance_due, downtime hours
+        With persist=True each batch is also appended to the source CSV files.
+        The default store is private to this ingestor: batches are appended to it in place, so it is not the
+        shared SensorSeriesStore.from_dataset store other modules read.
+        """
+        self.store = store or SensorSeriesStore(load_dataset(HISTORICAL_DATA_PATH, columns=INGEST_SENSOR_COLUMNS))
+        self.persist = persist
+        self.breach_counts = self._breach_aggregates(self.store.frame)
+        self.last_seen = self._last_seen(self.store.frame)
+        log_df = digital_log_df if digital_log_df is not None else load_dataset(DIGITAL_LOG_PATH, columns=INGEST_LOG_COLUMNS)
+        self.log_tallies = self._log_aggregates(log_df)
+
+    # -------------------------------
+    # Sensor readings
+    # -------------------------------
+
+    def ingest_sensor_batch(self, batch_df: pd.DataFrame) -> dict:
+        """
+        Appends Historical_data-shaped rows and returns the delta: new breaching rows and touched series.
+        """
+        if batch_df.empty:
+            return {"rows": 0, "touched_series": [], "new_breaches": batch_df}
+
+        touched = self.store.append(batch_df)
+        flags = flag_breaches(batch_df)
+        new_breaches = batch_df[flags["breach"]]
+
+        delta = self._breach_aggregates(batch_df.sort_values(SERIES_KEYS + ["Cycle"], kind="stable"))
+        self.breach_counts = self._merge_breaches(self.breach_counts, delta)
+        self.last_seen = pd.concat([self.last_seen, self._last_seen(batch_df)]) \
+            .sort_values("Cycle", kind="stable").groupby(level=SERIES_KEYS, observed=True).last()
+
+        if self.persist:
+            _append_csv(batch_df, HISTORICAL_DATA_PATH)
+        return {"rows": len(batch_df), "touched_series": touched, "new_breaches": new_breaches}
+
+    @staticmethod
+    def _breach_aggregates(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Breach aggregates of a frame sorted by series and cycle.
+        """
+        flags = flag_breaches(df)
+        frame = pd.DataFrame({
+            "breach": flags["breach"], "high": flags["high"], "low": flags["low"],
+            "deviation": flags["deviation"], "run_length": flags["run_length"],
+        })
+        frame["Cycle"] = df["Cycle"].to_numpy()
+        for col in SERIES_KEYS:
+            frame[col] = df[col].to_numpy()
+        grouped = frame.groupby(SERIES_KEYS, observed=True, sort=False)
+        aggregates = grouped.agg(
+            readings=("breach", "size"),
+            breaches=("breach", "sum"),
+            high=("high", "sum"),
+            low=("low", "sum"),
+            max_deviation=("deviation", "max"),
+            longest_run=("run_length", "max"),
+            first_cycle=("Cycle", "first"),
+            last_cycle=("Cycle", "last"),
+        )
+        # Breach runs touching the first and last reading, used to join runs across batches
+        aggregates["leading_run"] = grouped["run_length"].first()
+        aggregates["current_run"] = grouped["run_length"].last()
+        return aggregates
+
+    @staticmethod
+    def _merge_breaches(current: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+        """
+        Folds batch aggregates into the running totals, joining breach runs that span the boundary
+        when the batch continues at the next cycle (as flag_breaches, a missing cycle ends a run).
+        """
+        merged = current.reindex(current.index.union(delta.index), fill_value=0)
+        d = delta.reindex(merged.index, fill_value=0)
+        for col in ["readings", "breaches", "high", "low"]:
+            merged[col] = merged[col] + d[col]
+        merged["max_deviation"] = np.maximum(merged["max_deviation"], d["max_deviation"])
+        contiguous = d["first_cycle"] - merged["last_cycle"] <= 1
+        joined_run = np.where(d["leading_run"] > 0,
+                              np.where(contiguous, merged["current_run"] + d["leading_run"], d["leading_run"]), 0)
+        merged["longest_run"] = np.maximum.reduce([merged["longest_run"], d["longest_run"], joined_run])
+        whole_batch_in_run = d["leading_run"] == d["readings"]
+        merged["current_run"] = np.where(d["readings"] == 0, merged["current_run"],
+                                         np.where(whole_batch_in_run, joined_run, d["current_run"]))
+        merged["first_cycle"] = np.where(merged["readings"] == d["readings"], d["first_cycle"], merged["first_cycle"])
+        merged["last_cycle"] = np.where(d["readings"] == 0, merged["last_cycle"], d["last_cycle"])
+        return merged
+
+    @staticmethod
+    def _last_seen(df: pd.DataFrame) -> pd.DataFrame:
+        latest = df.sort_values("Cycle", kind="stable").groupby(SERIES_KEYS, observed=True)[["Cycle", "Value"]].last()
+        return latest
+
+    # -------------------------------
+    # Digital log entries
+    # -------------------------------
+
+    def ingest_log_batch(self, batch_df: pd.DataFrame) -> dict:
+        """
+        Adds Digital_log-shaped rows to the per-part tallies and returns the tallies of the touched parts.
+        """
+        if batch_df.empty:
+            return {"rows": 0, "tallies": self.log_tallies.iloc[0:0]}
+
+        delta = self._log_aggregates(batch_df)
+        self.log_tallies = self.log_tallies.add(delta, fill_value=0).astype(self.log_tallies.dtypes.to_dict())
+
+        if self.persist:
+            _append_csv(batch_df, DIGITAL_LOG_PATH)
+        return {"rows": len(batch_df), "tallies": self.log_tallies.loc[delta.index]}
+
+    @staticmethod
+    def _log_aggregates(log_df: pd.DataFrame) -> pd.DataFrame:
+        frame = pd.DataFrame({
+            "failures": 1,
+            "repairs": (log_df["Action_taken"] == REPAIR_ACTION).to_numpy(dtype=int),
+            "replacements": (log_df["Action_taken"] == REPLACEMENT_ACTION).to_numpy(dtype=int),
+            "maintenance_due": (log_df["Recommended_action"] == MAINTENANCE_RECOMMENDATION).to_numpy(dtype=int),
+            "downtime_hrs": log_df["Downtime_hrs"].to_numpy(dtype=float),
+        }, index=pd.MultiIndex.from_arrays([log_df[k].astype(str).to_numpy() for k in LOG_KEYS], names=LOG_KEYS))
+        return frame.groupby(level=LOG_KEYS).sum()
+
+    def part_log_summary(self, parts, line: str = None) -> pd.DataFrame:
+        """
+        Failure/repair tallies for the given parts in the FailureSummaryAgent output shape.
+        """
+        tallies = self.log_tallies
+        if line is not None:
+            tallies = tallies[tallies.index.get_level_values("Line") == line]
+        summary = tallies.groupby(level="Part").sum().reindex(list(parts), fill_value=0)
+        return summary.rename_axis("part").reset_index()
+
+
+def _append_csv(batch_df: pd.DataFrame, path: str) -> None:
+    header = list(pd.read_csv(path, nrows=0).columns)
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+    batch_df.reindex(columns=header).to_csv(path, mode="a", header=False, index=False)
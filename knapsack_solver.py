@@ -0,0 +1,343 @@
+# knapsack_solver.py
+
+import math
+import time
+
+import numpy as np
+
+# Largest DP table (items x capacity cells) built for the single-constraint exact solver
+DP_MAX_CELLS = 50_000_000
+# Node limit for branch-and-bound before returning the best solution found so far
+BNB_MAX_NODES = 200_000
+# Above this many candidate items the greedy heuristic is used instead of branch-and-bound
+BNB_MAX_ITEMS = 5_000
+# Convex combinations of the two normalized constraints tried for the surrogate LP bound
+SURROGATE_WEIGHTS = np.linspace(0.0, 1.0, 11)
+
+KNAPSACK_METHODS = ("auto", "dp", "branch_and_bound", "greedy")
+
+# -------------------------------
+# Function: solve_knapsack
+# -------------------------------
+
+def solve_knapsack(values, weights, capacities, method: str = "auto", initial=None) -> dict:
+    """
+    Maximizes sum(values * x) over binary x subject to weights[k] @ x <= capacities[k].
+
+    weights is a list of one or two non-negative weight arrays (budget cost, labor hours).
+    Constraints that cannot bind (all useful items fit) are dropped before choosing a method:
+      - dp: exact dynamic programming for one constraint with integer weights
+      - branch_and_bound: exact depth-first search pruned with a fractional LP bound
+      - greedy: value/weight ratio heuristic reporting its LP bound and gap
+    initial (bool array aligned with values, e.g. a previous solution) warm-starts the heuristic methods:
+    if it is feasible it is the starting incumbent of branch-and-bound and the greedy answer when better.
+    dp is exact without an incumbent and ignores it, as it ignores an infeasible one.
+    Returns {"selected": bool array, "status", "method", "objective", "bound", "gap", "nodes", "elapsed_s", "constraints"}.
+    """
+    start = time.perf_counter()
+    if method not in KNAPSACK_METHODS:
+        raise ValueError(f"Unknown knapsack method: {method}. Expected one of {KNAPSACK_METHODS}.")
+
+    values = np.asarray(values, dtype=float)
+    weights = [np.asarray(w, dtype=float) for w in weights]
+    capacities = [float(c) for c in capacities]
+    selected = np.zeros(len(values), dtype=bool)
+
+    def result(status, method_used, objective=0.0, bound=None, nodes=0):
+        bound = objective if bound is None else bound
+        return {
+            "selected": selected,
+            "status": status,
+            "method": method_used,
+            "objective": float(objective),
+            "bound": float(bound),
+            "gap": float((bound - objective) / bound) if bound > 0 else 0.0,
+            "nodes": nodes,
+            "elapsed_s": time.perf_counter() - start,
+            "constraints": len(weights),
+        }
+
+    if any(c < 0 for c in capacities):
+        return result("Infeasible", "none")
+    if any((w < 0).any() or not np.isfinite(w).all() for w in weights) or not np.isfinite(values).all():
+        return result("Unsupported", "none")
+
+    # Items that cannot improve the objective or can never fit are never selected
+    candidates = np.flatnonzero((values > 0) & np.logical_and.reduce([w <= c for w, c in zip(weights, capacities)]))
+    v = values[candidates]
+    if initial is not None:
+        initial = np.asarray(initial, dtype=bool)
+        feasible = all(w[initial].sum() <= c for w, c in zip(weights, capacities))
+        # Dropping non-candidates keeps a feasible selection feasible and does not lower its value
+        initial = initial[candidates] if feasible else None
+
+    # Drop constraints that cannot bind
+    binding = [(w[candidates], c) for w, c in zip(weights, capacities) if w[candidates].sum() > c]
+    weights = [w for w, _ in binding]
+    capacities = [c for _, c in binding]
+
+    if not binding:
+        selected[candidates] = True
+        return result("Optimal", "trivial", v.sum())
+
+    if method == "auto":
+        method = _choose_method(v, weights, capacities)
+
+    if method == "dp":
+        if len(binding) != 1 or not _is_integral(weights[0]):
+            raise ValueError("The dp method needs a single binding constraint with integer weights.")
+        chosen = _solve_dp(v, weights[0], capacities[0])
+        selected[candidates[chosen]] = True
+        return result("Optimal", "dp", v[chosen].sum())
+
+    surrogate, bound = surrogate_bound(v, weights, capacities)
+    if method == "greedy":
+        chosen = _solve_greedy(v, weights, capacities, surrogate)
+        if initial is not None and v[initial].sum() > v[chosen].sum():
+            chosen = initial
+        selected[candidates[chosen]] = True
+        return result("Feasible", "greedy", v[chosen].sum(), bound)
+
+    chosen, proven, nodes = _solve_branch_and_bound(v, weights, capacities, surrogate, initial)
+    selected[candidates[chosen]] = True
+    objective = v[chosen].sum()
+    return result("Optimal" if proven else "Feasible", "branch_and_bound", objective,
+                  objective if proven else bound, nodes)
+
+
+def _choose_method(values, weights, capacities) -> str:
+    if len(weights) == 1 and _is_integral(weights[0]):
+        scale = _weight_gcd(weights[0])
+        if len(values) * (math.floor(capacities[0] / scale) + 1) <= DP_MAX_CELLS:
+            return "dp"
+    if len(values) <= BNB_MAX_ITEMS:
+        return "branch_and_bound"
+    return "greedy"
+
+
+def _is_integral(weights) -> bool:
+    return bool(np.all(weights == np.round(weights)) and weights.max(initial=0) < 2 ** 53)
+
+
+def _weight_gcd(weights) -> int:
+    scale = int(np.gcd.reduce(weights.astype(np.int64)))
+    return scale if scale > 0 else 1
+
+# -------------------------------
+# Dynamic programming (one constraint, integer weights)
+# -------------------------------
+
+def _solve_dp(values, weights, capacity) -> np.ndarray:
+    """
+    Exact 0/1 knapsack by DP over capacity, one vectorized pass per item.
+    Weights and capacity are divided by the weights' gcd first to shrink the table.
+    """
+    scale = _weight_gcd(weights)
+    w = (weights // scale).astype(np.int64)
+    cap = int(math.floor(capacity / scale))
+    _, take = _dp_table(values, w, cap)
+    return _dp_select(take, w, cap)
+
+
+def _dp_table(values, w, cap) -> tuple:
+    """
+    best[c] is the optimum for every capacity c <= cap; take[i, c] records whether item i is in it.
+    """
+    best = np.zeros(cap + 1)
+    take = np.zeros((len(values), cap + 1), dtype=bool)
+    for i in range(len(values)):
+        wi = w[i]
+        candidate = best[:cap + 1 - wi] + values[i]
+        improved = candidate > best[wi:]
+        take[i, wi:] = improved
+        best[wi:] = np.where(improved, candidate, best[wi:])
+    return best, take
+
+
+def _dp_select(take, w, c) -> np.ndarray:
+    chosen = np.zeros(take.shape[0], dtype=bool)
+    for i in range(take.shape[0] - 1, -1, -1):
+        if take[i, c]:
+            chosen[i] = True
+            c -= w[i]
+    return chosen
+
+# -------------------------------
+# Class: KnapsackFrontier
+# -------------------------------
+
+class KnapsackFrontier:
+    def __init__(self, values, weights, max_capacity: float):
+        """
+        Optimal value and selection for every capacity up to max_capacity from a single DP pass.
+
+        The DP table already holds the optimum of every smaller capacity, so each lookup is an
+        array index (value) or an O(items) backtrack (selection) instead of a new solve.
+        Needs non-negative integer weights and at most DP_MAX_CELLS table cells.
+        """
+        values = np.asarray(values, dtype=float)
+        weights = np.asarray(weights, dtype=float)
+        if (weights < 0).any() or not _is_integral(weights):
+            raise ValueError("KnapsackFrontier needs non-negative integer weights.")
+        self.max_capacity = max(float(max_capacity), 0.0)
+        # As in solve_knapsack: items that cannot improve the objective or never fit are never selected
+        self.candidates = np.flatnonzero((values > 0) & (weights <= self.max_capacity))
+        self.scale = _weight_gcd(weights[self.candidates])
+        self.w = (weights[self.candidates] // self.scale).astype(np.int64)
+        self.cap = int(math.floor(self.max_capacity / self.scale))
+        if len(self.candidates) * (self.cap + 1) > DP_MAX_CELLS:
+            raise ValueError("Frontier table would exceed DP_MAX_CELLS.")
+        self.size = len(values)
+        self.best, self.take = _dp_table(values[self.candidates], self.w, self.cap)
+
+    def _column(self, capacity: float) -> int:
+        if not 0 <= capacity <= self.max_capacity:
+            raise ValueError(f"Capacity must be between 0 and {self.max_capacity}.")
+        return min(int(math.floor(capacity / self.scale)), self.cap)
+
+    def value(self, capacity: float) -> float:
+        return float(self.best[self._column(capacity)])
+
+    def values(self, capacities) -> np.ndarray:
+        return self.best[[self._column(c) for c in capacities]]
+
+    def selection(self, capacity: float) -> np.ndarray:
+        selected = np.zeros(self.size, dtype=bool)
+        selected[self.candidates[_dp_select(self.take, self.w, self._column(capacity))]] = True
+        return selected
+
+# -------------------------------
+# Surrogate LP bound
+# -------------------------------
+
+def surrogate_bound(values, weights, capacities) -> tuple:
+    """
+    Picks the convex combination of the normalized constraints with the tightest fractional bound.
+    Every feasible selection satisfies the combined constraint sum(s * x) <= 1, so its LP optimum bounds the problem.
+    Returns (s, bound). Also used by decomposed_optimization to price the per-line budget split.
+    """
+    normalized = [w / c for w, c in zip(weights, capacities)]
+    if len(normalized) == 1:
+        return normalized[0], _fractional_bound(values, normalized[0], 1.0)
+    best = None
+    for mu in SURROGATE_WEIGHTS:
+        s = mu * normalized[0] + (1 - mu) * normalized[1]
+        bound = _fractional_bound(values, s, 1.0)
+        if best is None or bound < best[1]:
+            best = (s, bound)
+    return best
+
+
+def ratio_order(values, s) -> np.ndarray:
+    """
+    Item indices by value per unit of surrogate weight, best first; weightless items come first.
+    """
+    with np.errstate(divide="ignore"):
+        ratio = np.where(s > 0, values / np.where(s > 0, s, 1.0), np.inf)
+    return np.argsort(-ratio, kind="stable")
+
+
+def _fractional_bound(values, s, capacity) -> float:
+    order = ratio_order(values, s)
+    prefix_s = np.concatenate([[0.0], np.cumsum(s[order])])
+    prefix_v = np.concatenate([[0.0], np.cumsum(values[order])])
+    j = int(np.searchsorted(prefix_s, capacity, "right")) - 1
+    bound = prefix_v[j]
+    if j < len(order):
+        bound += (capacity - prefix_s[j]) / s[order[j]] * values[order[j]]
+    return float(bound)
+
+# -------------------------------
+# Greedy heuristic
+# -------------------------------
+
+def _solve_greedy(values, weights, capacities, surrogate) -> np.ndarray:
+    """
+    Takes items by value per unit of surrogate weight while they fit, then compares with the best single item.
+    For one constraint max(greedy, best item) is at least half the optimum.
+    """
+    order = ratio_order(values, surrogate)
+    chosen = np.zeros(len(values), dtype=bool)
+
+    # The leading run of items that fits in every constraint is taken in one step
+    prefix = min(int(np.searchsorted(np.cumsum(w[order]), c, "right")) for w, c in zip(weights, capacities))
+    chosen[order[:prefix]] = True
+    remaining = [c - w[order[:prefix]].sum() for w, c in zip(weights, capacities)]
+
+    # Then the rest one by one, skipping items that no longer fit
+    rest = order[prefix:]
+    columns = [w[rest].tolist() for w in weights]
+    for position, item in enumerate(rest.tolist()):
+        if all(column[position] <= left for column, left in zip(columns, remaining)):
+            chosen[item] = True
+            remaining = [left - column[position] for column, left in zip(columns, remaining)]
+    best_single = int(np.argmax(values))
+    if values[best_single] > values[chosen].sum():
+        chosen[:] = False
+        chosen[best_single] = True
+    return chosen
+
+# -------------------------------
+# Branch-and-bound (one or two constraints)
+# -------------------------------
+
+def _solve_branch_and_bound(values, weights, capacities, surrogate, initial=None) -> tuple:
+    """
+    Depth-first branch-and-bound over items in ratio order, pruned with the surrogate fractional bound.
+    The incumbent starts as the better of the greedy solution and initial (a feasible selection), if given.
+    Returns (chosen, proven_optimal, nodes).
+    """
+    order = ratio_order(values, surrogate)
+    v = values[order]
+    s = surrogate[order]
+    w = np.stack([wk[order] for wk in weights], axis=1)
+    prefix_s = np.concatenate([[0.0], np.cumsum(s)])
+    prefix_v = np.concatenate([[0.0], np.cumsum(v)])
+    m = len(v)
+    tolerance = 1e-9 * max(prefix_v[-1], 1.0)
+
+    def bound(k, residual):
+        residual = max(residual, 0.0)
+        j = int(np.searchsorted(prefix_s, prefix_s[k] + residual, "right")) - 1
+        total = prefix_v[j] - prefix_v[k]
+        if j < m:
+            total += (prefix_s[k] + residual - prefix_s[j]) / s[j] * v[j]
+        return total
+
+    # Incumbent from the greedy heuristic
+    greedy = _solve_greedy(v, [w[:, k] for k in range(w.shape[1])], capacities, s)
+    best_value = v[greedy].sum()
+    best_chosen = tuple(np.flatnonzero(greedy).tolist())
+    if initial is not None:
+        warm = initial[order]
+        if v[warm].sum() > best_value:
+            best_value, best_chosen = v[warm].sum(), tuple(np.flatnonzero(warm).tolist())
+
+    # Stack entries: (next item, value, remaining capacities, remaining surrogate, chosen items as a linked list)
+    stack = [(0, 0.0, np.array(capacities, dtype=float), 1.0, None)]
+    nodes = 0
+    while stack:
+        nodes += 1
+        if nodes > BNB_MAX_NODES:
+            break
+        k, value, remaining, residual, chosen = stack.pop()
+        if value > best_value + tolerance:
+            best_value, best_chosen = value, _unlink(chosen)
+        if k == m or value + bound(k, residual) <= best_value + tolerance:
+            continue
+        stack.append((k + 1, value, remaining, residual, chosen))
+        if np.all(w[k] <= remaining):
+            stack.append((k + 1, value + v[k], remaining - w[k], residual - s[k], (k, chosen)))
+
+    proven = not stack
+    chosen_mask = np.zeros(len(values), dtype=bool)
+    chosen_mask[order[list(best_chosen)]] = True
+    return chosen_mask, proven, nodes
+
+
+def _unlink(chosen) -> tuple:
+    items = []
+    while chosen is not None:
+        items.append(chosen[0])
+        chosen = chosen[1]
+    return tuple(items)
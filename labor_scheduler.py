@@ -0,0 +1,70 @@
+# labor_scheduler.py
+
+import numpy as np
+
+SCHEDULING_STRATEGIES = ("first_fit", "ffd", "best_fit")
+
+# Default maintenance windows by utilization, as used by post_optimization_schedule
+HIGH_UTILIZATION_THRESHOLD = 0.7
+DEFAULT_ALLOWED_DAYS = {
+    "low": ["DAY+1", "DAY+2", "DAY+3", "DAY+4"],
+    "high": ["DAY+2", "DAY+3"],
+}
+
+# -------------------------------
+# Function: allowed_day_mask
+# -------------------------------
+
+def allowed_day_mask(utilization, horizon: list, allowed_days: dict = None,
+                     threshold: float = HIGH_UTILIZATION_THRESHOLD) -> np.ndarray:
+    """
+    Boolean (items x days) mask over the horizon: equipment below the utilization threshold may use the
+    "low" window, busier equipment only the "high" window.
+    """
+    allowed_days = allowed_days or DEFAULT_ALLOWED_DAYS
+    position = {day: j for j, day in enumerate(horizon)}
+    windows = {}
+    for level, days in allowed_days.items():
+        window = np.zeros(len(horizon), dtype=bool)
+        window[[position[day] for day in days if day in position]] = True
+        windows[level] = window
+    low = np.asarray(utilization, dtype=float) < threshold
+    return np.where(low[:, None], windows["low"][None, :], windows["high"][None, :])
+
+# -------------------------------
+# Function: assign_days
+# -------------------------------
+
+def assign_days(labor_hours, allowed_mask, capacities, strategy: str = "first_fit") -> tuple:
+    """
+    Assigns each item to one allowed day with enough labor left and returns (day index per item, remaining capacity).
+    Unassigned items get -1.
+
+    Items are taken in the given priority order, except for ffd which takes the largest jobs first.
+      - first_fit / ffd: earliest allowed day with room
+      - best_fit: allowed day with the least room left that still fits the job
+    Each step is one vectorized pass over the day-capacity array, so long horizons stay cheap.
+    """
+    if strategy not in SCHEDULING_STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}. Expected one of {SCHEDULING_STRATEGIES}.")
+
+    labor_hours = np.asarray(labor_hours, dtype=float)
+    allowed_mask = np.asarray(allowed_mask, dtype=bool)
+    remaining = np.array(capacities, dtype=float)
+    days = np.full(len(labor_hours), -1, dtype=np.int64)
+
+    order = np.arange(len(labor_hours))
+    if strategy == "ffd":
+        order = np.argsort(-labor_hours, kind="stable")
+
+    for i in order.tolist():
+        fits = allowed_mask[i] & (remaining >= labor_hours[i])
+        if not fits.any():
+            continue
+        if strategy == "best_fit":
+            day = int(np.argmin(np.where(fits, remaining, np.inf)))
+        else:
+            day = int(np.argmax(fits))
+        remaining[day] -= labor_hours[i]
+        days[i] = day
+    return days, remaining
@@ -0,0 +1,41 @@
+# lazy_loading.py
+
+import importlib
+import sys
+
+# Where each ADK agent class lives; google.adk is imported the first time an agent is built
+ADK_AGENT_CLASSES = {
+    "Agent": "google.adk.agents",
+    "LlmAgent": "google.adk.agents.llm_agent",
+    "SequentialAgent": "google.adk.agents.sequential_agent",
+    "ParallelAgent": "google.adk.agents.parallel_agent",
+}
+
+# -------------------------------
+# Function: adk_agent
+# -------------------------------
+
+def adk_agent(class_name: str, **kwargs):
+    """
+    Builds an ADK agent of the named class (see ADK_AGENT_CLASSES), importing google.adk on first use.
+    """
+    module = importlib.import_module(ADK_AGENT_CLASSES[class_name])
+    return getattr(module, class_name)(**kwargs)
+
+# -------------------------------
+# Function: lazy_attributes
+# -------------------------------
+
+def lazy_attributes(module_name: str, builders: dict):
+    """
+    Module __getattr__ (PEP 562) that builds each attribute in builders ({name: zero-argument callable})
+    on first access and stores it on the module, so `from module import name` keeps working while
+    a plain `import module` does no work.
+    """
+    def __getattr__(name):
+        if name not in builders:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = builders[name]()
+        setattr(sys.modules[module_name], name, value)
+        return value
+    return __getattr__
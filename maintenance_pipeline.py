@@ -1,23 +1,69 @@
 # maintenance_pipeline.py
 
+import copy
+import time
+from functools import lru_cache
+
 import pandas as pd
 import numpy as np
 from pulp import (
-    LpProblem, LpMinimize, LpVariable, lpSum, LpBinary, LpStatus
+    LpProblem, LpMinimize, LpVariable, LpAffineExpression, LpBinary, LpStatus, LpSolution,
+    PULP_CBC_CMD, HiGHS, HiGHS_CMD, value
 )
+from dataset_loader import load_dataset, dataset_columns, file_fingerprint
+from knapsack_solver import solve_knapsack, KnapsackFrontier
+from decomposed_optimization import solve_decomposed
+from failure_model import apply_probability_source, PROBABILITY_SOURCE, MODEL_SOURCES
+from labor_scheduler import assign_days, allowed_day_mask, DEFAULT_ALLOWED_DAYS, HIGH_UTILIZATION_THRESHOLD
+
+OPTIMIZER_SOLVERS = ("auto", "knapsack", "pulp")
+MILP_BACKENDS = ("cbc", "highs")
+PIPELINE_MODES = ("sequential", "joint", "decomposed")
+
+# Settings used by local_optimization
+DEFAULT_ALPHA = 0.0
+DEFAULT_MANPOWER_LIMIT = 5000
+# Seed of the simulated scheduling inputs in run_maintenance_plan, and how many plans it keeps
+DEFAULT_SEED = 0
+PLAN_CACHE_SIZE = 64
+# Risk units per dollar of lost revenue in the joint model; small, so risk stays the primary objective
+JOINT_REVENUE_LOSS_WEIGHT = 1e-6
+# Columns of a maintenance file the optimizer, failure model and scheduler read, when the file has them
+MAINTENANCE_COLUMNS = ["equipment_id", "line", "component", "part", "age", "max_age", "cost", "risk_impact",
+                       "labor_hours", "failure_probability", "utilization_pct", "downtime_hours",
+                       "production_per_hour", "unit_price"]
 
 # -------------------------------
 # Class: MaintenanceOptimizer
 # -------------------------------
 
 class MaintenanceOptimizer:
-    def __init__(self, alpha=0.0, include_manpower_constraint=False, manpower_limit=None):
+    def __init__(self, alpha=0.0, include_manpower_constraint=False, manpower_limit=None, solver="auto",
+                 backend="cbc", time_limit=None, gap_rel=None, threads=None, warm_start=False, msg=True):
         """
         Initializes the maintenance optimizer.
+
+        solver: "auto" uses the knapsack solver when it proves optimality and falls back to the MILP otherwise,
+        "knapsack" always uses the knapsack solver (including its greedy heuristic), "pulp" always solves the MILP.
+        backend, time_limit (seconds), gap_rel, threads and msg configure the MILP solve ("cbc" or "highs").
+        warm_start seeds the solver with the previous schedule of this optimizer, matched by equipment_id:
+        the MILP gets it as initial values, the knapsack solver as its starting incumbent when still feasible.
         """
+        if solver not in OPTIMIZER_SOLVERS:
+            raise ValueError(f"Unknown solver: {solver}. Expected one of {OPTIMIZER_SOLVERS}.")
+        if backend not in MILP_BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}. Expected one of {MILP_BACKENDS}.")
         self.alpha = alpha
         self.include_manpower_constraint = include_manpower_constraint
         self.manpower_limit = manpower_limit
+        self.solver = solver
+        self.backend = backend
+        self.time_limit = time_limit
+        self.gap_rel = gap_rel
+        self.threads = threads
+        self.warm_start = warm_start
+        self.msg = msg
+        self.last_schedule = {}
 
     def optimize_schedule(self, risk_df: pd.DataFrame, budget: float,
                           cost_col: str = "cost",
@@ -34,55 +80,229 @@ class MaintenanceOptimizer:
             risk_df[risk_impact_col] = 1.0
 
         df = risk_df.copy()
-        problem = LpProblem("MaintenanceOptimization", LpMinimize)
 
-        # Binary decision variable for each equipment
-        df["var"] = [LpVariable(f"x_{eid}", cat=LpBinary) for eid in df["equipment_id"]]
-
-        # Objective: Minimize total expected risk
-        objective_terms = []
-        for _, row in df.iterrows():
-            x_var = row["var"]
-            p_fail = row[fail_prob_col]
-            imp = row[risk_impact_col]
+        # Coefficient arrays
+        risk_if_not = df[fail_prob_col].to_numpy(dtype=float) * df[risk_impact_col].to_numpy(dtype=float)
+        risk_if_maint = self.alpha * risk_if_not
+        costs = df[cost_col].to_numpy(dtype=float)
+        weights, capacities = [costs], [budget]
+        use_manpower = self.include_manpower_constraint and labor_col in df.columns and self.manpower_limit is not None
+        if use_manpower:
+            weights.append(df[labor_col].to_numpy(dtype=float))
+            capacities.append(self.manpower_limit)
+
+        maintain, status, solver_stats = None, None, None
+        if self.solver != "pulp":
+            # With alpha fixed the model is a 0/1 knapsack: maximize the risk removed by maintenance
+            initial = None
+            if self.warm_start and self.last_schedule:
+                initial = np.array([self.last_schedule.get(eid, 0) for eid in df["equipment_id"].tolist()], dtype=bool)
+            result = solve_knapsack(risk_if_not - risk_if_maint, weights, capacities, initial=initial)
+            if result["status"] == "Optimal" or (self.solver == "knapsack" and result["status"] == "Feasible"):
+                maintain, status = result["selected"].astype(int), result["status"]
+                solver_stats = {
+                    "solver": f"knapsack:{result['method']}",
+                    "status": status,
+                    "objective": float(risk_if_not.sum() - result["objective"]),
+                    "gap": result["gap"],
+                    "nodes": result["nodes"],
+                    "elapsed_s": result["elapsed_s"],
+                    "warm_start": initial is not None,
+                }
+            else:
+                print(f"Knapsack solver status {result['status']}, falling back to PuLP")
+
+        if maintain is None:
+            maintain, status, solver_stats = self._solve_pulp(df, risk_if_not, risk_if_maint, weights, capacities)
 
-            risk_if_not = p_fail * imp
-            risk_if_maint = self.alpha * p_fail * imp
-
-            objective_terms.append(risk_if_not * (1 - x_var) + risk_if_maint * x_var)
-
-        problem += lpSum(objective_terms), "TotalRisk"
+        # Extract results
+        df["maintain"] = maintain
+        df["decision"] = np.where(maintain == 1, "Maintain", "Skip")
+        optimized_risk = np.where(maintain == 1, risk_if_maint, risk_if_not)
+        df["optimized_risk"] = optimized_risk
+
+        # Assign maintenance order: rank of optimized risk among maintained rows
+        maintained_rows = np.flatnonzero(maintain == 1)
+        maintained_rows = maintained_rows[np.argsort(optimized_risk[maintained_rows], kind="stable")]
+        maintenance_order = np.full(len(df), None, dtype=object)
+        maintenance_order[maintained_rows] = list(range(1, len(maintained_rows) + 1))
+        df["maintenance_order"] = maintenance_order
+
+        df["solution_status"] = status
+        df["total_optimized_risk"] = optimized_risk.sum()
+        df.attrs["solver_stats"] = solver_stats
+
+        self.last_schedule = dict(zip(df["equipment_id"].tolist(), maintain.tolist()))
+        return df
 
-        # Budget constraint
-        problem += lpSum(row[cost_col] * row["var"] for _, row in df.iterrows()) <= budget
+    def optimize_joint_schedule(self, risk_df: pd.DataFrame, budget: float, labor_available_per_day: dict,
+                                allowed_days: dict = None,
+                                revenue_loss_weight: float = JOINT_REVENUE_LOSS_WEIGHT,
+                                seed: int = None,
+                                cost_col: str = "cost",
+                                fail_prob_col: str = "failure_probability",
+                                risk_impact_col: str = "risk_impact",
+                                labor_col: str = "labor_hours") -> pd.DataFrame:
+        """
+        Selects and schedules maintenance in one MILP instead of optimize_schedule + post_optimization_schedule.
+
+        One binary y[i, d] exists only for allowed (equipment, day) pairs whose job fits the day's labor, so the
+        model stays sparse. Constraints: at most one day per equipment, labor per day, budget and the optional
+        manpower limit. Objective: total risk plus revenue_loss_weight * revenue lost to maintenance downtime.
+        Returns every row with maintain, scheduled_day, expected_revenue_loss and the usual optimizer columns;
+        the remaining labor per day is in df.attrs["labor_remaining_per_day"].
+        seed makes the simulated utilization, production rate and unit price reproducible.
+        """
+        if cost_col not in risk_df.columns or fail_prob_col not in risk_df.columns:
+            raise ValueError(f"Missing required columns: {cost_col}, {fail_prob_col}.")
 
-        # Optional manpower constraint
-        if self.include_manpower_constraint and labor_col in df.columns and self.manpower_limit is not None:
-            problem += lpSum(row[labor_col] * row["var"] for _, row in df.iterrows()) <= self.manpower_limit
+        df = risk_df.copy()
+        if risk_impact_col not in df.columns:
+            df[risk_impact_col] = 1.0
+        allowed_days = allowed_days or DEFAULT_ALLOWED_DAYS
+        utilization = simulate_scheduling_inputs(df, allowed_days, _seeded_rng(seed))
+
+        # Coefficient arrays
+        risk_if_not = df[fail_prob_col].to_numpy(dtype=float) * df[risk_impact_col].to_numpy(dtype=float)
+        risk_if_maint = self.alpha * risk_if_not
+        costs = df[cost_col].to_numpy(dtype=float)
+        labor = df[labor_col].to_numpy(dtype=float)
+        revenue_loss = downtime_revenue_loss(df)
+        horizon, capacities = scheduling_horizon(labor_available_per_day, allowed_days)
+
+        # Sparse (equipment, day) pairs, ordered by equipment
+        mask = allowed_day_mask(utilization, horizon, allowed_days) & (labor[:, None] <= capacities[None, :])
+        rows, cols = np.nonzero(mask)
+
+        problem = LpProblem("JointMaintenanceScheduling", LpMinimize)
+        y_vars = LpVariable.matrix("y", [f"{i}_{j}" for i, j in zip(rows.tolist(), cols.tolist())], cat=LpBinary)
+
+        problem += LpAffineExpression(
+            zip(y_vars, (risk_if_maint[rows] - risk_if_not[rows] + revenue_loss_weight * revenue_loss[rows]).tolist()),
+            constant=float(risk_if_not.sum()),
+        ), "TotalRiskAndRevenueLoss"
+
+        # At most one day per equipment
+        for group in np.split(np.arange(len(rows)), np.flatnonzero(np.diff(rows)) + 1):
+            if len(group) > 1:
+                problem += LpAffineExpression((y_vars[k], 1) for k in group.tolist()) <= 1
+
+        # Labor per day
+        by_day = np.argsort(cols, kind="stable")
+        for group in np.split(by_day, np.flatnonzero(np.diff(cols[by_day])) + 1):
+            if len(group):
+                day = int(cols[group[0]])
+                problem += LpAffineExpression(zip([y_vars[k] for k in group.tolist()], labor[rows[group]].tolist())) \
+                    <= capacities[day]
+
+        # Budget and optional manpower constraints
+        problem += LpAffineExpression(zip(y_vars, costs[rows].tolist())) <= budget
+        if self.include_manpower_constraint and self.manpower_limit is not None:
+            problem += LpAffineExpression(zip(y_vars, labor[rows].tolist())) <= self.manpower_limit
+
+        status, solver_stats = self._solve_problem(problem, len(y_vars))
+        chosen = np.rint([var.varValue or 0.0 for var in y_vars]).astype(bool)
+
+        maintain = np.zeros(len(df), dtype=int)
+        maintain[rows[chosen]] = 1
+        day_of = np.full(len(df), -1, dtype=np.int64)
+        day_of[rows[chosen]] = cols[chosen]
+
+        df["maintain"] = maintain
+        df["decision"] = np.where(maintain == 1, "Maintain", "Skip")
+        optimized_risk = np.where(maintain == 1, risk_if_maint, risk_if_not)
+        df["optimized_risk"] = optimized_risk
+
+        # Maintenance order: by scheduled day, then by optimized risk
+        maintained_rows = np.flatnonzero(maintain == 1)
+        maintained_rows = maintained_rows[np.lexsort((optimized_risk[maintained_rows], day_of[maintained_rows]))]
+        maintenance_order = np.full(len(df), None, dtype=object)
+        maintenance_order[maintained_rows] = list(range(1, len(maintained_rows) + 1))
+        df["maintenance_order"] = maintenance_order
+
+        scheduled_day = np.full(len(df), None, dtype=object)
+        scheduled_day[maintained_rows] = np.array(horizon, dtype=object)[day_of[maintained_rows]]
+        df["scheduled_day"] = pd.Series(scheduled_day, index=df.index, dtype=object)
+        df["expected_revenue_loss"] = np.where(maintain == 1, revenue_loss, 0.0)
+
+        df["solution_status"] = status
+        df["total_optimized_risk"] = optimized_risk.sum()
+        used = np.bincount(day_of[maintained_rows], weights=labor[maintained_rows], minlength=len(horizon))
+        df.attrs["solver_stats"] = solver_stats
+        df.attrs["labor_remaining_per_day"] = {
+            day: type(labor_available_per_day[day])(capacities[horizon.index(day)] - used[horizon.index(day)])
+            for day in labor_available_per_day
+        }
+        return df
 
-        # Solve the LP
-        problem.solve()
+    def _solve_pulp(self, df, risk_if_not, risk_if_maint, weights, capacities) -> tuple:
+        """
+        Builds the MILP from the coefficient arrays, solves it with the configured backend
+        and returns (maintain, status, solver_stats).
+        """
+        problem = LpProblem("MaintenanceOptimization", LpMinimize)
 
-        # Extract results
-        df["maintain"] = [int(var.varValue) for var in df["var"]]
-        df["decision"] = df["maintain"].map({1: "Maintain", 0: "Skip"})
-        df["optimized_risk"] = df.apply(
-            lambda row: self.alpha * row[fail_prob_col] * row[risk_impact_col]
-            if row["maintain"] == 1
-            else row[fail_prob_col] * row[risk_impact_col], axis=1
-        )
-
-        # Assign maintenance order
-        df["maintenance_order"] = None
-        maintained_sorted = df[df["maintain"] == 1].sort_values(by="optimized_risk").copy()
-        maintained_sorted["maintenance_order"] = range(1, len(maintained_sorted) + 1)
-        df.update(maintained_sorted)
-
-        df.drop(columns=["var"], inplace=True)
-        df["solution_status"] = LpStatus[problem.status]
-        df["total_optimized_risk"] = df["optimized_risk"].sum()
+        # Binary decision variable for each equipment
+        x_vars = LpVariable.matrix("x", df["equipment_id"].tolist(), cat=LpBinary)
 
-        return df
+        # Objective: Minimize total expected risk
+        # sum(risk_if_not * (1 - x) + risk_if_maint * x) == sum(risk_if_not) + sum((risk_if_maint - risk_if_not) * x)
+        problem += LpAffineExpression(
+            zip(x_vars, (risk_if_maint - risk_if_not).tolist()), constant=float(risk_if_not.sum())
+        ), "TotalRisk"
+
+        # Budget and optional manpower constraints
+        for coefficients, capacity in zip(weights, capacities):
+            problem += LpAffineExpression(zip(x_vars, coefficients.tolist())) <= capacity
+
+        # Warm start from the previous schedule of the same equipment
+        warm = self.warm_start and bool(self.last_schedule)
+        if warm:
+            for eid, var in zip(df["equipment_id"].tolist(), x_vars):
+                var.setInitialValue(self.last_schedule.get(eid, 0))
+
+        status, solver_stats = self._solve_problem(problem, len(x_vars), warm)
+        maintain = np.rint([var.varValue or 0.0 for var in x_vars]).astype(int)
+        return maintain, status, solver_stats
+
+    def _solve_problem(self, problem, n_vars: int, warm: bool = False) -> tuple:
+        """
+        Solves a PuLP problem with the configured backend and returns (status, solver_stats).
+        """
+        solver, backend = self._milp_solver(warm)
+        start = time.perf_counter()
+        problem.solve(solver)
+        elapsed = time.perf_counter() - start
+
+        status = LpStatus[problem.status]
+        solver_stats = {
+            "solver": f"pulp:{backend}",
+            "status": status,
+            "solution": LpSolution.get(problem.sol_status, "Unknown"),
+            "objective": value(problem.objective),
+            "elapsed_s": elapsed,
+            "time_limit": self.time_limit,
+            "gap_rel": self.gap_rel,
+            "threads": self.threads,
+            "warm_start": warm,
+            "variables": n_vars,
+            "constraints": len(problem.constraints),
+        }
+        return status, solver_stats
+
+    def _milp_solver(self, warm: bool) -> tuple:
+        """
+        Returns (PuLP solver, backend name) configured with the time limit, gap, threads and warm start.
+        HiGHS falls back to CBC when no HiGHS installation is available.
+        """
+        options = {"msg": self.msg, "timeLimit": self.time_limit, "gapRel": self.gap_rel, "threads": self.threads}
+        if self.backend == "highs":
+            # The command-line interface takes warm starts; the highspy interface does not
+            for solver in (HiGHS_CMD(warmStart=warm, **options), HiGHS(**options)):
+                if solver.available():
+                    return solver, "highs"
+            print("HiGHS is not available, falling back to CBC")
+        return PULP_CBC_CMD(warmStart=warm, **options), "cbc"
 
 # -------------------------------
 # Function: local_analysis
@@ -103,21 +323,25 @@ def local_analysis(df: pd.DataFrame) -> dict:
 # Function: ingest_data
 # -------------------------------
 
-def ingest_data(file_path: str) -> pd.DataFrame:
+def ingest_data(file_path: str, probability_source: str = None) -> pd.DataFrame:
     """
-    Loads maintenance data from a CSV file.
+    Loads the MAINTENANCE_COLUMNS of a maintenance CSV file through the shared Parquet dataset cache.
+    probability_source "fitted" replaces failure_probability with the failure_model estimate.
     """
-    return pd.read_csv(file_path)
+    available = set(dataset_columns(file_path))
+    columns = [col for col in MAINTENANCE_COLUMNS if col in available]
+    return apply_probability_source(load_dataset(file_path, columns=columns), probability_source)
 
 # -------------------------------
 # Function: local_optimization
 # -------------------------------
 
-def local_optimization(df: pd.DataFrame, budget: float) -> pd.DataFrame:
+def local_optimization(df: pd.DataFrame, budget: float, alpha: float = DEFAULT_ALPHA) -> pd.DataFrame:
     """
     Runs the optimization algorithm on the ingested data.
     """
-    optimizer = MaintenanceOptimizer(alpha=0.0, include_manpower_constraint=True, manpower_limit=5000)
+    optimizer = MaintenanceOptimizer(alpha=alpha, include_manpower_constraint=True,
+                                     manpower_limit=DEFAULT_MANPOWER_LIMIT)
     return optimizer.optimize_schedule(
         risk_df=df,
         budget=budget,
@@ -127,17 +351,111 @@ def local_optimization(df: pd.DataFrame, budget: float) -> pd.DataFrame:
         labor_col="labor_hours"
     )
 
+# -------------------------------
+# Function: risk_frontier
+# -------------------------------
+
+def risk_frontier(df: pd.DataFrame, capacities, resource_col: str = "cost", limits: dict = None,
+                  alpha: float = DEFAULT_ALPHA,
+                  fail_prob_col: str = "failure_probability",
+                  risk_impact_col: str = "risk_impact") -> pd.DataFrame:
+    """
+    Optimized risk for every capacity of one resource (budget or labor), with the other resources fixed by `limits`.
+
+    When the fixed limits cannot bind and the resource is integral, one DP pass covers all capacities
+    and each row is a table lookup. Otherwise each capacity is solved with the knapsack solver.
+    Returns one row per capacity: optimized risk, maintenance count, resources used and the selected row positions.
+    """
+    limits = limits or {}
+    capacities = sorted(float(c) for c in capacities)
+    risk_if_not = df[fail_prob_col].to_numpy(dtype=float) * (
+        df[risk_impact_col].to_numpy(dtype=float) if risk_impact_col in df.columns else 1.0)
+    values = risk_if_not - alpha * risk_if_not
+    resource = df[resource_col].to_numpy(dtype=float)
+    useful = values > 0
+    fixed = [(df[col].to_numpy(dtype=float), limit) for col, limit in limits.items()
+             if df[col].to_numpy(dtype=float)[useful].sum() > limit]
+
+    frontier = None
+    if not fixed and capacities:
+        try:
+            frontier = KnapsackFrontier(values, resource, capacities[-1])
+        except ValueError as e:
+            print(f"Frontier DP unavailable ({e}), solving each capacity")
+
+    used_cols = [resource_col] + [col for col in limits if col != resource_col]
+    rows = []
+    for capacity in capacities:
+        if frontier is not None:
+            selected = frontier.selection(capacity)
+        else:
+            result = solve_knapsack(values, [resource] + [w for w, _ in fixed], [capacity] + [l for _, l in fixed])
+            selected = result["selected"]
+        row = {
+            "capacity": capacity,
+            "optimized_risk": float(risk_if_not.sum() - values[selected].sum()),
+            "maintenance_count": int(selected.sum()),
+        }
+        for col in used_cols:
+            row[f"total_{col}"] = float(df[col].to_numpy(dtype=float)[selected].sum())
+        row["selected_rows"] = np.flatnonzero(selected).tolist()
+        rows.append(row)
+
+    table = pd.DataFrame(rows)
+    table.attrs["method"] = "frontier_dp" if frontier is not None else "per_capacity"
+    return table
+
+
+def risk_budget_frontier(df: pd.DataFrame, budgets, manpower_limit: float = DEFAULT_MANPOWER_LIMIT,
+                         alpha: float = DEFAULT_ALPHA) -> pd.DataFrame:
+    """
+    Risk-vs-budget frontier under the same manpower limit as local_optimization.
+    """
+    limits = {"labor_hours": manpower_limit} if manpower_limit is not None and "labor_hours" in df.columns else {}
+    return risk_frontier(df, budgets, "cost", limits, alpha).rename(columns={"capacity": "budget"})
+
+
+def risk_labor_frontier(df: pd.DataFrame, labor_limits, budget: float, alpha: float = DEFAULT_ALPHA) -> pd.DataFrame:
+    """
+    Risk-vs-labor-hours frontier at a fixed budget.
+    """
+    return risk_frontier(df, labor_limits, "labor_hours", {"cost": budget}, alpha).rename(
+        columns={"capacity": "labor_limit"})
+
 # -------------------------------
 # Function: run_pipeline
 # -------------------------------
 
-def run_pipeline(file_path: str, budget: float) -> dict:
+def run_pipeline(file_path: str, budget: float, mode: str = "sequential",
+                 labor_available_per_day: dict = None, allowed_days: dict = None,
+                 probability_source: str = None, alpha: float = DEFAULT_ALPHA, seed: int = None) -> dict:
     """
     Orchestrates the ingestion, analysis, and optimization pipeline.
+
+    mode="joint" selects and schedules in one model with per-day labor limits (labor_available_per_day)
+    and also returns the day schedule under "post_optimization", in the post_optimization_schedule format.
+    mode="decomposed" solves each line in its own process under a priced split of the budget and labor pool,
+    and reports the gap to the plant-wide LP bound under plan_summary["decomposition"].
+    probability_source ("static"/"fitted") is passed to ingest_data; seed is used by the joint mode's
+    simulated scheduling inputs.
     """
-    df = ingest_data(file_path)
+    if mode not in PIPELINE_MODES:
+        raise ValueError(f"Unknown mode: {mode}. Expected one of {PIPELINE_MODES}.")
+    if mode == "joint" and not labor_available_per_day:
+        raise ValueError("The joint mode needs labor_available_per_day.")
+
+    df = ingest_data(file_path, probability_source)
     analysis = local_analysis(df)
-    schedule_df = local_optimization(df, budget)
+    if mode == "joint":
+        optimizer = MaintenanceOptimizer(alpha=alpha, include_manpower_constraint=True,
+                                         manpower_limit=DEFAULT_MANPOWER_LIMIT)
+        schedule_df = optimizer.optimize_joint_schedule(df, budget, labor_available_per_day, allowed_days, seed=seed)
+    elif mode == "decomposed":
+        optimizer = MaintenanceOptimizer(alpha=alpha, include_manpower_constraint=True,
+                                         manpower_limit=DEFAULT_MANPOWER_LIMIT)
+        schedule_df = solve_decomposed(optimizer, df, budget)
+    else:
+        schedule_df = local_optimization(df, budget, alpha)
 
     maintained_df = schedule_df[schedule_df["maintain"] == 1].sort_values(by="maintenance_order")
 
@@ -145,57 +463,159 @@ def run_pipeline(file_path: str, budget: float) -> dict:
         "maintenance_schedule": maintained_df.to_dict(orient="records"),
         "optimized_risk": float(schedule_df["total_optimized_risk"].iloc[0]) if len(schedule_df) else 0.0,
         "solution_status": schedule_df["solution_status"].iloc[0] if len(schedule_df) else "Unknown",
+        "solver_stats": schedule_df.attrs.get("solver_stats"),
     }
+    if mode == "decomposed":
+        plan_summary["decomposition"] = schedule_df.attrs["decomposition"]
 
-    return {
+    results = {
         "analysis_summary": analysis,
         "plan_summary": plan_summary,
         "plan_schedule_df": maintained_df,
         "full_schedule": schedule_df.to_dict(orient="records")
     }
+    if mode == "joint":
+        results["post_optimization"] = {
+            "schedule_df": maintained_df,
+            "summary": _schedule_summary(maintained_df, schedule_df.attrs["labor_remaining_per_day"]),
+        }
+    return results
 
 # -------------------------------
 # Function: post_optimization_schedule
 # -------------------------------
 
-def post_optimization_schedule(df: pd.DataFrame, labor_available_per_day: dict) -> dict:
+def post_optimization_schedule(df: pd.DataFrame, labor_available_per_day: dict, strategy: str = "first_fit",
+                               allowed_days: dict = None, seed: int = None) -> dict:
     """
     Assigns optimized maintenance schedule based on labor constraints and utilization.
+
+    labor_available_per_day may cover any number of days. strategy is one of labor_scheduler.SCHEDULING_STRATEGIES
+    ("first_fit" keeps the maintenance-order, earliest-day assignment); allowed_days maps "low"/"high"
+    utilization to the days each group may use (default DEFAULT_ALLOWED_DAYS).
+    With a seed, the simulated utilization, production rate and unit price (and so the schedule) are reproducible.
     """
     df = df.copy()
+    allowed_days = allowed_days or DEFAULT_ALLOWED_DAYS
+    utilization = simulate_scheduling_inputs(df, allowed_days, _seeded_rng(seed))
+    horizon, capacities = scheduling_horizon(labor_available_per_day, allowed_days)
+
+    maintain = df["maintain"].to_numpy() == 1
+    rows = np.flatnonzero(maintain)
+    order = pd.to_numeric(df["maintenance_order"].iloc[rows], errors="coerce").to_numpy(dtype=float)
+    rows = rows[np.argsort(order, kind="stable")]
+
+    days, remaining = assign_days(
+        df["labor_hours"].to_numpy(dtype=float)[rows],
+        allowed_day_mask(utilization[rows], horizon, allowed_days),
+        capacities,
+        strategy,
+    )
+
+    scheduled_day = np.full(len(df), None, dtype=object)
+    scheduled_day[rows] = np.where(days >= 0, np.array(horizon, dtype=object)[np.maximum(days, 0)], "Unassigned")
+    df["scheduled_day"] = pd.Series(scheduled_day, index=df.index, dtype=object)
+    # Revenue loss applies to every maintained item, scheduled or not
+    df["expected_revenue_loss"] = np.where(maintain, downtime_revenue_loss(df), 0.0)
+    labor_left = {day: type(labor_available_per_day[day])(remaining[horizon.index(day)])
+                  for day in labor_available_per_day}
+
+    summary = _schedule_summary(df, labor_left)
+
+    return {
+        "schedule_df": df,
+        "summary": summary
+    }
+
+
+# -------------------------------
+# Function: run_maintenance_plan
+# -------------------------------
+
+def run_maintenance_plan(file_path: str, budget: float, labor_available_per_day: dict, alpha: float = DEFAULT_ALPHA,
+                         seed: int = DEFAULT_SEED, mode: str = "sequential", strategy: str = "first_fit",
+                         probability_source: str = None) -> dict:
+    """
+    run_pipeline followed by post_optimization_schedule with seeded scheduling inputs, so identical inputs
+    give identical plans. Plans are kept in a bounded LRU cache keyed by the data fingerprint, budget,
+    labor limits, alpha and seed (plus mode, strategy and probability source); a repeated configuration
+    returns a copy of the stored plan without solving.
+    Returns the run_pipeline results with the schedule under "post_optimization".
+    """
+    probability_source = probability_source or PROBABILITY_SOURCE
+    sources = [file_path] + (MODEL_SOURCES if probability_source == "fitted" else [])
+    key = (
+        tuple(file_fingerprint(source) for source in sources),
+        float(budget),
+        tuple(labor_available_per_day.items()),
+        float(alpha),
+        seed,
+        mode,
+        strategy,
+        probability_source,
+    )
+    return copy.deepcopy(_cached_plan(file_path, key))
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _cached_plan(file_path: str, key: tuple) -> dict:
+    _, budget, labor_items, alpha, seed, mode, strategy, probability_source = key
+    labor_available_per_day = dict(labor_items)
+    results = run_pipeline(file_path, budget, mode=mode, labor_available_per_day=labor_available_per_day,
+                           probability_source=probability_source, alpha=alpha, seed=seed)
+    if "post_optimization" not in results:
+        results["post_optimization"] = post_optimization_schedule(
+            results["plan_schedule_df"], labor_available_per_day, strategy, seed=seed)
+    return results
+
+# -------------------------------
+# Functions: simulate_scheduling_inputs / scheduling_horizon / downtime_revenue_loss
+# -------------------------------
+
+def simulate_scheduling_inputs(df: pd.DataFrame, allowed_days: dict, rng=None) -> np.ndarray:
+    """
+    Fills utilization, allowed days, downtime, production rate and unit price (simulated when missing)
+    and returns the utilization array. rng is a numpy Generator; the global numpy state is used without one.
+    """
+    rng = np.random if rng is None else rng
 
     # Simulate utilization if missing
     if "utilization_pct" not in df.columns:
-        df["utilization_pct"] = np.random.uniform(0.6, 0.9, len(df)).round(2)
+        df["utilization_pct"] = rng.uniform(0.6, 0.9, len(df)).round(2)
 
-    df["allowed_days"] = df["utilization_pct"].apply(
-        lambda u: ["DAY+1", "DAY+2", "DAY+3", "DAY+4"] if u < 0.7 else ["DAY+2", "DAY+3"]
-    )
+    utilization = df["utilization_pct"].to_numpy(dtype=float)
+    df["allowed_days"] = [allowed_days["low"] if u < HIGH_UTILIZATION_THRESHOLD else allowed_days["high"]
+                          for u in utilization]
 
     df["downtime_hours"] = df.get("downtime_hours", df["labor_hours"] * 1.5)
-    df["production_per_hour"] = df.get("production_per_hour", np.random.uniform(80, 150, len(df)).round(2))
-    df["unit_price"] = df.get("unit_price", np.random.uniform(9.0, 15.0, len(df)).round(2))
-
-    df["scheduled_day"] = None
-    df["expected_revenue_loss"] = 0.0
-    labor_left = labor_available_per_day.copy()
-
-    maintained_df = df[df["maintain"] == 1].sort_values(by="maintenance_order")
-
-    for idx, row in maintained_df.iterrows():
-        assigned = False
-        for day in row["allowed_days"]:
-            if labor_left.get(day, 0) >= row["labor_hours"]:
-                labor_left[day] -= row["labor_hours"]
-                df.at[idx, "scheduled_day"] = day
-                df.at[idx, "expected_revenue_loss"] = row["downtime_hours"] * row["production_per_hour"] * row["unit_price"]
-                assigned = True
-                break
-        if not assigned:
-            df.at[idx, "scheduled_day"] = "Unassigned"
-            df.at[idx, "expected_revenue_loss"] = row["downtime_hours"] * row["production_per_hour"] * row["unit_price"]
-
-    summary = {
+    df["production_per_hour"] = df.get("production_per_hour", rng.uniform(80, 150, len(df)).round(2))
+    df["unit_price"] = df.get("unit_price", rng.uniform(9.0, 15.0, len(df)).round(2))
+    return utilization
+
+
+def _seeded_rng(seed):
+    return None if seed is None else np.random.default_rng(seed)
+
+
+def scheduling_horizon(labor_available_per_day: dict, allowed_days: dict) -> tuple:
+    """
+    Ordered day names and their labor capacities; days without a labor entry have no capacity.
+    """
+    horizon = list(dict.fromkeys([*allowed_days["low"], *allowed_days["high"], *labor_available_per_day]))
+    capacities = np.array([labor_available_per_day.get(day, 0) for day in horizon], dtype=float)
+    return horizon, capacities
+
+
+def downtime_revenue_loss(df: pd.DataFrame) -> np.ndarray:
+    """
+    Revenue lost while each asset is down for maintenance (downtime hours x production rate x unit price).
+    """
+    return (df["downtime_hours"].to_numpy(dtype=float) * df["production_per_hour"].to_numpy(dtype=float)
+            * df["unit_price"].to_numpy(dtype=float))
+
+
+def _schedule_summary(df: pd.DataFrame, labor_left: dict) -> dict:
+    return {
         "total_revenue_loss": df["expected_revenue_loss"].sum(),
         "total_maintenance_cost": (df["cost"] * df["maintain"]).sum(),
         "total_optimized_risk": df["optimized_risk"].iloc[0] if "optimized_risk" in df.columns else None,
@@ -208,8 +628,3 @@ def post_optimization_schedule(df: pd.DataFrame, labor_available_per_day: dict)
             "expected_revenue_loss", "optimized_risk"
         ]].to_dict(orient="records")
     }
-
-    return {
-        "schedule_df": df,
-        "summary": summary
-    }
@@ -3,16 +3,15 @@ import pandas as pd
 import asyncio
 import json
 import os
-from google.adk.agents.llm_agent import LlmAgent
-from google.adk.sessions import InMemorySessionService
-from google.adk.runners import Runner
-from google.genai import types
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any
 import numpy as np
 
 # Assuming maintenance_pipeline.py is in the same directory
-from maintenance_pipeline import run_pipeline, post_optimization_schedule
+from maintenance_pipeline import run_maintenance_plan, ingest_data, risk_budget_frontier
+from risk_simulation import simulate_schedule, plan_assets
+from scenario_engine import scenario_grid, evaluate_scenarios
+from lazy_loading import adk_agent
 
 # Set pandas display options
 pd.set_option('display.max_columns', None)
@@ -22,6 +21,7 @@ APP_NAME = "maintenance_app"
 USER_ID = "user_1"
 SESSION_ID = "session_001"
 GEMINI_MODEL = "gemini-2.0-flash" # Consider using gemini-1.5-flash or gemini-1.5-pro for better performance if needed
+BUDGET_MIN, BUDGET_MAX, BUDGET_STEP = 1000, 20000, 500
 
 # --- Google API Key (ensure this is handled securely in a real application) ---
 # For demonstration purposes, setting directly. In production, use Streamlit secrets or environment variables.
@@ -48,10 +48,12 @@ class MaintenanceAgentOutput(BaseModel):
     Recommended_Actions: str = Field(description="Recommended next steps")
 
 # --- Maintenance Plan Agent Definition ---
-maintenance_plan_agent = LlmAgent(
-    name="MaintenancePlanAgent",
-    model=GEMINI_MODEL,
-    instruction="""You are a maintenance plan summary expert.Your have three inputs- 'analysis_summary','full_schedule' and 'post_optimization_summary'.Come up with a general summary using 'analysis_summary'(keys like total_equipment,avg_failure_probability,high_risk_count and total_unoptimized_risk)
+def build_maintenance_plan_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="MaintenancePlanAgent",
+        model=GEMINI_MODEL,
+        instruction="""You are a maintenance plan summary expert.Your have three inputs- 'analysis_summary','full_schedule' and 'post_optimization_summary'.Come up with a general summary using 'analysis_summary'(keys like total_equipment,avg_failure_probability,high_risk_count and total_unoptimized_risk)
     In 'full_schedule' you have the following-
     For each piece of equipment (identified by equipment_id), you know its age, how many times it’s been 
     maintained (maintenance_count), the cost and labor hours required for maintenance, its risk_impact and 
@@ -66,13 +68,18 @@ maintenance_plan_agent = LlmAgent(
     
     Alerts,Details and Recommended_Actions must be in form of numbered points.
         """,
-    description="Generates maintenance plan summary analysis based on detailed post-optimization data.",
-    input_schema=MaintenanceAgentInput,
-    output_schema=MaintenanceAgentOutput
-)
+        description="Generates maintenance plan summary analysis based on detailed post-optimization data.",
+        input_schema=MaintenanceAgentInput,
+        output_schema=MaintenanceAgentOutput
+    )
 
 # --- Function to run the agent asynchronously ---
 async def run_maintenance_agent(analysis_summary, full_schedule, post_optimization_summary):
+    # google.adk is imported when the summary is requested, not on every page load
+    from google.adk.sessions import InMemorySessionService
+    from google.adk.runners import Runner
+    from google.genai import types
+
     session_service = InMemorySessionService()
     await session_service.create_session(
         app_name=APP_NAME,
@@ -80,7 +87,7 @@ async def run_maintenance_agent(analysis_summary, full_schedule, post_optimizati
         session_id=SESSION_ID
     )
 
-    runner = Runner(agent=maintenance_plan_agent, app_name=APP_NAME, session_service=session_service)
+    runner = Runner(agent=build_maintenance_plan_agent(), app_name=APP_NAME, session_service=session_service)
 
     # Convert numpy types in summary to standard Python types for JSON serialization
     summary_for_json = {}
@@ -106,6 +113,11 @@ async def run_maintenance_agent(analysis_summary, full_schedule, post_optimizati
                     responses.append(part.text)
     return responses
 
+# --- Risk vs. budget frontier (one solve for every slider position) ---
+@st.cache_data(show_spinner=False)
+def load_budget_frontier(data_path, data_mtime):
+    return risk_budget_frontier(ingest_data(data_path), range(BUDGET_MIN, BUDGET_MAX + 1, BUDGET_STEP))
+
 # --- Streamlit UI ---
 # st.set_page_config(layout="wide", page_title="Maintenance Planning Dashboard")
 
@@ -120,7 +132,7 @@ st.sidebar.header("Configuration")
 
 # User inputs for budget and labor limits
 st.sidebar.subheader("Budget and Labor Limits")
-budget_limit = st.sidebar.slider("Select Budget Limit", min_value=1000, max_value=20000, value=7000, step=500)
+budget_limit = st.sidebar.slider("Select Budget Limit", min_value=BUDGET_MIN, max_value=BUDGET_MAX, value=7000, step=BUDGET_STEP)
 
 st.sidebar.markdown("Define daily labor limits:")
 labor_limits = {}
@@ -129,6 +141,18 @@ labor_limits["DAY+2"] = st.sidebar.number_input("Labor Limit Day + 2", min_value
 labor_limits["DAY+3"] = st.sidebar.number_input("Labor Limit Day + 3", min_value=0, value=15, step=1)
 labor_limits["DAY+4"] = st.sidebar.number_input("Labor Limit Day + 4", min_value=0, value=10, step=1)
 
+planning_mode = st.sidebar.radio(
+    "Planning mode",
+    options=["sequential", "joint", "decomposed"],
+    format_func=lambda m: {
+        "sequential": "Select, then schedule",
+        "joint": "Select and schedule together",
+        "decomposed": "Select per line in parallel",
+    }[m],
+    help="The joint mode picks equipment against the daily labor limits directly, so no selected item is left unassigned. "
+         "The per-line mode solves each line in its own process and reports its gap to the plant-wide LP bound.",
+)
+
 
 # Path to the CSV file (adjust if necessary for deployment)
 # Using a relative path for better portability if the CSV is in the same directory as the script.
@@ -137,17 +161,46 @@ DATA_PATH = "synthetic_limited_line_equipment_data_with_maps.csv" # Ensure this
 if not os.path.exists(DATA_PATH):
     st.error(f"Data file not found: {DATA_PATH}. Please make sure the CSV is in the same directory as the script.")
 else:
+    # Scrubbing the budget slider is a table lookup, not a solver call
+    frontier = load_budget_frontier(DATA_PATH, os.path.getmtime(DATA_PATH))
+    frontier_point = frontier[frontier["budget"] == budget_limit].iloc[0]
+    st.subheader("📉 Risk vs. Budget")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Optimized Risk", f"{frontier_point['optimized_risk']:.2f}")
+    col2.metric("Equipment Maintained", int(frontier_point["maintenance_count"]))
+    col3.metric("Budget Used", f"{frontier_point['total_cost']:,.0f}")
+    st.line_chart(frontier.set_index("budget")["optimized_risk"])
+
+    with st.expander("🔀 Compare scenarios"):
+        st.markdown("Evaluate every combination of budgets, labor scales (applied to the daily limits in the sidebar) and alphas.")
+        scenario_budgets = st.multiselect("Budgets", list(range(BUDGET_MIN, BUDGET_MAX + 1, BUDGET_STEP)),
+                                          default=[budget_limit])
+        labor_scales = st.multiselect("Labor scale", [0.5, 0.75, 1.0, 1.25, 1.5, 2.0], default=[1.0])
+        scenario_alphas = st.multiselect("Alpha", [0.0, 0.1, 0.2, 0.3, 0.5], default=[0.0])
+        if st.button("Run scenarios"):
+            labor_options = [{day: round(hours * scale) for day, hours in labor_limits.items()} for scale in labor_scales]
+            scenarios = scenario_grid(scenario_budgets, labor_options, scenario_alphas)
+            with st.spinner(f"Evaluating {len(scenarios)} scenarios..."):
+                comparison = evaluate_scenarios(DATA_PATH, scenarios, mode=planning_mode)
+            st.dataframe(comparison)
+            st.caption(f"{len(scenarios)} scenarios, {comparison.attrs['solves']} selection solves, "
+                       f"{comparison.attrs['elapsed_s']:.2f}s")
+
     if st.sidebar.button("Generate Maintenance Plan"):
         with st.spinner("Generating maintenance plan... This may take a moment."):
             try:
-                # Run the initial pipeline
-                results = run_pipeline(DATA_PATH, budget_limit)
+                # Seeded and memoized: a configuration seen before returns without solving
+                results = run_maintenance_plan(DATA_PATH, budget_limit, labor_limits, mode=planning_mode)
                 analysis_summary = results["analysis_summary"]
+                decomposition = results["plan_summary"].get("decomposition")
+                if decomposition:
+                    st.caption(f"Solved {decomposition['lines']} lines on {decomposition['workers']} workers in "
+                               f"{decomposition['elapsed_s']:.2f}s; gap to the plant-wide bound: "
+                               f"{decomposition.get('gap', 0.0):.2%}")
                 full_schedule = results["full_schedule"]
                 plan_schedule_df = results["plan_schedule_df"]
 
-                # Run post-optimization schedule
-                result_post = post_optimization_schedule(plan_schedule_df, labor_limits)
+                result_post = results["post_optimization"]
                 post_optimization_summary = result_post["summary"]
 
                 # Run the LLM agent
@@ -198,6 +251,17 @@ else:
                 st.subheader("Post-Optimization Schedule Details")
                 st.dataframe(result_post["schedule_df"])
 
+                # Sampled failures over the labor horizon, for maintained and skipped equipment
+                simulation = simulate_schedule(plan_assets(full_schedule, result_post["schedule_df"]), list(labor_limits))
+                exposure = simulation["summary"]["revenue_loss"]
+                st.subheader("📈 Revenue Loss Exposure")
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Expected", f"{exposure['mean']:,.0f}")
+                col2.metric("P95", f"{exposure['p95']:,.0f}")
+                col3.metric("CVaR 95%", f"{exposure['cvar95']:,.0f}")
+                st.caption(f"{simulation['summary']['scenarios']:,} simulated scenarios; "
+                           f"expected failures: {simulation['summary']['expected_failures']:.1f}")
+
             except Exception as e:
                 st.error(f"An error occurred during pipeline execution: {e}")
                 st.exception(e) # Display full traceback for debugging
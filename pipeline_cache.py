@@ -0,0 +1,90 @@
+# pipeline_cache.py
+
+import hashlib
+import json
+import os
+import shutil
+
+from dataset_loader import DATASETS, file_fingerprint
+
+CACHE_DIR = ".pipeline_cache"
+SOP_PATH = os.path.join("SOP_Document", "SOP_Document.pdf")
+
+# Every file the agent pipeline reads for a line
+PIPELINE_INPUTS = [
+    DATASETS["line_components"],
+    DATASETS["historical"],
+    DATASETS["digital_log"],
+    DATASETS["inventory"],
+    DATASETS["suppliers"],
+    DATASETS["equipment"],
+    SOP_PATH,
+]
+
+# -------------------------------
+# Function: agent_config
+# -------------------------------
+
+def agent_config(agent) -> dict:
+    """
+    Model name and instruction hash of an agent and all of its sub-agents, keyed by agent name.
+    """
+    config = {}
+    model = getattr(agent, "model", None)
+    if model:
+        instruction = getattr(agent, "instruction", "")
+        config[agent.name] = {
+            "model": model if isinstance(model, str) else type(model).__name__,
+            "instruction_sha256": hashlib.sha256(str(instruction).encode("utf-8")).hexdigest(),
+        }
+    for sub_agent in getattr(agent, "sub_agents", []) or []:
+        config.update(agent_config(sub_agent))
+    return config
+
+# -------------------------------
+# Function: pipeline_fingerprint
+# -------------------------------
+
+def pipeline_fingerprint(config: dict, inputs: list = None) -> tuple:
+    """
+    Returns (fingerprint, manifest) over the content of every pipeline input and the given config.
+    """
+    manifest = {
+        "inputs": {path: file_fingerprint(path) for path in (inputs or PIPELINE_INPUTS)},
+        "config": config,
+    }
+    payload = json.dumps(manifest, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest(), manifest
+
+# -------------------------------
+# Functions: cached_result / store_result
+# -------------------------------
+
+def _result_path(fingerprint: str, line: str, complete: bool = True) -> str:
+    safe_line_name = line.replace(" ", "_")
+    suffix = "" if complete else ".partial"
+    return os.path.join(CACHE_DIR, fingerprint[:16], f"final_ui_processed_responses_{safe_line_name}{suffix}.pkl")
+
+
+def cached_result(fingerprint: str, line: str):
+    """
+    Path of the cached final_ui artifact for a line under this fingerprint, or None on a miss.
+    Partial results (templated alerts still waiting for LLM prose) are misses.
+    """
+    path = _result_path(fingerprint, line)
+    return path if os.path.exists(path) else None
+
+
+def store_result(fingerprint: str, line: str, final_ui_path: str, manifest: dict, complete: bool = True) -> str:
+    """
+    Copies a line's final_ui artifact into the cache under the fingerprint and returns the cached path.
+    An incomplete artifact is kept under a separate name so that cached_result never serves it.
+    """
+    path = _result_path(fingerprint, line, complete)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    shutil.copyfile(final_ui_path, tmp_path)
+    os.replace(tmp_path, path)
+    with open(os.path.join(os.path.dirname(path), "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True, default=str)
+    return path
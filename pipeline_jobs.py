@@ -0,0 +1,275 @@
+# pipeline_jobs.py
+#
+# SQLite-backed job queue for the dashboard's agent pipeline. Pages submit a request and poll; one worker
+# process, started on demand and detached from Streamlit, runs the jobs and publishes progress and results.
+#
+#   python pipeline_jobs.py worker    # run the worker in the foreground
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from contextlib import closing
+
+# Anchored on this file, not the working directory: pages and the worker may start from different ones
+JOBS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".pipeline_jobs")
+JOBS_DB = os.path.join(JOBS_DIR, "jobs.sqlite")
+WORKER_LOG = os.path.join(JOBS_DIR, "worker.log")
+
+# Pages poll job state this often
+JOB_POLL_S = 2.0
+# The worker looks for queued jobs this often and refreshes its heartbeat every WORKER_HEARTBEAT_S
+WORKER_POLL_S = 1.0
+WORKER_HEARTBEAT_S = 5.0
+# A worker whose heartbeat is older than this is considered dead and its running jobs are re-queued
+WORKER_STALE_S = 30.0
+# An idle worker exits after this long; the next submission starts a new one
+WORKER_IDLE_EXIT_S = float(os.environ.get("PIPELINE_WORKER_IDLE_S", "600"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    request_key TEXT NOT NULL,
+    request TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress TEXT,
+    result_path TEXT,
+    error TEXT,
+    worker_pid INTEGER,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    updated_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_request_status ON jobs (request_key, status);
+CREATE TABLE IF NOT EXISTS worker (
+    slot INTEGER PRIMARY KEY CHECK (slot = 0),
+    pid INTEGER NOT NULL,
+    heartbeat_at REAL NOT NULL
+);
+"""
+
+# -------------------------------
+# Function: submit_job
+# -------------------------------
+
+def submit_job(request: dict) -> int:
+    """
+    Queues a pipeline run for request (see agent_pipeline.pipeline_request) and returns its job id.
+    A request identical to a queued or running one returns that job instead of queueing another.
+    """
+    request_json = json.dumps(request, sort_keys=True, default=str)
+    request_key = hashlib.sha256(request_json.encode("utf-8")).hexdigest()
+    now = time.time()
+    with _transaction() as conn:
+        row = conn.execute(
+            "SELECT id FROM jobs WHERE request_key = ? AND status IN ('queued', 'running') ORDER BY id DESC LIMIT 1",
+            (request_key,),
+        ).fetchone()
+        if row:
+            return row["id"]
+        cursor = conn.execute(
+            "INSERT INTO jobs (request_key, request, status, created_at, updated_at) VALUES (?, ?, 'queued', ?, ?)",
+            (request_key, request_json, now, now),
+        )
+        return cursor.lastrowid
+
+# -------------------------------
+# Function: get_job
+# -------------------------------
+
+def get_job(job_id: int):
+    """
+    The job row as a dict (status, progress, result_path, error, timestamps), or None if unknown.
+    """
+    with closing(_connect()) as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return dict(row) if row else None
+
+# -------------------------------
+# Function: latest_result
+# -------------------------------
+
+def latest_result():
+    """
+    The most recently published result that still exists, as {"job_id", "path", "version", "status"},
+    or None. A running job publishes its templated alerts before it finishes, so this is the last good
+    result to render while newer work is in progress; version changes whenever the file is rewritten.
+    """
+    with closing(_connect()) as conn:
+        rows = conn.execute(
+            "SELECT id, status, result_path FROM jobs WHERE result_path IS NOT NULL ORDER BY updated_at DESC, id DESC"
+        ).fetchall()
+    for row in rows:
+        try:
+            stat = os.stat(row["result_path"])
+        except OSError:
+            continue
+        return {
+            "job_id": row["id"],
+            "path": row["result_path"],
+            "version": f"{row['result_path']}:{stat.st_mtime_ns}:{stat.st_size}",
+            "status": row["status"],
+        }
+    return None
+
+# -------------------------------
+# Function: ensure_worker
+# -------------------------------
+
+def ensure_worker() -> bool:
+    """
+    Starts a detached worker process unless one is alive; returns True if one was started.
+    Two pages racing here may both start one, the second exits as soon as it sees the first.
+    """
+    with closing(_connect()) as conn:
+        row = conn.execute("SELECT heartbeat_at FROM worker WHERE slot = 0").fetchone()
+    if row and time.time() - row["heartbeat_at"] < WORKER_STALE_S:
+        return False
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    with open(WORKER_LOG, "a") as log:
+        subprocess.Popen(
+            [sys.executable, "-u", os.path.abspath(__file__), "worker"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+            # Not a child of the Streamlit session: it survives reruns, page closes and server restarts
+            start_new_session=True,
+        )
+    return True
+
+# -------------------------------
+# Function: run_worker
+# -------------------------------
+
+def run_worker(idle_exit_s: float = WORKER_IDLE_EXIT_S) -> None:
+    """
+    Runs queued jobs one at a time until idle for idle_exit_s seconds. Only one worker holds the
+    worker slot; jobs a dead worker left running are re-queued when a new one takes over.
+    """
+    pid = os.getpid()
+    if not _claim_worker_slot(pid):
+        print(f"Worker {pid}: another worker is alive, exiting")
+        return
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(pid, stop), daemon=True)
+    heartbeat.start()
+    print(f"Worker {pid}: started")
+    try:
+        idle_since = time.time()
+        while time.time() - idle_since < idle_exit_s:
+            job = _claim_next_job(pid)
+            if job is None:
+                time.sleep(WORKER_POLL_S)
+                continue
+            _run_job(job)
+            idle_since = time.time()
+    finally:
+        stop.set()
+        with _transaction() as conn:
+            conn.execute("DELETE FROM worker WHERE slot = 0 AND pid = ?", (pid,))
+        print(f"Worker {pid}: exiting")
+
+
+def _run_job(job: dict) -> None:
+    """
+    Runs one pipeline request, publishing progress messages and every result the pipeline writes.
+    """
+    # Imported here so submitting and polling never import the pipeline modules
+    from agent_pipeline import run_agent_pipeline
+
+    job_id = job["id"]
+    print(f"Job {job_id}: running {job['request']}")
+    try:
+        path = asyncio.run(run_agent_pipeline(
+            **json.loads(job["request"]),
+            on_progress=lambda message: _update_job(job_id, progress=message),
+            on_result=lambda result_path: _update_job(job_id, result_path=result_path),
+        ))
+    except Exception as e:
+        traceback.print_exc()
+        _update_job(job_id, status="failed", error=f"{type(e).__name__}: {e}", finished_at=time.time())
+        return
+    fields = {"status": "done", "progress": "Done", "finished_at": time.time()}
+    if path:
+        fields["result_path"] = path
+    _update_job(job_id, **fields)
+    print(f"Job {job_id}: done, {path}")
+
+# -------------------------------
+# Database
+# -------------------------------
+
+def _connect() -> sqlite3.Connection:
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    conn = sqlite3.connect(JOBS_DB, timeout=30.0, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    # WAL lets pages read while the worker writes
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class _transaction:
+    """
+    Write transaction taking the database lock up front (BEGIN IMMEDIATE), so check-then-insert is atomic.
+    """
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn = _connect()
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        self.conn.close()
+
+
+def _update_job(job_id: int, **fields) -> None:
+    fields["updated_at"] = time.time()
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    with _transaction() as conn:
+        conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+
+def _claim_worker_slot(pid: int) -> bool:
+    now = time.time()
+    with _transaction() as conn:
+        row = conn.execute("SELECT pid, heartbeat_at FROM worker WHERE slot = 0").fetchone()
+        if row and row["pid"] != pid and now - row["heartbeat_at"] < WORKER_STALE_S:
+            return False
+        conn.execute("INSERT OR REPLACE INTO worker (slot, pid, heartbeat_at) VALUES (0, ?, ?)", (pid, now))
+        # Only one worker runs at a time, so anything still marked running was left by a dead one
+        conn.execute("UPDATE jobs SET status = 'queued', worker_pid = NULL, updated_at = ? WHERE status = 'running'",
+                     (now,))
+    return True
+
+
+def _heartbeat(pid: int, stop: threading.Event) -> None:
+    while not stop.wait(WORKER_HEARTBEAT_S):
+        with _transaction() as conn:
+            conn.execute("UPDATE worker SET heartbeat_at = ? WHERE slot = 0 AND pid = ?", (time.time(), pid))
+
+
+def _claim_next_job(pid: int):
+    now = time.time()
+    with _transaction() as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1").fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            "UPDATE jobs SET status = 'running', worker_pid = ?, started_at = ?, updated_at = ?, progress = 'Starting' "
+            "WHERE id = ?",
+            (pid, now, now, row["id"]),
+        )
+    return dict(row)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["worker"]:
+        sys.exit("usage: python pipeline_jobs.py worker")
+    run_worker()
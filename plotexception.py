@@ -1,6 +1,8 @@
+import os
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from sensor_store import SensorSeriesStore
 
 def historical_performance_analysis(high_risk_parts, file_path="datasets/Historical_data.csv"):
     """
@@ -14,37 +16,34 @@ def historical_performance_analysis(high_risk_parts, file_path="datasets/Histori
         dict: A dictionary containing the paths to the generated plots for each part.
     """
     try:
-        df = pd.read_csv(file_path)
+        store = SensorSeriesStore.from_dataset(file_path)
         print("Historical Data")
         # print(df)
         results = {}
         for part_data in high_risk_parts:
             part = part_data['part']
             line = part_data['line']
-            part_df = df[(df['Line'] == line) & (df['Part'] == part)]
-            print("Part Data")
-            print(part_df)
-            if part_df.empty:
+            parameters = store.parameters(line, part)
+            if not parameters:
                 print(f"No data found for part '{part}' on line '{line}'. Skipping.")
                 continue
  
-            parameters = part_df['Parameter'].unique()
             num_params = len(parameters)
             fig, axes = plt.subplots(num_params, 1, figsize=(12, 6 * num_params))
             fig.suptitle(f"Historical Performance for Part '{part}' on Line '{line}'")
  
             plot_paths = []
             for i, param in enumerate(parameters):
-                param_df = part_df[part_df['Parameter'] == param].sort_values(by='Date')
-                if param_df.empty:
+                series = store.series(line, part, param)
+                if not len(series['value']):
                     print(f"No data found for parameter '{param}' for part '{part}' on line '{line}'. Skipping.")
                     continue
  
                 ax = axes[i] if num_params > 1 else axes
-                ax.plot(param_df['Value'], param_df['Value'], label='Actual Value', marker='o')
-                ax.axhline(y=param_df['Expected_value_min'].iloc[0], color='r', linestyle='--', label='Expected Min')
-                ax.axhline(y=param_df['Expected_value_max'].iloc[0], color='g', linestyle='--', label='Expected Max')
-                ax.set_xlabel('Date')
+                ax.plot(series['cycle'], series['value'], label='Actual Value', marker='o')
+                ax.axhline(y=series['expected_min'][0], color='r', linestyle='--', label='Expected Min')
+                ax.axhline(y=series['expected_max'][0], color='g', linestyle='--', label='Expected Max')
+                ax.set_xlabel('Cycle')
                 ax.set_ylabel('Value')
                 ax.set_title(f'Parameter: {param}')
                 ax.legend()
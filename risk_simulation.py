@@ -0,0 +1,161 @@
+# risk_simulation.py
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from labor_scheduler import DEFAULT_ALLOWED_DAYS
+from maintenance_pipeline import DEFAULT_ALPHA, simulate_scheduling_inputs
+
+DEFAULT_SCENARIOS = 100_000
+# Unplanned repair after a failure takes this many times the planned maintenance downtime, on average
+FAILURE_DOWNTIME_FACTOR = 3.0
+# Largest (scenarios x assets x days) event tensor sampled at once
+MAX_CHUNK_CELLS = 8_000_000
+TAIL_LEVELS = (0.5, 0.95, 0.99)
+SCHEDULING_INPUTS = ["utilization_pct", "downtime_hours", "production_per_hour", "unit_price"]
+
+# -------------------------------
+# Function: simulate_schedule
+# -------------------------------
+
+def simulate_schedule(schedule_df: pd.DataFrame, horizon: list = None, n_scenarios: int = DEFAULT_SCENARIOS,
+                      alpha: float = DEFAULT_ALPHA, seed: int = 0, max_workers: int = None) -> dict:
+    """
+    Samples failure events for every asset on every horizon day and returns distributions of downtime and
+    revenue loss for the plan.
+
+    schedule_df holds all assets (maintained and skipped) with maintain and, for maintained ones, scheduled_day.
+    failure_probability is read as the chance of failing within the horizon, spread evenly over its days.
+    A maintained asset keeps its full hazard until its scheduled day and alpha times it afterwards;
+    an unassigned one keeps the full hazard. Each failure costs a random unplanned downtime (exponential,
+    mean FAILURE_DOWNTIME_FACTOR x downtime_hours) at production_per_hour x unit_price.
+    Scenarios are sampled in chunks of (scenarios x assets x days) arrays, one SeedSequence child per chunk,
+    so results depend on seed and n_scenarios only, not on the number of workers. Missing scheduling inputs
+    are simulated from the same seed.
+    """
+    start = time.perf_counter()
+    horizon = list(horizon or DEFAULT_ALLOWED_DAYS["low"])
+    df = schedule_df.copy()
+    if "scheduled_day" not in df.columns:
+        df["scheduled_day"] = None
+    # Rows merged in without scheduling inputs (e.g. skipped assets) get the same simulated defaults
+    defaults = df.drop(columns=[c for c in SCHEDULING_INPUTS if c in df.columns])
+    simulate_scheduling_inputs(defaults, DEFAULT_ALLOWED_DAYS, np.random.default_rng(seed))
+    for col in SCHEDULING_INPUTS:
+        df[col] = df[col].fillna(defaults[col]) if col in df.columns else defaults[col]
+
+    maintain = df["maintain"].to_numpy() == 1
+    hazard = _daily_hazard(df, horizon, maintain, alpha)
+    loss_rate = df["production_per_hour"].to_numpy(dtype=float) * df["unit_price"].to_numpy(dtype=float)
+    repair_hours = FAILURE_DOWNTIME_FACTOR * df["downtime_hours"].to_numpy(dtype=float)
+    scheduled = maintain & df["scheduled_day"].isin(horizon).to_numpy()
+    planned_loss = float((df["downtime_hours"].to_numpy(dtype=float) * loss_rate)[scheduled].sum())
+
+    cells = max(hazard.size, 1)
+    chunk = max(1, min(n_scenarios, MAX_CHUNK_CELLS // cells))
+    sizes = [min(chunk, n_scenarios - k) for k in range(0, n_scenarios, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(s, n, hazard, loss_rate, repair_hours, maintain) for s, n in zip(seeds, sizes)]
+
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(tasks)))
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(_simulate_chunk, tasks))
+    else:
+        parts = [_simulate_chunk(task) for task in tasks]
+
+    samples = {key: np.concatenate([p[key] for p in parts]) for key in parts[0] if key != "asset_failures"}
+    asset_failures = sum(p["asset_failures"] for p in parts)
+    samples["revenue_loss"] = samples["failure_revenue_loss"] + planned_loss
+
+    per_asset = df[[c for c in ("equipment_id", "line", "component", "maintain", "scheduled_day") if c in df.columns]].copy()
+    per_asset["failure_rate"] = asset_failures / n_scenarios
+    per_asset["expected_failure_loss"] = per_asset["failure_rate"] * repair_hours * loss_rate
+
+    summary = {
+        "scenarios": n_scenarios,
+        "horizon": horizon,
+        "downtime_hours": tail_stats(samples["downtime_hours"]),
+        "revenue_loss": tail_stats(samples["revenue_loss"]),
+        "maintained_revenue_loss": tail_stats(samples["maintained_revenue_loss"]),
+        "skipped_revenue_loss": tail_stats(samples["skipped_revenue_loss"]),
+        "planned_revenue_loss": planned_loss,
+        "expected_failures": float(samples["failures"].mean()),
+        "p_any_failure": float((samples["failures"] > 0).mean()),
+        "chunks": len(tasks),
+        "workers": workers,
+        "elapsed_s": time.perf_counter() - start,
+    }
+    return {"summary": summary, "per_asset": per_asset, "samples": pd.DataFrame(samples)}
+
+def plan_assets(full_schedule, schedule_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    All assets of a run_pipeline full_schedule with the scheduled_day and scheduling inputs of the
+    post_optimization_schedule result joined on equipment_id.
+    """
+    full = pd.DataFrame(full_schedule)
+    cols = ["equipment_id", "scheduled_day"] + [c for c in SCHEDULING_INPUTS if c in schedule_df.columns]
+    return full.drop(columns=[c for c in cols[1:] if c in full.columns]).merge(
+        schedule_df[cols], on="equipment_id", how="left")
+
+# -------------------------------
+# Function: tail_stats
+# -------------------------------
+
+def tail_stats(samples, levels=TAIL_LEVELS) -> dict:
+    """
+    Mean, percentiles (p50, p95, ...) and CVaR (mean of the worst 1 - level share) of a sample.
+    """
+    samples = np.sort(np.asarray(samples, dtype=float))
+    stats = {"mean": float(samples.mean()) if len(samples) else 0.0}
+    for level in levels:
+        stats[f"p{round(level * 100)}"] = float(np.quantile(samples, level)) if len(samples) else 0.0
+    for level in levels[1:]:
+        tail = samples[int(np.floor(level * len(samples))):]
+        stats[f"cvar{round(level * 100)}"] = float(tail.mean()) if len(tail) else 0.0
+    return stats
+
+# -------------------------------
+# Sampling
+# -------------------------------
+
+def _daily_hazard(df, horizon, maintain, alpha) -> np.ndarray:
+    """
+    (assets x days) failure probability per day; maintenance from its scheduled day on scales it by alpha.
+    """
+    days = len(horizon)
+    p = np.clip(df["failure_probability"].to_numpy(dtype=float), 0.0, 1.0)
+    before = 1.0 - (1.0 - p) ** (1.0 / days)
+    after = 1.0 - (1.0 - alpha * p) ** (1.0 / days)
+
+    position = {day: j for j, day in enumerate(horizon)}
+    maintained_from = np.array([position.get(day, days) if m else days
+                                for day, m in zip(df["scheduled_day"].tolist(), maintain)])
+    done = np.arange(days)[None, :] >= maintained_from[:, None]
+    return np.where(done, after[:, None], before[:, None])
+
+
+def _simulate_chunk(task) -> dict:
+    """
+    One chunk of scenarios: samples the (scenarios x assets x days) event tensor and reduces it to
+    per-scenario totals and per-asset failure counts. Runs in a worker process.
+    """
+    seed, n, hazard, loss_rate, repair_hours, maintain = task
+    rng = np.random.default_rng(seed)
+    events = rng.random((n,) + hazard.shape, dtype=np.float32) < hazard[None, :, :].astype(np.float32)
+    # The first failure takes the asset down for the rest of the horizon
+    failed = events.any(axis=2)
+    downtime = np.where(failed, rng.exponential(1.0, size=failed.shape) * repair_hours[None, :], 0.0)
+    loss = downtime * loss_rate[None, :]
+    return {
+        "downtime_hours": downtime.sum(axis=1),
+        "failure_revenue_loss": loss.sum(axis=1),
+        "maintained_revenue_loss": loss[:, maintain].sum(axis=1),
+        "skipped_revenue_loss": loss[:, ~maintain].sum(axis=1),
+        "failures": failed.sum(axis=1),
+        "asset_failures": failed.sum(axis=0),
+    }
@@ -0,0 +1,217 @@
+# rolling_horizon.py
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from labor_scheduler import assign_days, allowed_day_mask, HIGH_UTILIZATION_THRESHOLD
+from maintenance_pipeline import (
+    MaintenanceOptimizer, DEFAULT_ALPHA, simulate_scheduling_inputs, downtime_revenue_loss
+)
+
+# Selection/assignment rounds per re-plan (items that fit no single day are dropped between rounds)
+PLAN_ROUNDS = 3
+# Incremental re-plans consider enough unscheduled assets to cover this multiple of the freed budget or labor
+CANDIDATE_COVER = 2.0
+MIN_CANDIDATES = 32
+
+# -------------------------------
+# Class: RollingHorizonPlanner
+# -------------------------------
+
+class RollingHorizonPlanner:
+    def __init__(self, equipment_df: pd.DataFrame, budget: float, labor_available_per_day: dict,
+                 allowed_days: dict = None, strategy: str = "first_fit", alpha: float = DEFAULT_ALPHA):
+        """
+        Keeps a maintenance plan over a rolling horizon of days and re-plans only what a change touches.
+
+        labor_available_per_day maps each horizon day (any number, in order) to its labor hours.
+        allowed_days maps "low"/"high" utilization to allowed days; by default low-utilization equipment may
+        use every day and busy equipment every day except the first and last (DAY+2/DAY+3 for a 4-day horizon).
+        Assets whose inputs did not change keep their day; only affected assets, evicted assets and, when
+        budget or labor is freed, unscheduled assets go back through selection and day assignment.
+        """
+        self.budget = float(budget)
+        self.labor = dict(labor_available_per_day)
+        self.custom_allowed_days = allowed_days
+        self.strategy = strategy
+        # Warm start: see _replan
+        self.optimizer = MaintenanceOptimizer(alpha=alpha, warm_start=True, msg=False)
+
+        self.df = equipment_df.copy().set_index("equipment_id", drop=False)
+        simulate_scheduling_inputs(self.df, self._allowed_days())
+        self.df["scheduled_day"] = pd.Series(None, index=self.df.index, dtype=object)
+        self.completed = []
+        self.last_replan = {}
+
+    # -------------------------------
+    # Public API
+    # -------------------------------
+
+    def plan(self) -> pd.DataFrame:
+        """
+        Plans every asset over the whole horizon.
+        """
+        self.df["scheduled_day"] = None
+        self._replan(set(self.df.index), set(self.labor), full=True)
+        return self.schedule()
+
+    def update(self, labor: dict = None, failure_probability: dict = None, new_assets: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        Applies changed day labor, changed failure probabilities ({equipment_id: p}) and/or new assets,
+        then re-plans only the affected days and assets.
+        """
+        affected_assets, affected_days = set(), set()
+
+        for day, hours in (labor or {}).items():
+            previous = self.labor.get(day)
+            self.labor[day] = hours
+            affected_days.add(day)
+            # A day that shrank below its load releases all of its assets
+            if previous is None or hours < self._used(day):
+                affected_assets.update(self.df.index[self.df["scheduled_day"] == day])
+
+        for eid, p in (failure_probability or {}).items():
+            if eid in self.df.index:
+                self.df.at[eid, "failure_probability"] = p
+                affected_assets.add(eid)
+
+        if new_assets is not None and len(new_assets):
+            added = new_assets.copy().set_index("equipment_id", drop=False)
+            simulate_scheduling_inputs(added, self._allowed_days())
+            added["scheduled_day"] = pd.Series(None, index=added.index, dtype=object)
+            self.df = pd.concat([self.df, added[self.df.columns.intersection(added.columns)]])
+            affected_assets.update(added.index)
+
+        if affected_assets or affected_days:
+            self._replan(affected_assets, affected_days)
+        return self.schedule()
+
+    def advance(self, new_days: dict = None) -> pd.DataFrame:
+        """
+        Closes the first horizon day: its maintenance is recorded as completed and its cost spent.
+        new_days ({day: labor hours}) extends the horizon and is planned incrementally.
+        """
+        day = next(iter(self.labor))
+        done = self.df["scheduled_day"] == day
+        self.budget -= float(self.df.loc[done, "cost"].sum())
+        self.completed.append(self.df[done].assign(completed_day=day))
+        self.df = self.df[~done]
+        del self.labor[day]
+        return self.update(labor=new_days)
+
+    def schedule(self) -> pd.DataFrame:
+        """
+        All open assets with maintain, scheduled_day and expected_revenue_loss, scheduled ones first by day.
+        """
+        df = self.df.reset_index(drop=True)
+        maintain = df["scheduled_day"].notna().to_numpy()
+        df["maintain"] = maintain.astype(int)
+        df["expected_revenue_loss"] = np.where(maintain, downtime_revenue_loss(df), 0.0)
+        day_rank = df["scheduled_day"].map({day: k for k, day in enumerate(self.labor)})
+        df = df.iloc[np.lexsort((df.index.to_numpy(), day_rank.fillna(len(self.labor)).to_numpy()))]
+        df.attrs["labor_remaining_per_day"] = self.labor_remaining()
+        df.attrs["budget_remaining"] = self.budget - float(df.loc[df["maintain"] == 1, "cost"].sum())
+        df.attrs["replan"] = self.last_replan
+        return df.reset_index(drop=True)
+
+    def labor_remaining(self) -> dict:
+        return {day: hours - self._used(day) for day, hours in self.labor.items()}
+
+    # -------------------------------
+    # Re-planning
+    # -------------------------------
+
+    def _allowed_days(self) -> dict:
+        if self.custom_allowed_days:
+            return self.custom_allowed_days
+        horizon = list(self.labor)
+        return {"low": horizon, "high": horizon[1:-1] if len(horizon) > 2 else horizon}
+
+    def _used(self, day) -> float:
+        return float(self.df.loc[self.df["scheduled_day"] == day, "labor_hours"].sum())
+
+    def _replan(self, affected_assets: set, affected_days: set, full: bool = False) -> None:
+        start = time.perf_counter()
+
+        # Release the affected assets; everything else keeps its day
+        released = self.df.index.isin(list(affected_assets))
+        previously_scheduled = self.df.index[released & self.df["scheduled_day"].notna().to_numpy()]
+        self.df.loc[released, "scheduled_day"] = None
+
+        # Warm start: the first selection starts from the released assets' previous plan, which becomes the
+        # solver's starting incumbent. It is ignored when it no longer fits the remaining budget or pooled labor,
+        # and it seeds the selection only: day assignment starts over for every released asset
+        self.optimizer.last_schedule = {eid: 1 for eid in previously_scheduled}
+
+        horizon = list(self.labor)
+        allowed_days = self._allowed_days()
+        used = self.df.groupby("scheduled_day")["labor_hours"].sum()
+        capacities = np.array([self.labor[day] for day in horizon], dtype=float) \
+            - used.reindex(horizon).fillna(0).to_numpy(dtype=float)
+        budget_left = self.budget - float(self.df.loc[self.df["scheduled_day"].notna(), "cost"].sum())
+
+        # Unscheduled assets that can still fit somewhere compete for the freed budget and labor
+        pool = self.df[self.df["scheduled_day"].isna()]
+        fits = allowed_day_mask(pool["utilization_pct"].to_numpy(dtype=float), horizon, allowed_days) \
+            & (pool["labor_hours"].to_numpy(dtype=float)[:, None] <= capacities[None, :])
+        pool = pool[fits.any(axis=1) & (pool["cost"].to_numpy(dtype=float) <= budget_left)]
+        if not full:
+            pool = _candidate_pool(pool, released_ids=set(self.df.index[released]), budget_left=budget_left,
+                                   labor_left=float(capacities[capacities > 0].sum()))
+
+        stats = {"assets": int(len(pool)), "selected": 0, "scheduled": 0, "rounds": 0, "solver_stats": None}
+        # Selection uses the pooled labor; items it picks that fit no single day are dropped and the rest re-selected
+        for _ in range(PLAN_ROUNDS):
+            if pool.empty or budget_left <= 0 or not (capacities > 0).any():
+                break
+            self.optimizer.include_manpower_constraint = True
+            self.optimizer.manpower_limit = float(capacities[capacities > 0].sum())
+            selection = self.optimizer.optimize_schedule(pool.reset_index(drop=True), budget_left)
+            chosen = selection[selection["maintain"] == 1].sort_values("maintenance_order", kind="stable")
+            days, capacities = assign_days(
+                chosen["labor_hours"].to_numpy(dtype=float),
+                allowed_day_mask(chosen["utilization_pct"].to_numpy(dtype=float), horizon, allowed_days),
+                capacities,
+                self.strategy,
+            )
+            assigned = days >= 0
+            ids = chosen["equipment_id"].to_numpy()[assigned]
+            self.df.loc[ids, "scheduled_day"] = np.array(horizon, dtype=object)[days[assigned]]
+            budget_left -= float(chosen["cost"].to_numpy(dtype=float)[assigned].sum())
+
+            stats["rounds"] += 1
+            stats["selected"] += int(len(chosen))
+            stats["scheduled"] += int(assigned.sum())
+            stats["solver_stats"] = selection.attrs.get("solver_stats")
+            if assigned.all():
+                break
+            pool = pool[~pool.index.isin(chosen["equipment_id"])]
+
+        self.df["allowed_days"] = [allowed_days["low"] if u < HIGH_UTILIZATION_THRESHOLD else allowed_days["high"]
+                                   for u in self.df["utilization_pct"].to_numpy(dtype=float)]
+        stats["days"] = sorted(affected_days, key=horizon.index)
+        stats["elapsed_s"] = time.perf_counter() - start
+        self.last_replan = stats
+
+
+def _candidate_pool(pool: pd.DataFrame, released_ids: set, budget_left: float, labor_left: float) -> pd.DataFrame:
+    """
+    Released assets plus the best-ranked other unscheduled assets, enough to cover CANDIDATE_COVER times the
+    freed budget or labor. Keeps the re-planning problem proportional to the change instead of the fleet.
+    """
+    released = pool.index.isin(list(released_ids))
+    others = pool[~released]
+    if len(others) <= MIN_CANDIDATES:
+        return pool
+    value = others["failure_probability"].to_numpy(dtype=float) * (
+        others["risk_impact"].to_numpy(dtype=float) if "risk_impact" in others.columns else 1.0)
+    weight = others["cost"].to_numpy(dtype=float) / max(budget_left, 1e-9) \
+        + others["labor_hours"].to_numpy(dtype=float) / max(labor_left, 1e-9)
+    order = np.argsort(-value / np.maximum(weight, 1e-12), kind="stable")
+    cost_cover = np.cumsum(others["cost"].to_numpy(dtype=float)[order]) >= CANDIDATE_COVER * budget_left
+    labor_cover = np.cumsum(others["labor_hours"].to_numpy(dtype=float)[order]) >= CANDIDATE_COVER * labor_left
+    covered = np.flatnonzero(cost_cover | labor_cover)
+    keep = max(int(covered[0]) + 1 if len(covered) else len(order), MIN_CANDIDATES)
+    return pd.concat([pool[released], others.iloc[order[:keep]]])
@@ -4,14 +4,11 @@ import json
 import asyncio
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from typing import List, Dict, Any
 from pydantic import BaseModel, Field
-from google.genai import types
-from google.adk.agents.llm_agent import LlmAgent
-from google.adk.agents import ParallelAgent
-from google.adk.sessions import InMemorySessionService
-from google.adk.runners import Runner
-from maintenance_pipeline import run_pipeline, post_optimization_schedule
+from lazy_loading import adk_agent, lazy_attributes
+from maintenance_pipeline import run_maintenance_plan
 from read_env import *
 
 pd.set_option('display.max_columns', None)
@@ -44,44 +41,69 @@ class PostOptAgentInput(BaseModel):
     )
 
 # === LLM Agents ===
-maintenance_plan_agent = LlmAgent(
-    name="MaintenancePlanAgent",
-    model=GEMINI_MODEL,
-    instruction=(
-        "You are a maintenance plan summary expert. Use 'analysis_summary' and 'full_schedule' to provide "
-        "an insightful summary. Mention total_equipment, avg_failure_probability, high_risk_count, "
-        "total_unoptimized_risk, and insights from optimized_risk scores, cost, labor_hours, etc."
-    ),
-    description="Generates overall maintenance plan summary.",
-    input_schema=MaintenanceAgentInput,
-    output_key="maintenance_plan_for_all"
-)
+def build_maintenance_plan_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="MaintenancePlanAgent",
+        model=GEMINI_MODEL,
+        instruction=(
+            "You are a maintenance plan summary expert. Use 'analysis_summary' and 'full_schedule' to provide "
+            "an insightful summary. Mention total_equipment, avg_failure_probability, high_risk_count, "
+            "total_unoptimized_risk, and insights from optimized_risk scores, cost, labor_hours, etc."
+        ),
+        description="Generates overall maintenance plan summary.",
+        input_schema=MaintenanceAgentInput,
+        output_key="maintenance_plan_for_all"
+    )
 
-post_optimization_agent = LlmAgent(
-    name="PostOptimizationAgent",
-    model=GEMINI_MODEL,
-    instruction=(
-        "You are provided with a post-optimization summary. Generate a concise executive overview "
-        "including cost impact, ROI projections, labor efficiency, and other key insights."
-    ),
-    description="Generates summary for the optimized maintenance schedule.",
-    input_schema=PostOptAgentInput,
-    output_key="maintenance_details_of_maintained"
-)
+def build_post_optimization_agent():
+    return adk_agent(
+        "LlmAgent",
+        name="PostOptimizationAgent",
+        model=GEMINI_MODEL,
+        instruction=(
+            "You are provided with a post-optimization summary. Generate a concise executive overview "
+            "including cost impact, ROI projections, labor efficiency, and other key insights."
+        ),
+        description="Generates summary for the optimized maintenance schedule.",
+        input_schema=PostOptAgentInput,
+        output_key="maintenance_details_of_maintained"
+    )
 
 # === Agent Orchestration ===
-parallel_agent = ParallelAgent(
-    name="ParallelMaintenanceAgent",
-    sub_agents=[maintenance_plan_agent, post_optimization_agent],
-    description="Runs maintenance summary and post-optimization agents in parallel."
-)
+def build_parallel_agent():
+    return adk_agent(
+        "ParallelAgent",
+        name="ParallelMaintenanceAgent",
+        sub_agents=[build_maintenance_plan_agent(), build_post_optimization_agent()],
+        description="Runs maintenance summary and post-optimization agents in parallel."
+    )
 
 # === Pipeline Execution ===
-results = run_pipeline(DATASET_PATH, BUDGET)
-analysis_summary = results["analysis_summary"]
-full_schedule = results["full_schedule"]
-plan_schedule_df = results["plan_schedule_df"]
-post_optimization_results = post_optimization_schedule(plan_schedule_df, LABOR_LIMITS)
-post_summary = post_optimization_results["summary"]
-clean_summary = {k: (int(v) if isinstance(v, np.integer) else v) for k, v in post_summary.items()}
+@lru_cache(maxsize=1)
+def maintenance_results():
+    """
+    Plan for DATASET_PATH, BUDGET and LABOR_LIMITS, computed on first use instead of at import.
+    """
+    results = run_maintenance_plan(DATASET_PATH, BUDGET, LABOR_LIMITS)
+    post_optimization_results = results["post_optimization"]
+    post_summary = post_optimization_results["summary"]
+    return {
+        "results": results,
+        "analysis_summary": results["analysis_summary"],
+        "full_schedule": results["full_schedule"],
+        "plan_schedule_df": results["plan_schedule_df"],
+        "post_optimization_results": post_optimization_results,
+        "post_summary": post_summary,
+        "clean_summary": {k: (int(v) if isinstance(v, np.integer) else v) for k, v in post_summary.items()},
+    }
 
+# Agents and plan results are built on first access, so importing this module does no work
+__getattr__ = lazy_attributes(__name__, {
+    "maintenance_plan_agent": build_maintenance_plan_agent,
+    "post_optimization_agent": build_post_optimization_agent,
+    "parallel_agent": build_parallel_agent,
+    **{name: (lambda name=name: maintenance_results()[name])
+       for name in ["results", "analysis_summary", "full_schedule", "plan_schedule_df",
+                    "post_optimization_results", "post_summary", "clean_summary"]},
+})
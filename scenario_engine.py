@@ -0,0 +1,91 @@
+# scenario_engine.py
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from maintenance_pipeline import run_pipeline, post_optimization_schedule, DEFAULT_ALPHA, DEFAULT_SEED
+
+# -------------------------------
+# Function: scenario_grid
+# -------------------------------
+
+def scenario_grid(budgets, labor_options, alphas=(DEFAULT_ALPHA,)) -> list:
+    """
+    Every (budget, labor limits, alpha) combination as {"budget", "labor", "alpha"} dicts.
+    labor_options is a list of {day: hours} dicts.
+    """
+    return [{"budget": budget, "labor": dict(labor), "alpha": alpha}
+            for budget, labor, alpha in itertools.product(budgets, labor_options, alphas)]
+
+# -------------------------------
+# Function: evaluate_scenarios
+# -------------------------------
+
+def evaluate_scenarios(file_path: str, scenarios: list, mode: str = "sequential", strategy: str = "first_fit",
+                       seed: int = DEFAULT_SEED, probability_source: str = None, max_workers: int = None) -> pd.DataFrame:
+    """
+    Runs run_pipeline + post_optimization_schedule for each scenario and returns one comparison row per scenario:
+    optimized risk, maintenance cost, revenue loss, maintained and unassigned counts, labor left.
+
+    In the sequential and decomposed modes labor only affects the day assignment, so scenarios sharing
+    (budget, alpha) share one selection solve and only re-run the scheduling. The groups run in a process pool.
+    Scheduling inputs are seeded, so a row matches run_maintenance_plan for the same configuration.
+    """
+    start = time.perf_counter()
+    groups = {}
+    for index, scenario in enumerate(scenarios):
+        labor_key = tuple(scenario["labor"].items()) if mode == "joint" else None
+        key = (float(scenario["budget"]), float(scenario.get("alpha", DEFAULT_ALPHA)), labor_key)
+        groups.setdefault(key, []).append((index, scenario["labor"]))
+
+    tasks = [(file_path, budget, alpha, members, mode, strategy, seed, probability_source)
+             for (budget, alpha, _), members in groups.items()]
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(tasks)))
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(_evaluate_group, tasks))
+    else:
+        parts = [_evaluate_group(task) for task in tasks]
+
+    table = pd.DataFrame([row for part in parts for row in part]).sort_values("scenario").reset_index(drop=True)
+    table.attrs["solves"] = len(tasks)
+    table.attrs["workers"] = workers
+    table.attrs["elapsed_s"] = time.perf_counter() - start
+    return table
+
+
+def _evaluate_group(task) -> list:
+    """
+    One selection solve and the day schedule of each labor option in the group; runs in a worker process.
+    """
+    file_path, budget, alpha, members, mode, strategy, seed, probability_source = task
+    rows = []
+    results = None
+    for index, labor in members:
+        if results is None or mode == "joint":
+            results = run_pipeline(file_path, budget, mode=mode, labor_available_per_day=labor,
+                                   probability_source=probability_source, alpha=alpha, seed=seed)
+        post = results.get("post_optimization") or post_optimization_schedule(
+            results["plan_schedule_df"], labor, strategy, seed=seed)
+        summary = post["summary"]
+        schedule_df = post["schedule_df"]
+        row = {
+            "scenario": index,
+            "budget": budget,
+            "alpha": alpha,
+            "labor_total": sum(labor.values()),
+            **{f"labor_{day}": hours for day, hours in labor.items()},
+            "optimized_risk": results["plan_summary"]["optimized_risk"],
+            "maintenance_cost": float(summary["total_maintenance_cost"]),
+            "revenue_loss": float(summary["total_revenue_loss"]),
+            "maintained": summary["maintenance_count"],
+            "unassigned": int((schedule_df["scheduled_day"] == "Unassigned").sum()),
+            "labor_left": float(sum(summary["labor_remaining_per_day"].values())),
+            "solution_status": results["plan_summary"]["solution_status"],
+        }
+        rows.append(row)
+    return rows
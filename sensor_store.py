@@ -0,0 +1,151 @@
+# sensor_store.py
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from dataset_loader import load_dataset, file_fingerprint
+
+INDEX_KEYS = ["Line", "Part", "Parameter"]
+# Historical_data columns kept in the store; rows_for_parts hands whole readings on to the breach reports
+SENSOR_COLUMNS = ["Start", "End", "Cycle", "Line", "Equipment", "Part", "Parameter",
+                  "Expected_value_min", "Expected_value_max", "Value", "Date"]
+
+# -------------------------------
+# Class: SensorSeriesStore
+# -------------------------------
+
+class SensorSeriesStore:
+    def __init__(self, historical_df: pd.DataFrame):
+        """
+        Array-backed store of Historical_data readings sorted by (Line, Part, Parameter, Cycle).
+
+        Each (line, part, parameter) series occupies one contiguous [start, stop) block, recorded in
+        an offset index, so a series lookup is a dict hit plus array slicing and returns NumPy views.
+        """
+        codes = [pd.factorize(historical_df[col], sort=True)[0] for col in INDEX_KEYS]
+        order = np.lexsort([historical_df["Cycle"].to_numpy()] + codes[::-1])
+        self._build(historical_df.iloc[order].reset_index(drop=True))
+
+    def _build(self, frame: pd.DataFrame) -> None:
+        """
+        Sets the column arrays and offset index for a frame already grouped by series and sorted by cycle.
+        """
+        self.frame = frame
+        self.cycle = frame["Cycle"].to_numpy()
+        self.value = frame["Value"].to_numpy(dtype=float)
+        self.expected_min = frame["Expected_value_min"].to_numpy(dtype=float)
+        self.expected_max = frame["Expected_value_max"].to_numpy(dtype=float)
+        self.date = pd.to_datetime(frame["Date"], errors="coerce", dayfirst=True).to_numpy() \
+            if "Date" in frame.columns else np.full(len(frame), np.datetime64("NaT"))
+
+        # Offset index: block boundaries where any key changes
+        boundary = np.zeros(len(frame), dtype=bool)
+        boundary[:1] = True
+        for col in INDEX_KEYS:
+            codes = pd.factorize(frame[col])[0]
+            boundary[1:] |= codes[1:] != codes[:-1]
+        starts = np.flatnonzero(boundary)
+        stops = np.append(starts[1:], len(frame))
+        key_rows = frame.loc[starts, INDEX_KEYS].itertuples(index=False, name=None)
+
+        self.index = {}
+        self.part_index = {}
+        for key, start, stop in zip(key_rows, starts.tolist(), stops.tolist()):
+            self.index[key] = (start, stop)
+            self.part_index.setdefault(key[1], []).append(key)
+
+    def append(self, batch_df: pd.DataFrame) -> list:
+        """
+        Inserts new readings without re-sorting the store and returns the (line, part, parameter) keys touched.
+
+        Rows of existing series are placed by binary search on cycle within their block; rows of new
+        series are appended as new blocks at the end. Costs one O(n) copy instead of an O(n log n) sort.
+        """
+        if batch_df.empty:
+            return []
+        batch = batch_df.sort_values(INDEX_KEYS + ["Cycle"], kind="stable")
+        positions = np.empty(len(batch), dtype=np.int64)
+        touched = []
+        offset = 0
+        for key, group in batch.groupby(INDEX_KEYS, sort=False, observed=True):
+            key = tuple(key)
+            count = len(group)
+            if key in self.index:
+                start, stop = self.index[key]
+                positions[offset:offset + count] = start + np.searchsorted(
+                    self.cycle[start:stop], group["Cycle"].to_numpy(), "right")
+            else:
+                positions[offset:offset + count] = len(self.frame)
+            touched.append(key)
+            offset += count
+
+        # New rows grouped by key, ordered by target position (stable keeps new-series blocks together)
+        new_order = np.argsort(positions, kind="stable")
+        merged_order = np.insert(np.arange(len(self.frame)), positions[new_order],
+                                 len(self.frame) + new_order)
+        combined = pd.concat([self.frame, batch[self.frame.columns]], ignore_index=True)
+        self._build(combined.iloc[merged_order].reset_index(drop=True))
+        return touched
+
+    @classmethod
+    def from_dataset(cls, name_or_path: str = "historical") -> "SensorSeriesStore":
+        """
+        Returns the store for a dataset, rebuilt only when the dataset content changes.
+        """
+        return _cached_store(name_or_path, file_fingerprint(name_or_path))
+
+    def keys(self, line: str = None, part: str = None) -> list:
+        """
+        Lists (line, part, parameter) series keys, optionally restricted to a line and/or part.
+        """
+        keys = self.part_index.get(part, []) if part is not None else self.index.keys()
+        return [k for k in keys if line is None or k[0] == line]
+
+    def parameters(self, line: str, part: str) -> list:
+        return [k[2] for k in self.keys(line=line, part=part)]
+
+    def bounds(self, line: str, part: str, parameter: str, cycles: tuple = None, dates: tuple = None) -> tuple:
+        """
+        Row range [start, stop) of a series, narrowed by an inclusive cycle or date range via binary search.
+        Date ranges assume dates increase with cycle within a series.
+        """
+        start, stop = self.index.get((line, part, parameter), (0, 0))
+        if cycles is not None:
+            lo, hi = cycles
+            block = self.cycle[start:stop]
+            start, stop = start + np.searchsorted(block, lo, "left"), start + np.searchsorted(block, hi, "right")
+        if dates is not None:
+            lo, hi = np.datetime64(pd.Timestamp(dates[0])), np.datetime64(pd.Timestamp(dates[1]))
+            block = self.date[start:stop]
+            start, stop = start + np.searchsorted(block, lo, "left"), start + np.searchsorted(block, hi, "right")
+        return int(start), int(stop)
+
+    def series(self, line: str, part: str, parameter: str, cycles: tuple = None, dates: tuple = None) -> dict:
+        """
+        Zero-copy NumPy views of one series: cycle, value, expected_min, expected_max and date.
+        """
+        start, stop = self.bounds(line, part, parameter, cycles, dates)
+        return {
+            "cycle": self.cycle[start:stop],
+            "value": self.value[start:stop],
+            "expected_min": self.expected_min[start:stop],
+            "expected_max": self.expected_max[start:stop],
+            "date": self.date[start:stop],
+        }
+
+    def rows_for_parts(self, parts) -> pd.DataFrame:
+        """
+        All readings of the given parts (on every line) as a DataFrame, without scanning the table.
+        """
+        blocks = [self.index[k] for part in parts for k in self.part_index.get(part, [])]
+        if not blocks:
+            return self.frame.iloc[0:0]
+        rows = np.concatenate([np.arange(start, stop) for start, stop in sorted(blocks)])
+        return self.frame.iloc[rows]
+
+
+@lru_cache(maxsize=4)
+def _cached_store(name_or_path: str, fingerprint: str) -> SensorSeriesStore:
+    return SensorSeriesStore(load_dataset(name_or_path, columns=SENSOR_COLUMNS))
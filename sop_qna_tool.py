@@ -1,22 +1,27 @@
-from PyPDF2 import PdfReader
-from langchain.text_splitter import CharacterTextSplitter
-from langchain.schema import Document
-from langchain.vectorstores import FAISS
-from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough
-from vertexai import init
-from langchain_core.output_parsers import StrOutputParser
-from google.adk.agents import Agent
+import os
+from functools import lru_cache
+from lazy_loading import adk_agent, lazy_attributes
 from read_env import *
 
-# # Initialize Vertex AI
-init(project="certain-mystery-305507", location="us-central1") 
+# PyPDF2, langchain, FAISS and Vertex AI are imported the first time the tool runs
+SOP_PDF_PATH = "SOP_Document/SOP_Document.pdf"
+VERTEX_PROJECT = "certain-mystery-305507"
+VERTEX_LOCATION = "us-central1"
+
+
+@lru_cache(maxsize=1)
+def init_vertexai():
+    """
+    Initializes Vertex AI once per process.
+    """
+    from vertexai import init
+    init(project=VERTEX_PROJECT, location=VERTEX_LOCATION)
 
 def load_pdf_text(file_path):
     """
     Extracts all text from a PDF file.
     """
+    from PyPDF2 import PdfReader
     reader = PdfReader(file_path)
     return "\n".join(page.extract_text() for page in reader.pages if page.extract_text())
 
@@ -24,6 +29,7 @@ def chunk_text(text, chunk_size=1000, chunk_overlap=200):
     """
     Splits long text into smaller overlapping chunks.
     """
+    from langchain.text_splitter import CharacterTextSplitter
     splitter = CharacterTextSplitter(separator="\n", chunk_size=chunk_size, chunk_overlap=chunk_overlap)
     return splitter.split_text(text)
 
@@ -31,12 +37,21 @@ def chunk_text(text, chunk_size=1000, chunk_overlap=200):
 def format_docs(docs):
     return "\n\n".join(doc.page_content for doc in docs)
 
-def get_parts_usage_tool(part_names: list[str]) -> list[dict]:
+@lru_cache(maxsize=2)
+def build_qa_chain(pdf_path, version):
     """
-    Given a list of part names, returns their usage from the SOP PDF.
+    Retrieval QA chain over the SOP PDF. Cached per process and PDF version (mtime and size),
+    so the embeddings and FAISS index are built once instead of on every tool call.
     """
+    from langchain.schema import Document
+    from langchain.vectorstores import FAISS
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.runnables import RunnablePassthrough
+    from langchain_core.output_parsers import StrOutputParser
+
+    init_vertexai()
     # Load and chunk the text
-    pdf_path = "SOP_Document/SOP_Document.pdf"
     text = load_pdf_text(pdf_path)
     doc_chunks = chunk_text(text)
     documents = [Document(page_content=chunk) for chunk in doc_chunks]
@@ -57,13 +72,20 @@ Context:
 Question:
 {question}"""
     )
-    qa_chain = (
+    return (
         {"context": retriever | format_docs, "question": RunnablePassthrough()}
         | prompt
         | llm
         | StrOutputParser()
     )
 
+def get_parts_usage_tool(part_names: list[str]) -> list[dict]:
+    """
+    Given a list of part names, returns their usage from the SOP PDF.
+    """
+    stat = os.stat(SOP_PDF_PATH)
+    qa_chain = build_qa_chain(SOP_PDF_PATH, (stat.st_mtime_ns, stat.st_size))
+
     # Helper function
     def get_single_part_usage(part_name):
         query = f"""
@@ -93,10 +115,12 @@ What is the usage of this part in the machine?
     return results
 
 
-part_usage_agent = Agent(
-    model='gemini-2.0-flash',
-    name='part_usage_agent',
-    instruction="""
+def build_part_usage_agent():
+    return adk_agent(
+        "Agent",
+        model='gemini-2.0-flash',
+        name='part_usage_agent',
+        instruction="""
 You are an agent specialized in retrieving the usage of parts used in machinery.
 Use the tool to fetch usage of parts from SOP.
 Return the result strictly in the following JSON array format:
@@ -108,6 +132,11 @@ Return the result strictly in the following JSON array format:
   ...
 ]
 """,
-    description='This agent retrieves part usage information from the SOP document.',
-    tools=[get_parts_usage_tool],
-)
+        description='This agent retrieves part usage information from the SOP document.',
+        tools=[get_parts_usage_tool],
+    )
+
+# The agent is built on first access, so importing this module does no work
+__getattr__ = lazy_attributes(__name__, {
+    "part_usage_agent": build_part_usage_agent,
+})
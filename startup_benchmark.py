@@ -0,0 +1,145 @@
+# startup_benchmark.py
+#
+# Measures what the dashboard pays before the first page renders: the import time of every module UI.py
+# pulls in, each in a fresh interpreter, and the cost of first use (building the agents, the maintenance plan).
+#
+#   python startup_benchmark.py                     # this tree
+#   python startup_benchmark.py --path ../old_tree  # e.g. a `git worktree` of an older revision, to compare
+#   python startup_benchmark.py --json startup.json
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules imported by UI.py and pages/Spare Parts And Inventory.py, then the pipeline modules behind them
+STARTUP_MODULES = [
+    "pipeline_jobs",
+    "agent_pipeline",
+    "adk_riskAnalysisWorkflow",
+    "SummarizationTool",
+    "ResponseProcessing",
+    "sample_final",
+    "sop_qna_tool",
+    "adk_inventoryTool",
+]
+
+# Work the first pipeline run triggers; each snippet runs after its module is imported
+FIRST_USE = {
+    "final_pipeline_agent": ("adk_riskAnalysisWorkflow", "adk_riskAnalysisWorkflow.build_final_pipeline_agent()"),
+    "summary_agents": ("SummarizationTool", "SummarizationTool.build_summarization_parallel_alert_agent()"),
+    "maintenance_plan": ("sample_final", "sample_final.maintenance_results()"),
+}
+
+# Largest self-time imports listed per module
+TOP_IMPORTS = 5
+
+# -------------------------------
+# Function: import_time
+# -------------------------------
+
+def import_time(module: str, path: str = ".", repeat: int = 3) -> dict:
+    """
+    Imports module in `repeat` fresh interpreters run from path. The first run is the cold start
+    (bytecode and OS file caches as found), the median of the others the warm one.
+    Also returns the cumulative import time Python reports (-X importtime) and the heaviest imports.
+    """
+    walls, cumulative, heaviest, error = [], [], [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              cwd=path, capture_output=True, text=True)
+        walls.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+            break
+        rows = _importtime_rows(proc.stderr)
+        cumulative.append(next((c for _, c, name in rows if name == module), 0) / 1e6)
+        heaviest = sorted(rows, reverse=True)[:TOP_IMPORTS]
+    return {
+        "module": module,
+        "cold_s": walls[0],
+        "warm_s": statistics.median(walls[1:]) if len(walls) > 1 else walls[0],
+        "import_s": statistics.median(cumulative) if cumulative else None,
+        "heaviest": [{"module": name, "self_s": own / 1e6} for own, _, name in heaviest],
+        "error": error,
+    }
+
+
+def _importtime_rows(stderr: str) -> list:
+    """
+    (self us, cumulative us, module) rows of -X importtime output.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(own), int(cumulative), name.strip()))
+    return rows
+
+# -------------------------------
+# Function: first_use_time
+# -------------------------------
+
+def first_use_time(name: str, path: str = ".") -> dict:
+    """
+    Seconds the FIRST_USE step takes after its module is imported, in a fresh interpreter.
+    """
+    module, statement = FIRST_USE[name]
+    code = (f"import time, json, {module}\n"
+            f"start = time.perf_counter()\n"
+            f"{statement}\n"
+            f"print(json.dumps(time.perf_counter() - start))")
+    proc = subprocess.run([sys.executable, "-c", code], cwd=path, capture_output=True, text=True)
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+        return {"step": name, "elapsed_s": None, "error": error}
+    return {"step": name, "elapsed_s": json.loads(proc.stdout.strip().splitlines()[-1]), "error": None}
+
+# -------------------------------
+# Function: run_benchmark
+# -------------------------------
+
+def run_benchmark(path: str = ".", repeat: int = 3, modules: list = None, first_use: bool = True) -> dict:
+    """
+    Import and first-use timings for the tree at path.
+    """
+    path = os.path.abspath(path)
+    results = {"path": path, "python": sys.version.split()[0], "imports": [], "first_use": []}
+    for module in modules or STARTUP_MODULES:
+        row = import_time(module, path, repeat)
+        results["imports"].append(row)
+        if row["error"]:
+            print(f"{module:<26} failed: {row['error']}")
+            continue
+        heaviest = ", ".join(f"{h['module']} {h['self_s']:.2f}s" for h in row["heaviest"][:3])
+        print(f"{module:<26} cold {row['cold_s']:6.2f}s  warm {row['warm_s']:6.2f}s  "
+              f"import {row['import_s']:6.2f}s  [{heaviest}]")
+    if first_use:
+        for name in FIRST_USE:
+            row = first_use_time(name, path)
+            results["first_use"].append(row)
+            if row["error"]:
+                print(f"first use {name:<16} failed: {row['error']}")
+            else:
+                print(f"first use {name:<16} {row['elapsed_s']:6.2f}s")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dashboard import and cold start benchmark.")
+    parser.add_argument("--path", default=".", help="tree to benchmark (default: this one)")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per module")
+    parser.add_argument("--modules", nargs="+", help=f"modules to import (default: {' '.join(STARTUP_MODULES)})")
+    parser.add_argument("--no-first-use", action="store_true", help="only time the imports")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.path, args.repeat, args.modules, not args.no_first_use)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
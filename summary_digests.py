@@ -0,0 +1,121 @@
+# summary_digests.py
+
+import pandas as pd
+
+# Columns each digest needs; frames without them (e.g. unparsed agent output) are sent as plain records
+BREACH_COLUMNS = {"Part", "Parameter", "Cycle", "Value", "Expected_value_min", "Expected_value_max"}
+DIGITAL_LOG_COLUMNS = {"part", "failures"}
+SUPPLIER_COLUMNS = {"Part", "Supplier", "Historical_OTD", "Historical_quality_rate"}
+
+# -------------------------------
+# Function: digest_parameter_breaches
+# -------------------------------
+
+def digest_parameter_breaches(exceeded_df: pd.DataFrame) -> dict:
+    """
+    Condenses threshold-breaching sensor rows into one entry per (part, parameter).
+    """
+    if exceeded_df.empty:
+        return {"total_breaches": 0, "breaches": []}
+    if not BREACH_COLUMNS <= set(exceeded_df.columns):
+        return _records(exceeded_df)
+
+    columns = ["Part", "Parameter", "Cycle", "Value", "Expected_value_min", "Expected_value_max", "Breach_run_length"]
+    df = exceeded_df[[c for c in columns if c in exceeded_df.columns]].copy()
+    df["high"] = df["Value"] > df["Expected_value_max"]
+    df["low"] = df["Value"] < df["Expected_value_min"]
+    df["deviation"] = (df["Value"] - df["Expected_value_max"]).where(df["high"], df["Expected_value_min"] - df["Value"])
+
+    grouped = df.groupby(["Part", "Parameter"], observed=True, sort=False)
+    digest = grouped.agg(
+        breaches=("Value", "size"),
+        high=("high", "sum"),
+        low=("low", "sum"),
+        max_deviation=("deviation", "max"),
+        min_value=("Value", "min"),
+        max_value=("Value", "max"),
+        expected_min=("Expected_value_min", "first"),
+        expected_max=("Expected_value_max", "first"),
+        first_cycle=("Cycle", "min"),
+        last_cycle=("Cycle", "max"),
+        **({"longest_run": ("Breach_run_length", "max")} if "Breach_run_length" in df.columns else {}),
+    ).reset_index()
+    digest["direction"] = "both"
+    digest.loc[digest["low"] == 0, "direction"] = "too high"
+    digest.loc[digest["high"] == 0, "direction"] = "too low"
+    digest["max_deviation"] = digest["max_deviation"].round(2)
+    digest = digest.sort_values("breaches", ascending=False)
+
+    return {
+        "total_breaches": int(len(df)),
+        "breaches": _records(digest),
+    }
+
+# -------------------------------
+# Function: digest_digital_log
+# -------------------------------
+
+def digest_digital_log(digital_log_df: pd.DataFrame) -> dict:
+    """
+    Reduces per-part log tallies to counts and ratios, dropping the free-text summaries.
+    """
+    if digital_log_df.empty:
+        return {"total_failures": 0, "parts": []}
+    if not DIGITAL_LOG_COLUMNS <= set(digital_log_df.columns):
+        return _records(digital_log_df)
+
+    counts = ["failures", "repairs", "replacements", "maintenance_due"]
+    df = digital_log_df[["part"] + [c for c in counts if c in digital_log_df.columns]].copy()
+    failures = df["failures"].where(df["failures"] > 0)
+    if "repairs" in df.columns:
+        df["repair_ratio"] = (df["repairs"] / failures).fillna(0).round(2)
+    if "replacements" in df.columns:
+        df["replacement_ratio"] = (df["replacements"] / failures).fillna(0).round(2)
+    df = df.sort_values("failures", ascending=False)
+
+    return {
+        "total_failures": int(df["failures"].sum()),
+        "most_failing_part": df["part"].iloc[0],
+        "parts": _records(df),
+    }
+
+# -------------------------------
+# Function: digest_supplier_info
+# -------------------------------
+
+def digest_supplier_info(supplier_df: pd.DataFrame) -> dict:
+    """
+    Summarizes supplier spread per part: supplier count, best performers and OTD/quality ranges.
+    """
+    if supplier_df.empty:
+        return {"parts": []}
+    if not SUPPLIER_COLUMNS <= set(supplier_df.columns):
+        return _records(supplier_df)
+
+    grouped = supplier_df.groupby("Part", observed=True, sort=False)
+    digest = grouped.agg(
+        suppliers=("Supplier", "nunique"),
+        otd_min=("Historical_OTD", "min"),
+        otd_max=("Historical_OTD", "max"),
+        quality_min=("Historical_quality_rate", "min"),
+        quality_max=("Historical_quality_rate", "max"),
+    )
+    digest["best_otd_supplier"] = supplier_df.loc[grouped["Historical_OTD"].idxmax(), "Supplier"].values
+    digest["best_quality_supplier"] = supplier_df.loc[grouped["Historical_quality_rate"].idxmax(), "Supplier"].values
+    digest["single_supplier"] = digest["suppliers"] == 1
+    digest = digest.reset_index()
+
+    return {
+        "single_supplier_parts": digest.loc[digest["single_supplier"], "Part"].tolist(),
+        "parts": _records(digest),
+    }
+
+
+def _records(df: pd.DataFrame) -> list:
+    """
+    JSON-safe records (numpy scalars converted to Python types).
+    """
+    return [
+        {k: (v.item() if hasattr(v, "item") else v) for k, v in row.items()}
+        for row in df.to_dict(orient="records")
+    ]
@@ -0,0 +1,12 @@
+import os
+import sys
+import types
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# read_env only exports API keys; checkouts without one can still import the modules under test
+try:
+    import read_env  # noqa: F401
+except ImportError:
+    sys.modules["read_env"] = types.ModuleType("read_env")
@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from breach_analytics import flag_breaches, find_parameter_breaches
+
+
+def _series(cycles, values, parameter="Temperature"):
+    return pd.DataFrame({
+        "Line": "Line 1", "Equipment": "Dryer", "Part": "Fan", "Parameter": parameter,
+        "Cycle": cycles, "Value": values, "Expected_value_min": 0.0, "Expected_value_max": 10.0,
+    })
+
+
+def test_missing_cycle_ends_a_breach_run():
+    df = _series([1, 2, 4, 5, 6], [11, 12, 13, 14, 15])
+    assert flag_breaches(df)["run_length"].tolist() == [2, 2, 3, 3, 3]
+
+
+def test_rows_without_parameter_are_ignored():
+    df = pd.concat([_series([1, 2], [11, 5]), _series([1], [20], parameter=np.nan)], ignore_index=True)
+    breaches = find_parameter_breaches(df, pd.DataFrame({"part": ["Fan"]}))
+    assert breaches["Parameter"].tolist() == ["Temperature"]
+    assert breaches["Value"].tolist() == [11]
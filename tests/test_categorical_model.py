@@ -0,0 +1,41 @@
+import os
+
+import pandas as pd
+
+from conftest import REPO_ROOT
+from categorical_model import domain_codes, load_shared, shared_vocabulary, to_shared_categories
+
+
+def test_shared_values_have_the_same_code_in_every_dataset(tmp_path, monkeypatch):
+    os.symlink(os.path.join(REPO_ROOT, "datasets"), tmp_path / "datasets")
+    monkeypatch.chdir(tmp_path)
+    components = load_shared("line_components")
+    historical = load_shared("historical")
+    assert components["part"].dtype == historical["Part"].dtype
+    assert components["line"].dtype == historical["Line"].dtype
+
+    part = historical["Part"].iloc[0]
+    code = domain_codes(historical["Part"])[0]
+    assert (domain_codes(components["part"])[(components["part"] == part).to_numpy()] == code).all()
+    # Codes round-trip to the original values
+    expected = pd.read_csv(os.path.join(REPO_ROOT, "datasets", "Line_components_new.csv"))["part"].astype(str)
+    assert components["part"].astype(str).tolist() == expected.tolist()
+
+
+def test_unseen_values_leave_the_cached_vocabulary_unchanged(tmp_path, monkeypatch):
+    os.symlink(os.path.join(REPO_ROOT, "datasets"), tmp_path / "datasets")
+    monkeypatch.chdir(tmp_path)
+    before = shared_vocabulary()["part"].categories.tolist()
+    cast = to_shared_categories(pd.DataFrame({"part": ["Not A Real Part"]}))
+    assert cast["part"].cat.categories[-1] == "Not A Real Part"
+    assert shared_vocabulary()["part"].categories.tolist() == before
+    assert load_shared("line_components")["part"].cat.categories.tolist() == before
+
+
+def test_unseen_values_extend_the_vocabulary_without_moving_codes():
+    vocabulary = {"part": pd.CategoricalDtype(["Bearing", "Fan"])}
+    first = to_shared_categories(pd.DataFrame({"Part": ["Fan", "Bearing"]}), vocabulary)
+    second = to_shared_categories(pd.DataFrame({"part": ["Seal", "Fan", None]}), vocabulary)
+    assert domain_codes(first["Part"]).tolist() == [1, 0]
+    assert domain_codes(second["part"]).tolist() == [2, 1, -1]
+    assert second["part"].cat.categories.tolist() == ["Bearing", "Fan", "Seal"]
@@ -0,0 +1,25 @@
+import os
+
+import dataset_loader
+
+
+def test_cache_updates_keep_other_entries_and_old_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    first, second = tmp_path / "first.csv", tmp_path / "second.csv"
+    first.write_text("a,b\n1,x\n")
+    second.write_text("a,b\n2,y\n")
+
+    # Two loaders that read the manifest before either one wrote it
+    stale = dataset_loader._load_manifest()
+    dataset_loader._build_cache(str(first), dict(stale))
+    dataset_loader._build_cache(str(second), dict(stale))
+    manifest = dataset_loader._load_manifest()
+    assert {str(first), str(second)} <= set(manifest)
+
+    old_parquet = manifest[str(first)]["parquet"]
+    first.write_text("a,b\n3,z\n")
+    assert dataset_loader.load_dataset(str(first))["a"].tolist() == [3]
+    new_parquet = dataset_loader._load_manifest()[str(first)]["parquet"]
+    assert new_parquet != old_parquet
+    # A reader may still have the superseded file open
+    assert os.path.exists(old_parquet)
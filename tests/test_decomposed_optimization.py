@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from decomposed_optimization import solve_decomposed
+from maintenance_pipeline import MaintenanceOptimizer
+
+
+def _plant():
+    return pd.DataFrame({
+        "equipment_id": ["A1", "A2", "B1", "B2"],
+        "line": ["A", "A", "B", "B"],
+        "cost": [60, 50, 50, 40],
+        "failure_probability": [0.9, 0.5, 0.6, 0.3],
+        "risk_impact": [1.0, 1.0, 1.0, 1.0],
+        "labor_hours": [1, 1, 1, 1],
+    })
+
+
+def test_merged_plan_is_feasible_unless_it_reaches_the_bound():
+    optimizer = MaintenanceOptimizer(alpha=0.0)
+    out = solve_decomposed(optimizer, _plant(), 100, max_workers=1, compare_monolithic=False)
+    stats = out.attrs["decomposition"]
+    assert out["solution_status"].iloc[0] == "Feasible"
+    assert stats["gap"] > 0
+    assert stats["bound"] <= stats["objective"]
+    assert "monolithic_objective" not in stats
+
+
+def test_merged_plan_is_optimal_when_everything_fits():
+    optimizer = MaintenanceOptimizer(alpha=0.0)
+    out = solve_decomposed(optimizer, _plant(), 1000, max_workers=1)
+    stats = out.attrs["decomposition"]
+    assert out["solution_status"].iloc[0] == "Optimal"
+    assert stats["gap"] == 0
+    assert stats["monolithic_gap"] == 0
+
+
+@pytest.mark.parametrize("budget,manpower_limit", [(600, None), (1000, 60), (1500, 60)])
+def test_merged_plan_matches_the_plant_wide_plan(budget, manpower_limit):
+    # Four lines sharing the budget (and a binding labor pool): the merged plan must be within 0.1% of the
+    # plant-wide optimum in total optimized risk
+    rng = np.random.default_rng(7)
+    n = 40
+    plant = pd.DataFrame({
+        "equipment_id": [f"E{i}" for i in range(n)],
+        "line": [f"L{i % 4}" for i in range(n)],
+        "cost": rng.integers(20, 120, n),
+        "failure_probability": rng.uniform(0.05, 0.95, n).round(3),
+        "risk_impact": rng.uniform(0.5, 3, n).round(2),
+        "labor_hours": rng.integers(2, 12, n),
+    })
+    optimizer = MaintenanceOptimizer(alpha=0.1, include_manpower_constraint=manpower_limit is not None,
+                                     manpower_limit=manpower_limit, msg=False)
+    out = solve_decomposed(optimizer, plant, budget, max_workers=1)
+    stats = out.attrs["decomposition"]
+    assert stats["monolithic_gap"] <= 1e-3
+    assert out.loc[out["maintain"] == 1, "cost"].sum() <= budget
+    if manpower_limit is not None:
+        assert out.loc[out["maintain"] == 1, "labor_hours"].sum() <= manpower_limit
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+import failure_model
+from failure_model import apply_probability_source, failure_probabilities, fit_failure_model
+
+
+def _logs():
+    # Two part types on two lines; "Bearing" fails five times as often as "Seal" over the log window
+    line_components = pd.DataFrame({
+        "line": ["Line 1", "Line 1", "Line 2", "Line 2"],
+        "part": ["Bearing", "Seal", "Bearing", "Seal"],
+        "age": [4, 6, 8, 10],
+        "max_age": [12.0] * 4,
+    })
+    dates = pd.date_range("2024-01-01", periods=60, freq="D").strftime("%d-%m-%Y")
+    rows = [("Line 1", "Bearing")] * 25 + [("Line 2", "Bearing")] * 25 + [("Line 1", "Seal")] * 5 + \
+        [("Line 2", "Seal")] * 5
+    digital_log = pd.DataFrame(rows, columns=["Line", "Part"]).assign(Date=dates[:len(rows)])
+    return line_components, digital_log
+
+
+def test_weibull_fit_ranks_part_types_by_failures():
+    line_components, digital_log = _logs()
+    model = fit_failure_model(line_components, digital_log)
+    assert model["beta"] in failure_model.BETA_GRID
+    assert model["window_days"] == 60
+    assert model["parts"]["Bearing"]["failures"] == 50
+    assert model["parts"]["Seal"]["failures"] == 10
+    assert model["parts"]["Bearing"]["rate"] > model["parts"]["Seal"]["rate"]
+
+
+def test_wear_out_shape_raises_failure_probability_with_age():
+    line_components, digital_log = _logs()
+    model = fit_failure_model(line_components, digital_log, beta=2.0)
+    assert model["beta"] == 2.0
+    components = pd.DataFrame({"part": ["Bearing"] * 4 + ["Seal"], "age": [1, 4, 7, 10, 7]})
+    probabilities = failure_probabilities(components, model)
+    assert ((probabilities > 0) & (probabilities < 1)).all()
+    assert (np.diff(probabilities[:4]) > 0).all()
+    assert probabilities[2] > probabilities[4]
+
+
+def test_fitted_source_falls_back_to_static_without_logs(monkeypatch):
+    def missing_logs(beta=None):
+        raise FileNotFoundError("Digital_log.csv")
+
+    monkeypatch.setattr(failure_model, "load_failure_model", missing_logs)
+    df = pd.DataFrame({"part": ["Bearing"], "age": [5], "failure_probability": [0.4]})
+    assert apply_probability_source(df, "fitted") is df
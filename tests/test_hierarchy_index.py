@@ -0,0 +1,45 @@
+import pandas as pd
+
+from hierarchy_index import PlantHierarchy
+
+
+def _hierarchy():
+    line_components = pd.DataFrame({
+        "line": ["Line 1", "Line 1", "Line 2"],
+        "component": ["Bin", "Conveyor", "Dryer"],
+        "part": ["Bearing", "Bearing", "Fan"],
+    })
+    # Historical logs may name lines that Line_components does not list
+    historical = pd.DataFrame({
+        "Line": ["Line 1", "Line 3"],
+        "Equipment": ["Bin", "Press"],
+        "Part": ["Bearing", "Seal"],
+        "Parameter": ["Vibrations", "Pressure"],
+    })
+    digital_log = pd.DataFrame({"Plant": ["P1", "P1"], "Line": ["Line 1", "Line 2"]})
+    inventory = pd.DataFrame({"Part": ["Bearing", "Fan", "Seal"], "Stock": [3, 1, 0]})
+    suppliers = pd.DataFrame({"Part": ["Fan", "Bearing"], "Supplier": ["S1", "S2"]})
+    return PlantHierarchy(line_components, historical, digital_log, inventory, suppliers), inventory, suppliers
+
+
+def test_lines_come_from_line_components():
+    hierarchy, _, _ = _hierarchy()
+    assert hierarchy.lines() == ["Line 1", "Line 2"]
+    assert hierarchy.lines("P1") == ["Line 1", "Line 2"]
+
+
+def test_parts_are_listed_once_per_line():
+    hierarchy, _, _ = _hierarchy()
+    assert hierarchy.parts("Line 1") == ["Bearing"]
+    assert hierarchy.parts("Line 1", "Conveyor") == ["Bearing"]
+
+
+def test_stock_tables_are_filtered_to_the_line_only_on_request():
+    hierarchy, inventory, suppliers = _hierarchy()
+    line_inventory, line_supplier = hierarchy.stock_tables("Line 2", inventory, suppliers)
+    pd.testing.assert_frame_equal(line_inventory, inventory)
+    pd.testing.assert_frame_equal(line_supplier, suppliers)
+
+    line_inventory, line_supplier = hierarchy.stock_tables("Line 2", inventory, suppliers, line_parts_only=True)
+    assert line_inventory["Part"].tolist() == ["Fan"]
+    assert line_supplier["Part"].tolist() == ["Fan"]
@@ -0,0 +1,39 @@
+import os
+
+import pandas as pd
+
+from conftest import REPO_ROOT
+from breach_analytics import HISTORICAL_DATA_PATH
+from incremental_ingest import IncrementalIngestor
+from sensor_store import SensorSeriesStore
+
+
+def test_default_store_is_not_the_shared_store(tmp_path, monkeypatch):
+    os.symlink(os.path.join(REPO_ROOT, "datasets"), tmp_path / "datasets")
+    monkeypatch.chdir(tmp_path)
+
+    shared = SensorSeriesStore.from_dataset(HISTORICAL_DATA_PATH)
+    rows = len(shared.frame)
+    ingestor = IncrementalIngestor()
+    batch = shared.frame.tail(3).assign(Cycle=shared.frame["Cycle"].max() + 1)
+    ingestor.ingest_sensor_batch(batch)
+
+    assert ingestor.store is not shared
+    assert len(ingestor.store.frame) == rows + 3
+    assert len(SensorSeriesStore.from_dataset(HISTORICAL_DATA_PATH).frame) == rows
+
+
+def test_batches_match_full_aggregates_across_cycle_gaps():
+    full = pd.DataFrame({
+        "Line": "Line 1", "Part": "Fan", "Parameter": "Temperature",
+        "Cycle": [1, 2, 3, 5, 6, 7], "Value": [5, 11, 12, 13, 14, 5],
+        "Expected_value_min": 0.0, "Expected_value_max": 10.0,
+    })
+    log = pd.DataFrame(columns=["Line", "Part", "Action_taken", "Recommended_action", "Downtime_hrs"])
+    ingestor = IncrementalIngestor(SensorSeriesStore(full.iloc[:3]), log)
+    ingestor.ingest_sensor_batch(full.iloc[3:])
+
+    expected = IncrementalIngestor._breach_aggregates(full)
+    merged = ingestor.breach_counts.loc[expected.index]
+    for col in ["breaches", "longest_run", "current_run", "last_cycle"]:
+        assert merged[col].tolist() == expected[col].tolist(), col
@@ -0,0 +1,35 @@
+import numpy as np
+
+from knapsack_solver import KnapsackFrontier, solve_knapsack
+
+
+def test_frontier_ignores_items_heavier_than_the_largest_capacity():
+    values = [5.0, 4.0, 3.0, 9.0]
+    weights = [3.0, 2.0, 2.0, 15.0]
+    frontier = KnapsackFrontier(values, weights, 8)
+    assert frontier.value(8) == 12.0
+    assert not frontier.selection(8)[3]
+
+
+def test_frontier_matches_solve_knapsack_at_the_range_endpoints():
+    rng = np.random.default_rng(1)
+    values = rng.uniform(0.0, 1.0, 40)
+    weights = rng.integers(100, 2000, 40).astype(float)
+    frontier = KnapsackFrontier(values, weights, 5000)
+    for capacity in (0, 1000, 5000):
+        expected = solve_knapsack(values, [weights], [capacity], method="dp")
+        assert np.isclose(frontier.value(capacity), expected["objective"])
+        assert np.isclose(values[frontier.selection(capacity)].sum(), expected["objective"])
+        assert weights[frontier.selection(capacity)].sum() <= capacity
+
+
+def test_exact_methods_agree():
+    rng = np.random.default_rng(3)
+    values = rng.uniform(0.0, 1.0, 30)
+    weights = rng.integers(10, 200, 30).astype(float)
+    dp = solve_knapsack(values, [weights], [1500], method="dp")
+    bnb = solve_knapsack(values, [weights], [1500], method="branch_and_bound")
+    assert dp["status"] == bnb["status"] == "Optimal"
+    assert np.isclose(dp["objective"], bnb["objective"])
+    greedy = solve_knapsack(values, [weights], [1500], method="greedy")
+    assert greedy["objective"] <= dp["objective"] + 1e-12 <= greedy["bound"] + 1e-9
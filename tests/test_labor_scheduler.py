@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import REPO_ROOT
+from labor_scheduler import assign_days
+from maintenance_pipeline import MaintenanceOptimizer, post_optimization_schedule
+
+PLANT_CSV = os.path.join(REPO_ROOT, "datasets", "synthetic_limited_line_equipment_data_with_maps.csv")
+
+
+def _loop_schedule(df, labor_available_per_day):
+    # The row-by-row assignment post_optimization_schedule used before the array scheduler
+    df = df.copy()
+    df["allowed_days"] = df["utilization_pct"].apply(
+        lambda u: ["DAY+1", "DAY+2", "DAY+3", "DAY+4"] if u < 0.7 else ["DAY+2", "DAY+3"]
+    )
+    df["scheduled_day"] = None
+    df["expected_revenue_loss"] = 0.0
+    labor_left = labor_available_per_day.copy()
+    for idx, row in df[df["maintain"] == 1].sort_values(by="maintenance_order").iterrows():
+        loss = row["downtime_hours"] * row["production_per_hour"] * row["unit_price"]
+        df.at[idx, "scheduled_day"] = "Unassigned"
+        for day in row["allowed_days"]:
+            if labor_left.get(day, 0) >= row["labor_hours"]:
+                labor_left[day] -= row["labor_hours"]
+                df.at[idx, "scheduled_day"] = day
+                break
+        df.at[idx, "expected_revenue_loss"] = loss
+    return df, labor_left
+
+
+@pytest.mark.parametrize("hours_per_day", [20, 80, 1000])
+def test_array_scheduler_matches_the_row_loop(hours_per_day):
+    rng = np.random.default_rng(5)
+    df = MaintenanceOptimizer(msg=False).optimize_schedule(pd.read_csv(PLANT_CSV), 60000)
+    df["utilization_pct"] = rng.uniform(0.6, 0.9, len(df)).round(2)
+    df["downtime_hours"] = df["labor_hours"] * 1.5
+    df["production_per_hour"] = rng.uniform(80, 150, len(df)).round(2)
+    df["unit_price"] = rng.uniform(9.0, 15.0, len(df)).round(2)
+    labor = {day: hours_per_day for day in ["DAY+1", "DAY+2", "DAY+3", "DAY+4"]}
+
+    result = post_optimization_schedule(df, labor)
+    expected, expected_left = _loop_schedule(df, labor)
+    assert result["schedule_df"]["scheduled_day"].tolist() == expected["scheduled_day"].tolist()
+    assert np.allclose(result["schedule_df"]["expected_revenue_loss"], expected["expected_revenue_loss"])
+    assert result["summary"]["labor_remaining_per_day"] == expected_left
+
+
+def test_strategies_respect_windows_and_capacities():
+    labor_hours = np.array([5.0, 8.0, 3.0, 6.0])
+    allowed = np.array([[True, True, False], [True, False, True], [False, True, True], [True, True, True]])
+    capacities = [10.0, 9.0, 8.0]
+    for strategy in ("first_fit", "ffd", "best_fit"):
+        days, remaining = assign_days(labor_hours, allowed, capacities, strategy)
+        placed = days >= 0
+        assert allowed[np.flatnonzero(placed), days[placed]].all()
+        used = np.bincount(days[placed], weights=labor_hours[placed], minlength=3)
+        assert np.allclose(used + remaining, capacities)
+        assert (remaining >= 0).all()
+    assert assign_days(labor_hours, allowed, capacities, "first_fit")[0].tolist() == [0, 2, 1, 1]
+    assert assign_days(labor_hours, allowed, capacities, "best_fit")[0].tolist() == [1, 2, 1, 0]
@@ -0,0 +1,141 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import maintenance_pipeline
+from conftest import REPO_ROOT
+from maintenance_pipeline import MaintenanceOptimizer, risk_budget_frontier, risk_labor_frontier
+
+PLANT_CSV = os.path.join(REPO_ROOT, "datasets", "synthetic_limited_line_equipment_data_with_maps.csv")
+
+
+def _plant():
+    return pd.read_csv(PLANT_CSV)
+
+
+@pytest.mark.parametrize("budget", [7000, 20000, 60000])
+@pytest.mark.parametrize("manpower_limit", [None, 120])
+def test_knapsack_and_cbc_agree_on_the_optimized_risk(budget, manpower_limit):
+    schedules = {}
+    for solver in ("knapsack", "pulp"):
+        optimizer = MaintenanceOptimizer(alpha=0.1, include_manpower_constraint=manpower_limit is not None,
+                                         manpower_limit=manpower_limit, solver=solver, msg=False)
+        schedules[solver] = optimizer.optimize_schedule(_plant(), budget)
+    knapsack, cbc = schedules["knapsack"], schedules["pulp"]
+    assert knapsack.attrs["solver_stats"]["solver"].startswith("knapsack:")
+    assert knapsack["solution_status"].iloc[0] == cbc["solution_status"].iloc[0] == "Optimal"
+    assert np.isclose(knapsack["total_optimized_risk"].iloc[0], cbc["total_optimized_risk"].iloc[0])
+    assert knapsack.loc[knapsack["maintain"] == 1, "cost"].sum() <= budget
+    if manpower_limit is not None:
+        assert knapsack.loc[knapsack["maintain"] == 1, "labor_hours"].sum() <= manpower_limit
+
+
+def test_budget_frontier_endpoints_and_interior_match_the_optimizer():
+    df = _plant()
+    total_risk = float((df["failure_probability"] * df["risk_impact"]).sum())
+    frontier = risk_budget_frontier(df, [0, 20000, df["cost"].sum()])
+    assert frontier.attrs["method"] == "frontier_dp"
+    assert frontier["maintenance_count"].tolist()[0::2] == [0, len(df)]
+    assert np.isclose(frontier["optimized_risk"].iloc[0], total_risk)
+    assert np.isclose(frontier["optimized_risk"].iloc[-1], 0.0)
+    schedule = MaintenanceOptimizer(solver="pulp", msg=False).optimize_schedule(df, 20000)
+    assert np.isclose(frontier["optimized_risk"].iloc[1], schedule["total_optimized_risk"].iloc[0])
+
+
+def test_labor_frontier_solves_each_limit_under_the_fixed_budget():
+    df = _plant()
+    frontier = risk_labor_frontier(df, [0, 60, 120], budget=30000)
+    assert frontier.attrs["method"] == "per_capacity"
+    assert frontier["maintenance_count"].iloc[0] == 0
+    assert (frontier["total_labor_hours"] <= frontier["labor_limit"]).all()
+    assert (frontier["total_cost"] <= 30000).all()
+    optimizer = MaintenanceOptimizer(include_manpower_constraint=True, manpower_limit=60, solver="pulp", msg=False)
+    schedule = optimizer.optimize_schedule(df, 30000)
+    assert np.isclose(frontier["optimized_risk"].iloc[1], schedule["total_optimized_risk"].iloc[0])
+
+
+def test_solver_options_reach_the_milp_and_its_stats():
+    optimizer = MaintenanceOptimizer(solver="pulp", time_limit=30, gap_rel=0.01, threads=2, warm_start=True, msg=False)
+    solver, backend = optimizer._milp_solver(warm=True)
+    assert backend == "cbc"
+    assert solver.timeLimit == 30
+    assert solver.optionsDict["gapRel"] == 0.01
+    assert solver.optionsDict["threads"] == 2
+    assert solver.optionsDict["warmStart"] is True
+
+    first = optimizer.optimize_schedule(_plant(), 20000).attrs["solver_stats"]
+    assert first["solver"] == "pulp:cbc"
+    assert first["status"] == "Optimal"
+    assert (first["time_limit"], first["gap_rel"], first["threads"]) == (30, 0.01, 2)
+    assert first["variables"] == len(_plant())
+    assert not first["warm_start"]
+    # The second solve is seeded with the first schedule
+    second = optimizer.optimize_schedule(_plant(), 20000).attrs["solver_stats"]
+    assert second["warm_start"]
+    assert np.isclose(second["objective"], first["objective"])
+
+
+def test_knapsack_stats_report_the_method_and_gap():
+    stats = MaintenanceOptimizer(msg=False).optimize_schedule(_plant(), 20000).attrs["solver_stats"]
+    assert stats["solver"] == "knapsack:dp"
+    assert stats["status"] == "Optimal"
+    assert stats["gap"] == 0.0
+
+
+@pytest.mark.parametrize("hours_per_day", [15, 40])
+def test_joint_schedule_stays_within_daily_labor_and_windows(hours_per_day):
+    labor = {day: hours_per_day for day in ["DAY+1", "DAY+2", "DAY+3", "DAY+4"]}
+    optimizer = MaintenanceOptimizer(include_manpower_constraint=True, manpower_limit=5000, msg=False)
+    out = optimizer.optimize_joint_schedule(_plant(), 60000, labor, seed=0)
+    assert out["solution_status"].iloc[0] == "Optimal"
+
+    maintained = out[out["maintain"] == 1]
+    assert len(maintained) > 0
+    assert maintained["cost"].sum() <= 60000
+    assert maintained["scheduled_day"].notna().all()
+    assert all(day in allowed for day, allowed in zip(maintained["scheduled_day"], maintained["allowed_days"]))
+    used = maintained.groupby("scheduled_day")["labor_hours"].sum()
+    assert (used <= hours_per_day).all()
+    remaining = out.attrs["labor_remaining_per_day"]
+    assert all(remaining[day] == hours_per_day - used.get(day, 0) for day in labor)
+    # Daily labor only adds constraints to the selection
+    sequential = optimizer.optimize_schedule(_plant(), 60000)
+    assert out["total_optimized_risk"].iloc[0] >= sequential["total_optimized_risk"].iloc[0] - 1e-9
+
+
+def test_maintenance_plans_are_memoized_on_their_inputs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "plant.csv")
+    _plant().to_csv(path, index=False)
+    calls = []
+    run_pipeline = maintenance_pipeline.run_pipeline
+    monkeypatch.setattr(maintenance_pipeline, "run_pipeline",
+                        lambda *args, **kwargs: calls.append(args) or run_pipeline(*args, **kwargs))
+    maintenance_pipeline._cached_plan.cache_clear()
+    labor = {"DAY+1": 40, "DAY+2": 40, "DAY+3": 40, "DAY+4": 40}
+
+    def plan(budget=20000, labor_available_per_day=labor, seed=0):
+        return maintenance_pipeline.run_maintenance_plan(path, budget, labor_available_per_day, seed=seed,
+                                                         probability_source="static")
+
+    first = plan()
+    first["plan_summary"]["optimized_risk"] = -1.0
+    second = plan()
+    assert len(calls) == 1
+    assert second["plan_summary"]["optimized_risk"] > 0
+    pd.testing.assert_frame_equal(first["post_optimization"]["schedule_df"],
+                                  second["post_optimization"]["schedule_df"])
+
+    plan(budget=30000)
+    plan(labor_available_per_day={**labor, "DAY+4": 10})
+    plan(seed=1)
+    assert len(calls) == 4
+    # A changed data file is a new key
+    _plant().assign(cost=lambda df: df["cost"] * 2).to_csv(path, index=False)
+    plan()
+    assert len(calls) == 5
+    plan(budget=30000)
+    assert len(calls) == 6
+    maintenance_pipeline._cached_plan.cache_clear()
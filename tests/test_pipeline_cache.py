@@ -0,0 +1,17 @@
+import pipeline_cache
+
+
+def test_partial_results_are_cache_misses(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    artifact = tmp_path / "final_ui_processed_responses_Line_1.pkl"
+    artifact.write_bytes(b"templated")
+    fingerprint = "ab" * 32
+
+    partial = pipeline_cache.store_result(fingerprint, "Line 1", str(artifact), {}, complete=False)
+    assert open(partial, "rb").read() == b"templated"
+    assert pipeline_cache.cached_result(fingerprint, "Line 1") is None
+
+    artifact.write_bytes(b"llm")
+    path = pipeline_cache.store_result(fingerprint, "Line 1", str(artifact), {})
+    assert path != partial
+    assert pipeline_cache.cached_result(fingerprint, "Line 1") == path
@@ -0,0 +1,73 @@
+import sys
+import types
+
+import pipeline_jobs
+
+
+def _queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline_jobs, "JOBS_DIR", str(tmp_path / "jobs"))
+    monkeypatch.setattr(pipeline_jobs, "JOBS_DB", str(tmp_path / "jobs" / "jobs.sqlite"))
+
+
+def _fake_pipeline(monkeypatch, result_path, fail=False):
+    async def run_agent_pipeline(summary_mode=None, probability_source=None, on_progress=None, on_result=None):
+        on_progress(f"Running {summary_mode}")
+        if fail:
+            raise RuntimeError("agents unavailable")
+        on_result(result_path)
+        return result_path
+
+    module = types.ModuleType("agent_pipeline")
+    module.run_agent_pipeline = run_agent_pipeline
+    monkeypatch.setitem(sys.modules, "agent_pipeline", module)
+
+
+def test_jobs_are_queued_once_claimed_and_completed(tmp_path, monkeypatch):
+    _queue(tmp_path, monkeypatch)
+    result = tmp_path / "final_ui.pkl"
+    result.write_bytes(b"alerts")
+    _fake_pipeline(monkeypatch, str(result))
+    request = {"summary_mode": "batched", "probability_source": "fitted"}
+
+    job_id = pipeline_jobs.submit_job(request)
+    assert pipeline_jobs.submit_job(dict(reversed(list(request.items())))) == job_id
+    assert pipeline_jobs.get_job(job_id)["status"] == "queued"
+    assert pipeline_jobs.latest_result() is None
+
+    job = pipeline_jobs._claim_next_job(pid=123)
+    assert job["id"] == job_id
+    running = pipeline_jobs.get_job(job_id)
+    assert (running["status"], running["worker_pid"]) == ("running", 123)
+    assert pipeline_jobs._claim_next_job(pid=123) is None
+    # While it runs, the same request still maps to the running job
+    assert pipeline_jobs.submit_job(request) == job_id
+
+    pipeline_jobs._run_job(job)
+    done = pipeline_jobs.get_job(job_id)
+    assert (done["status"], done["progress"], done["result_path"]) == ("done", "Done", str(result))
+    assert pipeline_jobs.latest_result()["job_id"] == job_id
+    # A finished request can be submitted again
+    assert pipeline_jobs.submit_job(request) != job_id
+
+
+def test_failed_jobs_record_the_error(tmp_path, monkeypatch):
+    _queue(tmp_path, monkeypatch)
+    _fake_pipeline(monkeypatch, None, fail=True)
+    job_id = pipeline_jobs.submit_job({"summary_mode": "parallel"})
+    pipeline_jobs._run_job(pipeline_jobs._claim_next_job(pid=123))
+    job = pipeline_jobs.get_job(job_id)
+    assert job["status"] == "failed"
+    assert job["progress"] == "Running parallel"
+    assert job["error"] == "RuntimeError: agents unavailable"
+
+
+def test_a_new_worker_requeues_jobs_left_running(tmp_path, monkeypatch):
+    _queue(tmp_path, monkeypatch)
+    job_id = pipeline_jobs.submit_job({"summary_mode": "parallel"})
+    pipeline_jobs._claim_worker_slot(pid=1)
+    pipeline_jobs._claim_next_job(pid=1)
+    # A live worker keeps the slot
+    assert not pipeline_jobs._claim_worker_slot(pid=2)
+    monkeypatch.setattr(pipeline_jobs, "WORKER_STALE_S", 0.0)
+    assert pipeline_jobs._claim_worker_slot(pid=2)
+    assert pipeline_jobs.get_job(job_id)["status"] == "queued"
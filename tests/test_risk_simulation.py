@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from risk_simulation import simulate_schedule
+
+
+def _schedule():
+    return pd.DataFrame({
+        "equipment_id": ["A", "B", "C", "D"],
+        "failure_probability": [0.6, 0.3, 0.8, 0.1],
+        "labor_hours": [4, 6, 5, 3],
+        "maintain": [1, 0, 1, 0],
+        "scheduled_day": ["DAY+1", None, "Unassigned", None],
+    })
+
+
+def test_same_seed_gives_the_same_samples_with_any_worker_count():
+    serial = simulate_schedule(_schedule(), n_scenarios=5000, seed=11, max_workers=1)
+    parallel = simulate_schedule(_schedule(), n_scenarios=5000, seed=11, max_workers=2)
+    pd.testing.assert_frame_equal(serial["samples"], parallel["samples"])
+    pd.testing.assert_frame_equal(serial["per_asset"], parallel["per_asset"])
+    assert serial["summary"]["revenue_loss"] == parallel["summary"]["revenue_loss"]
+
+    other = simulate_schedule(_schedule(), n_scenarios=5000, seed=12, max_workers=1)
+    assert not serial["samples"]["revenue_loss"].equals(other["samples"]["revenue_loss"])
+
+
+def test_failure_rates_follow_the_hazard():
+    result = simulate_schedule(_schedule(), n_scenarios=40000, alpha=0.0, seed=3, max_workers=1)
+    rates = result["per_asset"]["failure_rate"].to_numpy()
+    # A: maintained from the first day with alpha 0 never fails; C is unassigned and keeps its full hazard
+    assert rates[0] == 0.0
+    assert np.allclose(rates[1:], [0.3, 0.8, 0.1], atol=0.01)
+    assert np.isclose(result["summary"]["p_any_failure"], 1 - 0.7 * 0.2 * 0.9, atol=0.01)
@@ -0,0 +1,35 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from conftest import REPO_ROOT
+from maintenance_pipeline import run_maintenance_plan, _cached_plan
+from scenario_engine import evaluate_scenarios, scenario_grid
+
+PLANT_CSV = os.path.join(REPO_ROOT, "datasets", "synthetic_limited_line_equipment_data_with_maps.csv")
+
+
+def test_parallel_scenarios_match_serial_and_the_single_plan(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "plant.csv")
+    pd.read_csv(PLANT_CSV).to_csv(path, index=False)
+    labor_options = [{day: hours for day in ["DAY+1", "DAY+2", "DAY+3", "DAY+4"]} for hours in (20, 60)]
+    scenarios = scenario_grid([10000, 30000], labor_options, alphas=(0.0, 0.2))
+
+    serial = evaluate_scenarios(path, scenarios, probability_source="static", max_workers=1)
+    parallel = evaluate_scenarios(path, scenarios, probability_source="static", max_workers=2)
+    assert len(serial) == len(scenarios)
+    # Labor only changes the day assignment, so each (budget, alpha) is solved once
+    assert serial.attrs["solves"] == 4
+    assert parallel.attrs["workers"] == 2
+    pd.testing.assert_frame_equal(serial, parallel)
+
+    _cached_plan.cache_clear()
+    plan = run_maintenance_plan(path, 30000, labor_options[0], alpha=0.2, probability_source="static")
+    row = serial[(serial["budget"] == 30000) & (serial["alpha"] == 0.2) & (serial["labor_total"] == 80)].iloc[0]
+    summary = plan["post_optimization"]["summary"]
+    assert np.isclose(row["optimized_risk"], plan["plan_summary"]["optimized_risk"])
+    assert np.isclose(row["revenue_loss"], summary["total_revenue_loss"])
+    assert row["maintained"] == summary["maintenance_count"]
+    _cached_plan.cache_clear()
@@ -0,0 +1,49 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from conftest import REPO_ROOT
+from sensor_store import SensorSeriesStore
+
+HISTORICAL_CSV = os.path.join(REPO_ROOT, "datasets", "Historical_data.csv")
+
+
+def _filtered(df, line, part, parameter):
+    rows = df[(df["Line"] == line) & (df["Part"] == part) & (df["Parameter"] == parameter)]
+    return rows.sort_values("Cycle", kind="stable")
+
+
+def test_series_lookups_match_dataframe_filters():
+    df = pd.read_csv(HISTORICAL_CSV)
+    store = SensorSeriesStore(df)
+    keys = list(df[["Line", "Part", "Parameter"]].drop_duplicates().itertuples(index=False, name=None))
+    assert sorted(store.keys()) == sorted(keys)
+    for line, part, parameter in keys[::7]:
+        expected = _filtered(df, line, part, parameter)
+        series = store.series(line, part, parameter)
+        assert series["cycle"].tolist() == expected["Cycle"].tolist()
+        assert np.allclose(series["value"], expected["Value"])
+        assert np.allclose(series["expected_max"], expected["Expected_value_max"])
+
+        lo, hi = expected["Cycle"].quantile([0.25, 0.75]).tolist()
+        window = expected[expected["Cycle"].between(lo, hi)]
+        assert store.series(line, part, parameter, cycles=(lo, hi))["cycle"].tolist() == window["Cycle"].tolist()
+    assert store.series("No line", "No part", "No parameter")["value"].size == 0
+
+
+def test_part_rows_and_appends_match_dataframe_filters():
+    df = pd.read_csv(HISTORICAL_CSV)
+    last = df["Cycle"].max()
+    store = SensorSeriesStore(df[df["Cycle"] < last])
+    store.append(df[df["Cycle"] == last])
+
+    parts = df["Part"].drop_duplicates().tolist()[:3]
+    rows = store.rows_for_parts(parts)
+    expected = df[df["Part"].isin(parts)]
+    assert len(rows) == len(expected)
+    assert sorted(rows["Value"].tolist()) == sorted(expected["Value"].tolist())
+
+    line, part, parameter = expected[["Line", "Part", "Parameter"]].iloc[0]
+    assert store.series(line, part, parameter)["cycle"].tolist() == \
+        _filtered(df, line, part, parameter)["Cycle"].tolist()
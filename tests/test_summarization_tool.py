@@ -0,0 +1,156 @@
+import asyncio
+import json
+import os
+import pickle
+import shutil
+import sys
+import types
+
+from conftest import REPO_ROOT
+import SummarizationTool
+
+
+def test_templated_alerts_from_committed_responses(tmp_path, monkeypatch):
+    # processed_responses_Sanitization_Line_1.pkl holds a supplier_info frame without Part/Supplier columns
+    shutil.copy(os.path.join(REPO_ROOT, "processed_responses_Sanitization_Line_1.pkl"), tmp_path)
+    os.symlink(os.path.join(REPO_ROOT, "datasets"), tmp_path / "datasets")
+    monkeypatch.chdir(tmp_path)
+
+    async def no_llm(agent, content):
+        raise RuntimeError("LLM disabled in tests")
+    monkeypatch.setattr(SummarizationTool, "run_summary_agent", no_llm)
+
+    path = asyncio.run(SummarizationTool.run_summary_and_alert_pipeline("processed_responses_Sanitization_Line_1.pkl"))
+
+    with open(path, "rb") as f:
+        alerts = pickle.load(f)
+    assert [item[0] for item in alerts] == [key for _, key, _ in SummarizationTool.SUMMARY_SECTIONS]
+    assert all(item[5] == "template" for item in alerts)
+    # Sections whose template cannot be built are kept as placeholders for the LLM summary
+    supplier = next(item for item in alerts if item[0] == "SupplierPerformanceSummaryAgent")
+    assert supplier[4] == SummarizationTool.PLACEHOLDER_ALERT
+
+
+def test_llm_summaries_fill_sections_whose_template_failed(tmp_path, monkeypatch):
+    shutil.copy(os.path.join(REPO_ROOT, "processed_responses_Sanitization_Line_1.pkl"), tmp_path)
+    os.symlink(os.path.join(REPO_ROOT, "datasets"), tmp_path / "datasets")
+    monkeypatch.chdir(tmp_path)
+    _fake_genai_types(monkeypatch)
+
+    async def llm(agent, content):
+        texts = {name: "```json\n" + json.dumps({"summary": f"{name} summary", "alert": f"{name} alert"}) + "\n```"
+                 for name in agent.sub_agent_names}
+        return texts, {"llm_calls": 1, "prompt_tokens": 0, "output_tokens": 0, "latency_s": 0.0}
+    monkeypatch.setattr(SummarizationTool, "run_summary_agent", llm)
+    monkeypatch.setattr(SummarizationTool, "build_parallel_summary_agent",
+                        lambda names: types.SimpleNamespace(sub_agent_names=list(names)))
+
+    updates = []
+    path = asyncio.run(SummarizationTool.run_summary_and_alert_pipeline(
+        "processed_responses_Sanitization_Line_1.pkl", mode="parallel",
+        on_update=lambda path, complete: updates.append(complete)))
+
+    with open(path, "rb") as f:
+        alerts = pickle.load(f)
+    assert len(alerts) == len(SummarizationTool.SUMMARY_SECTIONS)
+    assert all(item[5] == "llm" for item in alerts)
+    assert next(item for item in alerts if item[0] == "BestSupplierSummaryAgent")[4] == "BestSupplierSummaryAgent alert"
+    assert updates == [False, True]
+
+
+def _fake_genai_types(monkeypatch):
+    # google.genai is only used to wrap the prompt; the fake runner above never reads it
+    fake = types.SimpleNamespace(Content=lambda **kwargs: kwargs, Part=lambda **kwargs: kwargs)
+    google = types.ModuleType("google")
+    genai = types.ModuleType("google.genai")
+    genai.types = fake
+    google.genai = genai
+    monkeypatch.setitem(sys.modules, "google", sys.modules.get("google", google))
+    monkeypatch.setitem(sys.modules, "google.genai", genai)
+    monkeypatch.setattr(sys.modules["google"], "genai", genai, raising=False)
+
+
+def test_templates_use_singular_for_one_item():
+    import pandas as pd
+
+    low_stock = pd.DataFrame({"part": ["Husk Feed Screw"], "stock": [1]})
+    summary, alert = SummarizationTool.template_low_stock(low_stock)
+    assert alert == "Urgent Restock: 1 Part"
+    assert summary.startswith("1 part has critically low stock")
+    assert "Husk Feed Screw at 0–1 units needs urgent action" in summary
+
+    suppliers = pd.DataFrame({"Part": ["Husk Feed Screw"], "Supplier": ["Acme"], "Historical_quality_rate": [0.9]})
+    summary, alert = SummarizationTool.template_supplier_performance(suppliers)
+    assert "1 supplier offer covers 1 part." in summary
+    assert "Husk Feed Screw relies on a single supplier" in summary
+
+    low_stock = pd.DataFrame({"part": ["A", "B"], "stock": [0, 3]})
+    assert SummarizationTool.template_low_stock(low_stock)[1] == "Urgent Restock: 2 Parts"
+
+
+def test_alerts_are_complete_only_with_every_section_from_the_llm():
+    sections = SummarizationTool.SUMMARY_SECTIONS
+    alerts = [[key, None, [], "summary", "alert", "llm"] for _, key, _ in sections]
+    assert SummarizationTool.alerts_complete(alerts)
+    # A missing section (e.g. a dropped template) or a templated one is not complete
+    assert not SummarizationTool.alerts_complete(alerts[:-1])
+    alerts[0][5] = "template"
+    assert not SummarizationTool.alerts_complete(alerts)
+
+
+def test_batched_mode_returns_the_same_alerts_as_the_parallel_agents(tmp_path, monkeypatch):
+    _fake_genai_types(monkeypatch)
+
+    def answer(name):
+        return {"summary": f"{name} summary", "alert": f"{name} alert"}
+
+    async def llm(agent, content):
+        # Parallel agents answer one fenced object each; the batched agent one object keyed by section
+        if agent.name == "BatchedSummaryAgent":
+            names = [name for name, _, _ in SummarizationTool.SUMMARY_SECTIONS]
+            texts = {agent.name: "```json\n" + json.dumps({name: answer(name) for name in names}) + "\n```"}
+        else:
+            texts = {name: "```json\n" + json.dumps(answer(name)) + "\n```" for name in agent.sub_agent_names}
+        return texts, {"llm_calls": 1, "prompt_tokens": 0, "output_tokens": 0, "latency_s": 0.0}
+    monkeypatch.setattr(SummarizationTool, "run_summary_agent", llm)
+    monkeypatch.setattr(SummarizationTool, "build_parallel_summary_agent",
+                        lambda names: types.SimpleNamespace(name="ParallelSummaryAgent", sub_agent_names=list(names)))
+    monkeypatch.setattr(SummarizationTool, "build_batched_summary_alert_agent",
+                        lambda: types.SimpleNamespace(name="BatchedSummaryAgent"))
+
+    alerts = {}
+    for mode in SummarizationTool.SUMMARY_MODES:
+        run_dir = tmp_path / mode
+        run_dir.mkdir()
+        shutil.copy(os.path.join(REPO_ROOT, "processed_responses_Sanitization_Line_1.pkl"), run_dir)
+        os.symlink(os.path.join(REPO_ROOT, "datasets"), run_dir / "datasets")
+        monkeypatch.chdir(run_dir)
+        path = asyncio.run(SummarizationTool.run_summary_and_alert_pipeline(
+            "processed_responses_Sanitization_Line_1.pkl", mode=mode))
+        with open(path, "rb") as f:
+            alerts[mode] = pickle.load(f)
+
+    assert [len(item) for item in alerts["batched"]] == [len(item) for item in alerts["parallel"]]
+    for batched, parallel in zip(alerts["batched"], alerts["parallel"]):
+        assert [batched[k] for k in (0, 3, 4, 5)] == [parallel[k] for k in (0, 3, 4, 5)]
+        assert json.dumps(batched[2], default=str) == json.dumps(parallel[2], default=str)
+        assert batched[1].equals(parallel[1])
+        assert batched[5] == "llm"
+
+
+def test_section_hash_covers_the_model_instruction_and_mode(monkeypatch):
+    def builder(model, instruction):
+        return lambda: types.SimpleNamespace(name="LowStockSummaryAgent", model=model, instruction=instruction)
+
+    section = [{"part": "Husk Feed Screw", "stock": 1}]
+
+    def low_stock_hash(mode, model="gemini-2.0-flash-lite", instruction="Summarize low stock."):
+        monkeypatch.setitem(SummarizationTool.SUMMARY_AGENT_BUILDERS, "LowStockSummaryAgent", builder(model, instruction))
+        monkeypatch.setattr(SummarizationTool, "build_batched_summary_alert_agent", builder(model, instruction))
+        return SummarizationTool.section_hash(section, SummarizationTool.summarizer_config(mode)["LowStockSummaryAgent"])
+
+    base = low_stock_hash("parallel")
+    assert low_stock_hash("parallel") == base
+    assert low_stock_hash("batched") != base
+    assert low_stock_hash("parallel", model="gemini-2.0-flash") != base
+    assert low_stock_hash("parallel", instruction="Summarize low stock in one line.") != base